@@ -32,7 +32,7 @@ class ClubSerializer(serializers.ModelSerializer):
 # EVENTS
 # -------------------------
 class EventSerializer(serializers.ModelSerializer):
-    attendees_count = serializers.IntegerField(source='attendees.count', read_only=True)
+    attendees_count = serializers.IntegerField(source='attendee_total', read_only=True)
     
     class Meta:
         model = Event
@@ -60,12 +60,22 @@ class PollOptionSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 class PollSerializer(serializers.ModelSerializer):
-    options = PollOptionSerializer(many=True, read_only=True)
+    options = serializers.SerializerMethodField()
+    is_open = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = Poll
         fields = "__all__"
 
+    def get_options(self, poll):
+        if poll.results is None:
+            return PollOptionSerializer(poll.options.all(), many=True).data
+        # Closed: read the frozen snapshot, not the vote tables (no voter ids)
+        return [
+            {"id": option["id"], "poll": poll.pk, "text": option["text"], "votes_count": option["votes"]}
+            for option in poll.results["options"]
+        ]
+
 # -------------------------
 # STUDENT ACADEMIC
 # -------------------------
@@ -11,7 +11,11 @@ from .views import (
     student_dashboard_api,
     my_saved_reports_api,
     save_report_cloud_api,
+    report_upload_status_api,
     export_all_data_api,
+    leaderboard_api,
+    my_leaderboard_api,
+    feed_api,
 )
 
 router = DefaultRouter()
@@ -29,9 +33,17 @@ urlpatterns = [
     path('user/profile/', user_profile, name='user_profile'),
     path('student/dashboard/', student_dashboard_api, name='student_dashboard_api'),
 
+    # Points leaderboards (?club=<id> for a club's, overall otherwise)
+    path('leaderboard/', leaderboard_api, name='leaderboard_api'),
+    path('leaderboard/me/', my_leaderboard_api, name='my_leaderboard_api'),
+
+    # Posts, events and polls from the user's clubs (?cursor=, ?limit=)
+    path('feed/', feed_api, name='feed_api'),
+
     # Reports and exports
     path('reports/', my_saved_reports_api, name='my_saved_reports_api'),
     path('reports/save/', save_report_cloud_api, name='save_report_cloud_api'),
+    path('reports/uploads/<int:job_id>/', report_upload_status_api, name='report_upload_status_api'),
     path('export/', export_all_data_api, name='export_all_data_api'),
 
     # Router endpoints
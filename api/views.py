@@ -2,16 +2,26 @@
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Count
 from datetime import datetime
 from django.contrib.auth.models import User
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
-from clubs.models import Club, ClubPost, Event, Poll, PollOption
+from clubs.context import clubs_with_activity_counts
+from clubs.feed import FEED_PAGE_SIZE, feed_page
+from clubs.live import tally_snapshot
+from clubs.polls import close_poll, open_polls
+from clubs.votes import buffering_enabled, submit_vote
+from clubs.models import Club, ClubPost, Event, Poll, PollOption, StoredReport
+from clubs.toggles import (
+    toggle_club_membership, toggle_event_rsvp, run_idempotent, idempotency_key, fill_event_from_waitlist,
+    ATTENDING, WAITLISTED,
+)
 from .serializers import (
     UserSerializer,
     ProfileSerializer,
@@ -25,11 +35,13 @@ from .serializers import (
     StudentGPASerializer,
     CourseSerializer,
 )
+from users import leaderboard
 from clubs.reports import (
     generate_my_clubs_report,
     generate_my_events_report,
     generate_my_grades_report,
-    upload_to_supabase,
+    store_report,
+    upload_status,
     get_my_reports
 )
 
@@ -90,12 +102,13 @@ class ClubViewSet(viewsets.ModelViewSet):
         if not is_student(user):
             return Response({"detail": "Only students can join clubs."}, status=403)
 
-        if user in club.members.all():
-            club.members.remove(user)
-            return Response({"detail": f"You have left {club.name}."})
-        else:
-            club.members.add(user)
-            return Response({"detail": f"You have joined {club.name}."})
+        def toggle():
+            joined = toggle_club_membership(club, user)
+            verb = "joined" if joined else "left"
+            return {"detail": f"You have {verb} {club.name}.", "joined": joined}
+
+        result, replayed = run_idempotent(user, f"club:{club.id}:membership", idempotency_key(request), toggle)
+        return Response(result, headers={"Idempotent-Replayed": "true"} if replayed else None)
 
 # -------------------------
 # CLUB POST VIEWSET
@@ -125,16 +138,26 @@ class EventViewSet(viewsets.ModelViewSet):
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated]
 
+    def perform_update(self, serializer):
+        # A raised (or removed) capacity frees places for waitlisted users
+        fill_event_from_waitlist(serializer.save())
+
     @action(detail=True, methods=['post'])
     def rsvp(self, request, pk=None):
         event = self.get_object()
         user = request.user
-        if user in event.attendees.all():
-            event.attendees.remove(user)
-            return Response({"detail": f"You have cancelled your RSVP to {event.title}."})
-        else:
-            event.attendees.add(user)
-            return Response({"detail": f"You have RSVP'd to {event.title}."})
+        def toggle():
+            rsvp_status = toggle_event_rsvp(event, user)
+            if rsvp_status == ATTENDING:
+                detail = f"You have RSVP'd to {event.name}."
+            elif rsvp_status == WAITLISTED:
+                detail = f"{event.name} is full. You have been added to the waitlist."
+            else:
+                detail = f"You have cancelled your RSVP to {event.name}."
+            return {"detail": detail, "status": rsvp_status, "attending": rsvp_status == ATTENDING}
+
+        result, replayed = run_idempotent(user, f"event:{event.id}:rsvp", idempotency_key(request), toggle)
+        return Response(result, headers={"Idempotent-Replayed": "true"} if replayed else None)
 
 # -------------------------
 # POLL VIEWSET
@@ -148,13 +171,31 @@ class PollViewSet(viewsets.ModelViewSet):
     def vote(self, request, pk=None):
         poll = self.get_object()
         option_id = request.data.get("option")
-        option = get_object_or_404(PollOption, id=option_id)
+        option = get_object_or_404(PollOption, id=option_id, poll=poll)
 
-        if any(request.user in opt.votes.all() for opt in poll.options.all()):
+        if not poll.is_open:
+            return Response({"detail": "This poll is not taking votes."}, status=400)
+        if not submit_vote(option, request.user):
             return Response({"detail": "You have already voted in this poll."}, status=400)
+        # Buffered votes are counted by the flusher shortly after
+        status_code = status.HTTP_202_ACCEPTED if buffering_enabled() else status.HTTP_200_OK
+        return Response({"detail": "Vote recorded successfully."}, status=status_code)
 
-        option.votes.add(request.user)
-        return Response({"detail": "Vote recorded successfully."})
+    @action(detail=True, methods=['get'])
+    def results(self, request, pk=None):
+        """Current tallies; follow /polls/<id>/results/stream/ for live updates."""
+        poll = self.get_object()
+        return Response(tally_snapshot(poll.pk))
+
+    @action(detail=True, methods=['post'])
+    def close(self, request, pk=None):
+        """Lecturers: stop voting now and freeze the results."""
+        if not is_lecturer(request.user):
+            return Response({"detail": "Only lecturers can close polls."}, status=403)
+        poll = self.get_object()
+        if not close_poll(poll):
+            return Response({"detail": "This poll is already closed."}, status=400)
+        return Response(PollSerializer(poll).data)
 
 # -------------------------
 # STUDENT DASHBOARD
@@ -169,7 +210,7 @@ def student_dashboard_api(request):
     user_clubs = user.clubs.all()
     upcoming_events = Event.objects.filter(club__in=user_clubs, date__gte=timezone.now()).order_by('date')[:5]
     recent_posts = ClubPost.objects.filter(club__in=user_clubs).order_by('-created_at')[:5]
-    active_polls = Poll.objects.filter(club__in=user_clubs).order_by('-created_at')[:3]
+    active_polls = open_polls(Poll.objects.filter(club__in=user_clubs)).order_by('-created_at')[:3]
 
     rsvp_events_count = Event.objects.filter(attendees=user, date__gte=timezone.now()).count()
     voted_polls_count = sum(
@@ -188,6 +229,46 @@ def student_dashboard_api(request):
     }
     return Response(data)
 
+# -------------------------
+# LEADERBOARDS
+# -------------------------
+def _int_param(request, name, default):
+    try:
+        return max(int(request.query_params.get(name, default)), 0)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+
+def _leaderboard_club(request):
+    """The ?club= leaderboard, or None for the overall one."""
+    if not request.query_params.get('club'):
+        return None
+    return get_object_or_404(Club, pk=_int_param(request, 'club', 0)).pk
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard_api(request):
+    club_id = _leaderboard_club(request)
+    limit = min(_int_param(request, 'limit', leaderboard.DEFAULT_LIMIT), leaderboard.MAX_LIMIT)
+    return Response({"club": club_id, "entries": leaderboard.top(club_id, limit)})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_leaderboard_api(request):
+    club_id = _leaderboard_club(request)
+    around = min(_int_param(request, 'around', leaderboard.DEFAULT_AROUND), leaderboard.MAX_AROUND)
+    return Response({"club": club_id, **leaderboard.standing(request.user.id, club_id, around)})
+
+# -------------------------
+# ACTIVITY FEED
+# -------------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def feed_api(request):
+    """Posts, events and polls from the user's clubs; pass ?cursor=<next> for the next page."""
+    per_page = _int_param(request, 'limit', FEED_PAGE_SIZE)
+    page = feed_page(request.user, request.query_params.get('cursor'), per_page)
+    return Response({"items": page.items, "next": page.next_cursor})
+
 # -------------------------
 # REPORTS API
 # -------------------------
@@ -212,8 +293,17 @@ def save_report_cloud_api(request):
         return Response({"error": "Invalid report type"}, status=400)
 
     filename = f"student_{report_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    result = upload_to_supabase(csv_data, filename, request.user.id)
-    return Response(result)
+    result = store_report(csv_data, filename, request.user.id)
+    if not result.get('success'):
+        return Response(result, status=500)
+    result['status_url'] = reverse('report_upload_status_api', args=[result['job_id']], request=request)
+    return Response(result, status=202)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def report_upload_status_api(request, job_id):
+    record = get_object_or_404(StoredReport, pk=job_id, owner=request.user)
+    return Response(upload_status(record))
 
 # -------------------------
 # ADMIN / LECTURER EXPORT
@@ -232,11 +322,7 @@ def export_all_data_api(request):
     writer = csv.writer(output)
     writer.writerow(['=== CLUBS ==='])
 
-    clubs = Club.objects.annotate(
-        member_count=Count('members'),
-        event_count=Count('events'),
-        post_count=Count('posts')
-    )
+    clubs = clubs_with_activity_counts(Club.objects.all())
 
     for club in clubs:
         writer.writerow([club.name, club.description, club.member_count, club.event_count, club.post_count])
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Club, ClubPost, Poll, PollOption, Event
+from .models import Club, ClubPost, Poll, PollOption, Event, EventWaitlistEntry, PendingVote, StoredReport
+from .toggles import fill_event_from_waitlist
 
 # Club
 @admin.register(Club)
@@ -17,9 +18,11 @@ class ClubPostAdmin(admin.ModelAdmin):
 # Poll
 @admin.register(Poll)
 class PollAdmin(admin.ModelAdmin):
-    list_display = ('question', 'club', 'created_by', 'created_at')
+    list_display = ('question', 'club', 'created_by', 'created_at', 'closes_at', 'closed_at')
     search_fields = ('question',)
     list_filter = ('club', 'created_at')
+    # Written once when the poll is closed (clubs/polls.py)
+    readonly_fields = ('closed_at', 'results')
 
 # PollOption
 @admin.register(PollOption)
@@ -30,6 +33,29 @@ class PollOptionAdmin(admin.ModelAdmin):
 # Event
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('name', 'club', 'date')
+    list_display = ('name', 'club', 'date', 'attendee_total', 'capacity')
     list_filter = ('club', 'date')
     search_fields = ('name', 'description')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        fill_event_from_waitlist(obj)
+
+# EventWaitlistEntry
+@admin.register(EventWaitlistEntry)
+class EventWaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event', 'created_at')
+    list_filter = ('event',)
+
+# PendingVote
+@admin.register(PendingVote)
+class PendingVoteAdmin(admin.ModelAdmin):
+    list_display = ('user', 'poll', 'option', 'created_at', 'flushed_at')
+    list_filter = ('poll',)
+
+# StoredReport
+@admin.register(StoredReport)
+class StoredReportAdmin(admin.ModelAdmin):
+    list_display = ('name', 'owner', 'backend', 'status', 'size', 'created_at')
+    list_filter = ('backend', 'status')
+    search_fields = ('name', 'path', 'owner__username')
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ClubsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'clubs'
+
+    def ready(self):
+        # Register the SQLite profile's connection_created receiver, the
+        # activity rollup signals and the deployment checks
+        from . import checks, rollups, sqlite  # noqa: F401
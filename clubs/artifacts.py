@@ -0,0 +1,128 @@
+import hashlib
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+
+from .cache import get_table_versions
+from .pdf import render_report
+from .replicas import read_from_primary
+from .report_specs import REPORT_CLOCKS, REPORTS, REPORT_TABLES
+
+# -------------------------
+# CACHED REPORT ARTIFACTS
+# -------------------------
+# A rendered report is saved under MEDIA_ROOT/reports/artifacts/ with a name
+# made from the report type and a fingerprint of the change counters of the
+# tables it reads (clubs/cache.py, bumped by signals in clubs/models.py once
+# the write commits). The fingerprint also covers the clock: the date, which
+# every report is stamped with, and for reports in REPORT_CLOCKS the latest
+# moment their content changed by itself (a poll opening or closing). Until
+# one of those moves, every download is served from the same file without
+# querying or rendering.
+#
+# The counters live in the default cache, so every process must share it
+# (CACHE_BACKEND); with a per-process cache the clubs.W001 check warns that
+# other workers would keep serving old files. Reports are rendered from the
+# primary, never the replica: the fingerprint is read first, so the data a
+# file holds is at least as new as its name says, where a lagging replica
+# could store old data under a new fingerprint. The directory is kept under
+# a size and file limit by evicting the least recently served artifacts.
+
+ARTIFACT_MAX_BYTES = 50 * 1024 * 1024
+ARTIFACT_MAX_FILES = 200
+
+
+def artifact_dir():
+    return Path(settings.MEDIA_ROOT) / "reports" / "artifacts"
+
+
+def data_fingerprint(tables, *clock):
+    """Short hash of the current versions of ``tables`` and the ``clock`` values."""
+    versions = get_table_versions(tables)
+    state = [f"{table}={versions[table]}" for table in sorted(tables)] + [str(value) for value in clock]
+    return hashlib.sha256(";".join(state).encode()).hexdigest()[:16]
+
+
+def report_fingerprint(report_type):
+    clock = REPORT_CLOCKS.get(report_type)
+    return data_fingerprint(REPORT_TABLES[report_type], timezone.localdate(), clock() if clock else None)
+
+
+@read_from_primary()
+def get_report_artifact(report_type):
+    """Path of the rendered PDF for ``report_type``, rendering it if needed."""
+    directory = artifact_dir()
+    path = directory / f"{report_type}-{report_fingerprint(report_type)}.pdf"
+    if path.exists():
+        # The modification time doubles as "last served" for LRU eviction
+        os.utime(path)
+        return path
+
+    directory.mkdir(parents=True, exist_ok=True)
+    spec = REPORTS[report_type]()
+    fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as stream:
+            render_report(spec, stream)
+        # Atomic, so concurrent requests never see a half-written file
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    evict_artifacts(keep=path)
+    return path
+
+
+def evict_artifacts(keep=None, max_bytes=None, max_files=None):
+    """Delete least recently served artifacts until the directory fits the limits."""
+    if max_bytes is None:
+        max_bytes = getattr(settings, "REPORT_ARTIFACT_MAX_BYTES", ARTIFACT_MAX_BYTES)
+    if max_files is None:
+        max_files = getattr(settings, "REPORT_ARTIFACT_MAX_FILES", ARTIFACT_MAX_FILES)
+    entries = []
+    for path in artifact_dir().glob("*.pdf"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, path in entries:
+        if total <= max_bytes and len(entries) - len(removed) <= max_files:
+            break
+        if path == keep:
+            continue
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed.append(path)
+    return removed
+
+
+def artifact_response(report_type):
+    """Serve the cached PDF for ``report_type`` as a download."""
+    path = get_report_artifact(report_type)
+    filename = f'{report_type}_report_{datetime.now().strftime("%Y%m%d")}.pdf'
+
+    # Let the web server send the file when it is configured to (nginx
+    # X-Accel-Redirect maps a media URL, Apache/lighttpd X-Sendfile a path)
+    header = getattr(settings, "REPORT_SENDFILE_HEADER", None)
+    if header:
+        response = HttpResponse(content_type="application/pdf")
+        if header == "X-Accel-Redirect":
+            response[header] = f"{settings.MEDIA_URL}reports/artifacts/{path.name}"
+        else:
+            response[header] = str(path)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=filename, content_type="application/pdf")
@@ -0,0 +1,31 @@
+import threading
+from functools import wraps
+from django.db import close_old_connections, connections
+
+# -------------------------
+# BACKGROUND THREADS
+# -------------------------
+# Django opens and closes database connections around each request, but a
+# thread started from a view gets a fresh connection of its own that
+# nothing closes: with persistent connections or a pool, every report
+# thread would leave one behind. Thread targets go through
+# closing_connections() instead.
+
+
+def closing_connections(func):
+    """Wrap a thread target so it closes (or returns to the pool) the connections it used."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+def start_background_thread(func, *args, daemon=False, name=None):
+    """Run ``func(*args)`` in a thread that cleans up its connections."""
+    thread = threading.Thread(target=closing_connections(func), args=args, daemon=daemon, name=name)
+    thread.start()
+    return thread
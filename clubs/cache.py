@@ -0,0 +1,91 @@
+import time
+from django.core.cache import cache
+
+# -------------------------
+# PER-CLUB FRAGMENT VERSIONS
+# -------------------------
+# club_detail.html caches its shared fragments (posts, polls, events,
+# members) under a key that includes the club's version number. Signals in
+# clubs/models.py bump the version whenever anything shown on the page
+# changes, so stale fragments are never looked up again and simply expire.
+
+CLUB_FRAGMENT_TIMEOUT = 60 * 10
+
+
+def _version_key(club_id):
+    return f"clubs:club:{club_id}:version"
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version
+        version = int(time.time() * 1000)
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter missing (first write or evicted): start a fresh one
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def get_club_version(club_id):
+    """Return the current fragment version for a club."""
+    return _get_version(_version_key(club_id))
+
+
+def bump_club_version(club_id):
+    """Invalidate every cached fragment for a club."""
+    if club_id is None:
+        return
+    _bump_version(_version_key(club_id))
+
+
+# -------------------------
+# PER-POLL TALLY VERSIONS
+# -------------------------
+# Bumped on every vote (same signals as the club versions); live result
+# streams (clubs/live.py) compare it instead of recounting votes.
+
+def _tally_key(poll_id):
+    return f"clubs:poll:{poll_id}:tally-version"
+
+
+def get_poll_tally_version(poll_id):
+    return _get_version(_tally_key(poll_id))
+
+
+def bump_poll_tally_version(poll_id):
+    if poll_id is None:
+        return
+    _bump_version(_tally_key(poll_id))
+
+
+# -------------------------
+# PER-TABLE CHANGE COUNTERS
+# -------------------------
+# Cached report artifacts (clubs/artifacts.py) are keyed on a counter for
+# each table they read, bumped by signals in clubs/models.py on every save,
+# delete and m2m change. The counters live in the cache: kept in a table,
+# every vote, RSVP and join would queue on an UPDATE of the same row. An
+# evicted counter restarts from the clock, which only costs a re-render.
+
+def _table_key(table):
+    return f"clubs:table:{table}:version"
+
+
+def get_table_versions(tables):
+    """``{table: version}`` for ``tables`` (db_table names), in one cache round trip."""
+    keys = {_table_key(table): table for table in tables}
+    found = cache.get_many(keys)
+    return {table: found.get(key) or _get_version(key) for key, table in keys.items()}
+
+
+def bump_table_version(table):
+    """Record a change to ``table`` (its db_table name)."""
+    _bump_version(_table_key(table))
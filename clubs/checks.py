@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# -------------------------
+# DEPLOYMENT CHECKS
+# -------------------------
+# Cached report artifacts (clubs/artifacts.py) are named after change
+# counters kept in the default cache. Each process with a cache of its own
+# counts only its own writes, and would go on serving a file the others
+# have made stale.
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        "The default cache is local to each process, so report artifacts go stale across workers.",
+        hint="Set CACHE_BACKEND and CACHE_LOCATION to a shared cache such as Redis.",
+        id="clubs.W001",
+    )]
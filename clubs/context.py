@@ -0,0 +1,208 @@
+from django.core.cache import cache
+from django.db.models import (
+    Case, Count, F, FloatField, IntegerField, Max, OuterRef, Prefetch, Subquery, Value, When, Window,
+)
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from .cache import get_club_version, CLUB_FRAGMENT_TIMEOUT
+from .models import Club, ClubPost, PollOption, Event, EventWaitlistEntry, Poll
+from .pagination import paginate
+
+# -------------------------
+# TEMPLATE CONTEXT BUILDERS
+# -------------------------
+# Templates must never hit the database. Everything they need is fetched
+# here with annotated counts and prefetches, and per-user state (membership,
+# votes, RSVPs) is reduced to sets of ids so the template can use ``in``.
+
+
+def events_with_counts(queryset):
+    """Events with their club loaded (``attendee_total`` is a stored counter)."""
+    return queryset.select_related("club")
+
+
+def clubs_with_counts(queryset):
+    """Clubs with ``member_total`` annotated (distinct, so safe to combine)."""
+    return queryset.annotate(member_total=Count("members", distinct=True))
+
+
+def _count_per(model, field, ref="pk"):
+    """Rows of ``model`` whose ``field`` is the outer row, as a correlated subquery."""
+    rows = model.objects.filter(**{field: OuterRef(ref)}).order_by().values(field).annotate(n=Count("*")).values("n")
+    return Coalesce(Subquery(rows), 0)
+
+
+def clubs_with_activity_counts(queryset):
+    """
+    Clubs with ``member_count``, ``event_count``, ``post_count`` and
+    ``poll_count`` annotated.
+
+    Each count is its own subquery: joining several to-many relations in one
+    GROUP BY multiplies the rows, so every count would be inflated by the
+    others.
+    """
+    return queryset.annotate(
+        member_count=_count_per(Club.members.through, "club"),
+        event_count=_count_per(Event, "club"),
+        post_count=_count_per(ClubPost, "club"),
+        poll_count=_count_per(Poll, "club"),
+    )
+
+
+# Weights of each count in a club's engagement score
+ENGAGEMENT_WEIGHTS = {"member_count": 0.2, "event_count": 0.3, "post_count": 0.3, "poll_count": 0.2}
+
+
+def clubs_with_engagement(queryset):
+    """
+    Clubs with their activity counts, ``raw_score`` (the weighted sum of the
+    counts) and ``engagement_percentage`` (the score as a percentage of the
+    highest one, 0 when no club has any activity), all in one query.
+    """
+    score = sum(F(name) * Value(weight) for name, weight in ENGAGEMENT_WEIGHTS.items())
+    clubs = clubs_with_activity_counts(queryset).annotate(
+        raw_score=Coalesce(score, Value(0.0), output_field=FloatField())
+    )
+    best = Window(Max("raw_score"))
+    return clubs.annotate(
+        engagement_percentage=Coalesce(
+            F("raw_score") * Value(100.0) / NullIf(best, Value(0.0)), Value(0.0), output_field=FloatField()
+        )
+    )
+
+
+def polls_with_vote_totals(queryset):
+    """
+    Polls with their club loaded and ``vote_total`` (votes across all
+    options). A closed poll's total comes from its frozen results; only open
+    polls count votes.
+    """
+    votes = _count_per(PollOption.votes.through, "polloption__poll")
+    frozen = Cast(KT("results__total"), IntegerField())
+    return queryset.select_related("club").annotate(
+        vote_total=Case(When(results__isnull=False, then=frozen), default=votes)
+    )
+
+
+def polls_with_options(queryset):
+    """Polls with options prefetched, each option carrying ``num_votes``."""
+    options = PollOption.objects.annotate(num_votes=Count("votes")).order_by("id")
+    return queryset.select_related("club").prefetch_related(Prefetch("options", queryset=options))
+
+
+def user_state(user, clubs=None, events=None, polls=None):
+    """
+    Return the user's membership, RSVP, waitlist and vote ids, one query per kind.
+
+    Pass the clubs/events/polls shown on the page to keep each lookup bounded
+    by the page size; ``None`` skips that lookup.
+    """
+    state = {
+        "my_club_ids": set(), "rsvp_event_ids": set(), "waitlisted_event_ids": set(),
+        "voted_poll_ids": set(), "voted_option_ids": set(),
+    }
+    if not user.is_authenticated:
+        return state
+
+    if clubs is not None:
+        state["my_club_ids"] = set(
+            Club.members.through.objects.filter(user_id=user.pk, club_id__in=[c.pk for c in clubs])
+            .values_list("club_id", flat=True)
+        )
+    if events is not None:
+        state["rsvp_event_ids"] = set(
+            Event.attendees.through.objects.filter(user_id=user.pk, event_id__in=[e.pk for e in events])
+            .values_list("event_id", flat=True)
+        )
+        state["waitlisted_event_ids"] = set(
+            EventWaitlistEntry.objects.filter(user_id=user.pk, event_id__in=[e.pk for e in events])
+            .values_list("event_id", flat=True)
+        )
+    if polls is not None:
+        votes = PollOption.votes.through.objects.filter(
+            user_id=user.pk, polloption__poll_id__in=[p.pk for p in polls]
+        ).values_list("polloption_id", "polloption__poll_id")
+        for option_id, poll_id in votes:
+            state["voted_option_ids"].add(option_id)
+            state["voted_poll_ids"].add(poll_id)
+    return state
+
+
+# Closed polls listed under the club's open ones
+CLOSED_POLLS_SHOWN = 5
+
+
+def final_results(poll):
+    """
+    Per-option ``{"id", "text", "votes"}`` for a poll that no longer takes
+    votes: its frozen results, or (until they are written) its options'
+    ``num_votes`` from polls_with_options.
+    """
+    if poll.results is not None:
+        return poll.results["options"]
+    return [{"id": option.id, "text": option.text, "votes": option.num_votes} for option in poll.options.all()]
+
+
+def _club_shared_data(club):
+    """Everything on the club page that is the same for every viewer."""
+    members = list(club.members.select_related("profile").order_by("id"))
+    # Votes are only counted for polls whose results aren't frozen yet
+    polls = list(polls_with_options(club.polls.filter(closed_at__isnull=True).order_by("-created_at", "-id")))
+    closed_polls = list(club.polls.filter(closed_at__isnull=False).order_by("-closed_at", "-id")[:CLOSED_POLLS_SHOWN])
+    events = list(events_with_counts(club.events.filter(date__gte=timezone.now()).order_by("date", "id")))
+    return {
+        "members": members,
+        "member_count": len(members),
+        "member_ids": {member.pk for member in members},
+        "post_count": club.posts.count(),
+        "polls": polls,
+        "closed_polls": closed_polls,
+        "events": events,
+    }
+
+
+def build_club_detail_context(request, club):
+    """
+    Context for clubs/club_detail.html.
+
+    Shared data is cached under the club's version (see clubs/cache.py) and
+    rebuilt in a handful of queries after any change to the club; the
+    viewer's own votes and RSVPs are looked up with two indexed queries.
+    """
+    version = get_club_version(club.id)
+    shared = cache.get_or_set(
+        f"clubs:club:{club.id}:v{version}:detail",
+        lambda: _club_shared_data(club),
+        CLUB_FRAGMENT_TIMEOUT,
+    )
+
+    posts = paginate(request, club.posts.select_related("author"), ("-created_at", "-id"))
+    len(posts)  # evaluate now so the template renders without touching the database
+
+    # Open and closed depend on the time, so they are sorted per request; a
+    # poll past its closes_at shows with the closed ones before it is frozen
+    active_polls = [poll for poll in shared["polls"] if poll.is_open]
+    closed_polls = [poll for poll in shared["polls"] if poll.is_closed] + shared["closed_polls"]
+    for poll in closed_polls:
+        poll.final_results = final_results(poll)
+
+    user = request.user
+    role = getattr(getattr(user, "profile", None), "role", "")
+    state = user_state(user, events=shared["events"], polls=active_polls)
+
+    return {
+        "club": club,
+        "club_version": version,
+        "fragment_timeout": CLUB_FRAGMENT_TIMEOUT,
+        "role": role,
+        "is_member": user.pk in shared["member_ids"],
+        "posts": posts,
+        "upcoming_events": shared["events"],
+        **shared,
+        "polls": active_polls,
+        "active_polls": active_polls,
+        "closed_polls": closed_polls,
+        **state,
+    }
@@ -0,0 +1,157 @@
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import CharField, DateField, F, Q, TextField, Value
+from django.http import QueryDict
+
+from .models import Club, ClubPost, Event, Poll
+
+# -------------------------
+# ACTIVITY FEED
+# -------------------------
+# A student's feed is every post, event and poll from their clubs, newest
+# first. It is built when read: a page is a single UNION of the three
+# tables filtered to the user's clubs, ordered by (created_at, kind, id)
+# and cut to the page size, so it costs the same however many clubs the
+# user is in. Paging is keyset-based like the other lists (see
+# pagination.py): the cursor is the key of the last item shown.
+#
+# Each page is cached per user for FEED_CACHE_TIMEOUT seconds, so reloading
+# the dashboard doesn't rebuild it; new posts show up once it expires.
+
+FEED_PAGE_SIZE = 20
+MAX_FEED_PAGE_SIZE = 50
+FEED_CACHE_TIMEOUT = 30
+FEED_CURSOR_SALT = "clubs.feed"
+
+# Columns each table contributes, in the same order for every branch of
+# the UNION
+FEED_SOURCES = {
+    "post": (ClubPost, {
+        "headline": F("title"),
+        "body": F("content"),
+        "event_date": Value(None, output_field=DateField()),
+    }),
+    "event": (Event, {
+        "headline": F("name"),
+        "body": F("description"),
+        "event_date": F("date"),
+    }),
+    "poll": (Poll, {
+        "headline": F("question"),
+        "body": Value("", output_field=TextField()),
+        "event_date": Value(None, output_field=DateField()),
+    }),
+}
+
+
+class FeedPage:
+    """One page of feed items (plain dicts) and the cursor for the next page."""
+
+    def __init__(self, items, next_cursor, cursor_param="cursor", params=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.cursor_param = cursor_param
+        self.params = params
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def next_query(self):
+        """Query string for the "load more" link (see KeysetPage.next_query)."""
+        if not self.has_next:
+            return None
+        params = self.params.copy() if self.params is not None else QueryDict(mutable=True)
+        params.pop("partial", None)
+        params[self.cursor_param] = self.next_cursor
+        return params.urlencode()
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+def encode_cursor(item):
+    return signing.dumps(
+        [item["created_at"].isoformat(), item["kind"], item["id"]], salt=FEED_CURSOR_SALT, compress=True
+    )
+
+
+def decode_cursor(cursor):
+    """Return (created_at, kind, id) or None for a missing/tampered cursor."""
+    if not cursor:
+        return None
+    try:
+        created_at, kind, pk = signing.loads(cursor, salt=FEED_CURSOR_SALT)
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+    if kind not in FEED_SOURCES:
+        return None
+    return created_at, kind, pk
+
+
+def _after(kind, position):
+    """
+    Rows of one table that come after ``position`` in the feed order.
+
+    The feed sorts on (created_at, kind, id), all descending. ``kind`` is
+    fixed within a table, so the tie on created_at resolves per table.
+    """
+    created_at, last_kind, last_id = position
+    if kind < last_kind:
+        return Q(created_at__lte=created_at)
+    if kind > last_kind:
+        return Q(created_at__lt=created_at)
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+
+
+def _branch(kind, club_ids, position):
+    model, columns = FEED_SOURCES[kind]
+    rows = model.objects.filter(club_id__in=club_ids)
+    if position is not None:
+        rows = rows.filter(_after(kind, position))
+    return rows.values(
+        "id", "club_id", "created_at",
+        kind=Value(kind, output_field=CharField()),
+        club_name=F("club__name"),
+        **columns,
+    ).order_by()
+
+
+def _cache_key(user_id, position, per_page):
+    where = "head" if position is None else ":".join(map(str, position))
+    return f"clubs:feed:{user_id}:{per_page}:{where}"
+
+
+def feed_items(club_ids, position=None, per_page=FEED_PAGE_SIZE):
+    """Up to ``per_page + 1`` feed items after ``position`` for ``club_ids``, in one query."""
+    first, *rest = (_branch(kind, club_ids, position) for kind in FEED_SOURCES)
+    return list(first.union(*rest, all=True).order_by("-created_at", "-kind", "-id")[:per_page + 1])
+
+
+def feed_page(user, cursor=None, per_page=FEED_PAGE_SIZE, cursor_param="cursor", params=None):
+    """
+    The page of ``user``'s feed after ``cursor``.
+
+    Items are dicts with ``kind`` ("post", "event" or "poll"), ``id``,
+    ``club_id``, ``club_name``, ``created_at``, ``headline``, ``body`` and
+    ``event_date`` (None except for events).
+    """
+    per_page = max(1, min(per_page, MAX_FEED_PAGE_SIZE))
+    position = decode_cursor(cursor)
+    key = _cache_key(user.pk, position, per_page)
+    rows = cache.get(key)
+    if rows is None:
+        club_ids = list(Club.members.through.objects.filter(user_id=user.pk).values_list("club_id", flat=True))
+        rows = feed_items(club_ids, position, per_page) if club_ids else []
+        cache.set(key, rows, FEED_CACHE_TIMEOUT)
+
+    items = rows[:per_page]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > per_page else None
+    return FeedPage(items, next_cursor, cursor_param, params)
@@ -0,0 +1,29 @@
+from functools import lru_cache
+from django.utils.module_loading import import_string
+
+
+@lru_cache(maxsize=None)
+def _resolve(dotted_path):
+    return import_string(dotted_path)
+
+
+def lazy_view(dotted_path, asynchronous=False):
+    """
+    URLconf entry for a view whose module is imported on its first request.
+
+    Keeps heavy view modules (reports, PDF rendering) out of worker boot and
+    out of every ``manage.py`` command that loads the URLconf. Pass
+    ``asynchronous=True`` for an ``async def`` view: Django decides how to
+    call a view from the URLconf entry, before the module is imported.
+    """
+    if asynchronous:
+        async def view(request, *args, **kwargs):
+            return await _resolve(dotted_path)(request, *args, **kwargs)
+    else:
+        def view(request, *args, **kwargs):
+            return _resolve(dotted_path)(request, *args, **kwargs)
+
+    view.__name__ = dotted_path.rsplit(".", 1)[-1]
+    view.__qualname__ = view.__name__
+    view.__module__ = dotted_path.rsplit(".", 1)[0]
+    return view
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .cache import get_poll_tally_version
+from .models import Poll, PollOption
+
+# -------------------------
+# LIVE POLL RESULTS
+# -------------------------
+# poll_vote.html and the mobile app follow a poll's tallies over
+# server-sent events instead of reloading. A vote only bumps the poll's
+# tally version (clubs/cache.py). Each open stream looks at that version
+# once every POLL_RESULTS_INTERVAL seconds and sends the tallies only when
+# it has moved, so however many votes land in an interval, a listener gets
+# at most one message for it. The tallies for a version are counted once
+# and cached, so all listeners of a poll share one query per change.
+#
+# Streams are held open under ASGI (SERVER_MODE=asgi). Under WSGI a
+# request gets the current tallies and closes, and the browser reconnects
+# after the interval, which turns the stream into coalesced polling without
+# tying up a sync worker. With several workers, the tally versions need a
+# cache shared between them (CACHE_BACKEND), as the club fragments do.
+#
+# Once a poll is closed its tallies are the frozen snapshot: a stream sends
+# it marked ``final`` and ends, and the page stops listening.
+
+POLL_RESULTS_INTERVAL = 1.0       # seconds
+POLL_RESULTS_HEARTBEAT = 15       # seconds without a message before a keep-alive
+POLL_RESULTS_MAX_SECONDS = 300    # then the stream ends and EventSource reconnects
+TALLY_CACHE_TIMEOUT = 60
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def count_votes(poll_id):
+    """``{"total": n, "options": [{"id", "text", "votes"}, ...]}`` counted in one query."""
+    options = [
+        {"id": option["id"], "text": option["text"], "votes": option["num_votes"]}
+        for option in PollOption.objects.filter(poll_id=poll_id)
+        .annotate(num_votes=Count("votes")).order_by("id").values("id", "text", "num_votes")
+    ]
+    return {"total": sum(option["votes"] for option in options), "options": options}
+
+
+def poll_tally(poll_id):
+    """
+    ``{"poll": id, "final": bool, "total": n, "options": [...]}``: the frozen
+    results of a closed poll (see clubs/polls.py), otherwise counted now.
+    """
+    results = Poll.objects.filter(pk=poll_id).values_list("results", flat=True).first()
+    if results is not None:
+        return {"poll": poll_id, "final": True, **results}
+    return {"poll": poll_id, "final": False, **count_votes(poll_id)}
+
+
+def tally_snapshot(poll_id, version=None):
+    """The tallies as of ``version`` (the current one by default), counted once per version."""
+    if version is None:
+        version = get_poll_tally_version(poll_id)
+    return cache.get_or_set(
+        f"clubs:poll:{poll_id}:tally:v{version}", lambda: poll_tally(poll_id), TALLY_CACHE_TIMEOUT
+    )
+
+
+def sse_message(data, event=None, id=None):
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    if id is not None:
+        lines.append(f"id: {id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def tally_events(poll_id, last_version=None, once=False):
+    """
+    Server-sent events for a poll: a ``tally`` message whenever its version
+    moves (checked once per interval), keep-alive comments in between. The
+    stream ends after a poll's final results, which never change.
+
+    ``last_version`` is the client's Last-Event-ID, so a reconnecting client
+    isn't sent tallies it already has. ``once`` stops after the first check.
+    """
+    interval = _setting("POLL_RESULTS_INTERVAL", POLL_RESULTS_INTERVAL)
+    heartbeat = _setting("POLL_RESULTS_HEARTBEAT", POLL_RESULTS_HEARTBEAT)
+    max_seconds = _setting("POLL_RESULTS_MAX_SECONDS", POLL_RESULTS_MAX_SECONDS)
+    loop = asyncio.get_running_loop()
+    started = last_message = loop.time()
+
+    yield f"retry: {int(interval * 1000)}\n\n"
+    while True:
+        version = str(await sync_to_async(get_poll_tally_version)(poll_id))
+        if version != last_version:
+            tally = await sync_to_async(tally_snapshot)(poll_id, version)
+            yield sse_message(tally, event="tally", id=version)
+            if tally["final"]:
+                return
+            last_version, last_message = version, loop.time()
+        elif loop.time() - last_message >= heartbeat:
+            yield ": keep-alive\n\n"
+            last_message = loop.time()
+        if once or loop.time() - started >= max_seconds:
+            return
+        await asyncio.sleep(interval)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def count_attendees(apps, schema_editor):
+    Event = apps.get_model("clubs", "Event")
+    for event in Event.objects.annotate(total=models.Count("attendees")).only("id"):
+        Event.objects.filter(pk=event.pk).update(attendee_total=event.total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendee_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='EventWaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='clubs.event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_waitlist', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'constraints': [models.UniqueConstraint(fields=('event', 'user'), name='unique_waitlist_entry')],
+            },
+        ),
+        migrations.RunPython(count_attendees, migrations.RunPython.noop),
+    ]
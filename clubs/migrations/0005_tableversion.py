@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_event_capacity_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=100, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
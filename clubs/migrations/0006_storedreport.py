@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0005_tableversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('path', models.CharField(max_length=500, unique=True)),
+                ('backend', models.CharField(max_length=20)),
+                ('url', models.CharField(max_length=1000)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('content_type', models.CharField(default='text/csv', max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('stored', 'Stored'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stored_reports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['owner', '-created_at'], name='clubs_store_owner_i_5f12f0_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0006_storedreport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedreport',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0007_storedreport_attempts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClubActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=5)),
+                ('bucket', models.DateTimeField()),
+                ('posts', models.PositiveIntegerField(default=0)),
+                ('votes', models.PositiveIntegerField(default=0)),
+                ('rsvps', models.PositiveIntegerField(default=0)),
+                ('joins', models.PositiveIntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to='clubs.club')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'bucket'], name='clubs_cluba_period_6ae285_idx')],
+                'constraints': [models.UniqueConstraint(fields=('club', 'period', 'bucket'), name='unique_activity_bucket')],
+            },
+        ),
+    ]
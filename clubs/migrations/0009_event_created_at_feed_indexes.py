@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:46
+
+import datetime
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def created_from_earliest_known(apps, schema_editor):
+    # The column was filled with the migration time. An event was announced
+    # no later than its first waitlist entry or the day it takes place,
+    # whichever came first
+    Event = apps.get_model("clubs", "Event")
+    EventWaitlistEntry = apps.get_model("clubs", "EventWaitlistEntry")
+    first_waiting = dict(
+        EventWaitlistEntry.objects.values("event_id").annotate(first=models.Min("created_at"))
+        .values_list("event_id", "first")
+    )
+    events = list(Event.objects.only("id", "date", "created_at"))
+    for event in events:
+        day = django.utils.timezone.make_aware(datetime.datetime.combine(event.date, datetime.time.min))
+        known = [event.created_at, day, first_waiting.get(event.id, event.created_at)]
+        event.created_at = min(known)
+    Event.objects.bulk_update(events, ["created_at"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0008_clubactivityrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(created_from_earliest_known, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='clubpost',
+            index=models.Index(fields=['club', '-created_at', '-id'], name='clubs_clubp_club_id_3c4abe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['club', '-created_at', '-id'], name='clubs_event_club_id_e73a1c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='poll',
+            index=models.Index(fields=['club', '-created_at', '-id'], name='clubs_poll_club_id_caa530_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0009_event_created_at_feed_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingVote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('flushed_at', models.DateTimeField(blank=True, null=True)),
+                ('option', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_votes', to='clubs.polloption')),
+                ('poll', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_votes', to='clubs.poll')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_votes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('flushed_at__isnull', True)), fields=['id'], name='pending_vote_queue_idx')],
+                'constraints': [models.UniqueConstraint(fields=('poll', 'user'), name='unique_pending_vote')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:59
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def open_from_creation(apps, schema_editor):
+    # Existing polls have been open since they were created
+    Poll = apps.get_model("clubs", "Poll")
+    Poll.objects.update(opens_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0010_pendingvote'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='poll',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='poll',
+            name='closes_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='poll',
+            name='opens_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='poll',
+            name='results',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(open_from_creation, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0011_poll_lifecycle'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='TableVersion',
+        ),
+    ]
@@ -1,5 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .cache import bump_club_version, bump_poll_tally_version, bump_table_version
 
 
 class Club(models.Model):
@@ -39,6 +45,10 @@ class ClubPost(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Newest-first per club, for the activity feed (clubs/feed.py)
+        indexes = [models.Index(fields=["club", "-created_at", "-id"])]
+
     def __str__(self):
         return f"{self.title} ({self.club.name})"
 
@@ -52,12 +62,35 @@ class Poll(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Votes are taken from opens_at until closes_at (no limit if unset)
+    opens_at = models.DateTimeField(default=timezone.now)
+    closes_at = models.DateTimeField(null=True, blank=True)
+    # Written once by clubs.polls.close_poll: when the results were frozen
+    # and the tallies at that moment ({"total": n, "options": [...]})
+    closed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    results = models.JSONField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["club", "-created_at", "-id"])]
 
     def __str__(self):
         return self.question
 
+    @property
+    def is_closed(self):
+        """No longer taking votes (its results may not be frozen yet)."""
+        return self.closed_at is not None or (
+            self.closes_at is not None and self.closes_at <= timezone.now()
+        )
+
+    @property
+    def is_open(self):
+        return self.opens_at <= timezone.now() and not self.is_closed
+
     def total_votes(self):
         """Returns total number of votes across all options"""
+        if self.results is not None:
+            return self.results["total"]
         return sum(option.vote_count() for option in self.options.all())
 
 
@@ -91,9 +124,286 @@ class Event(models.Model):
         related_name="event_attendees",
         blank=True
     )
+    # Leave empty for no limit; extra RSVPs go to the waitlist
+    capacity = models.PositiveIntegerField(null=True, blank=True)
+    # Denormalized len(attendees), kept in step by clubs/toggles.py and the
+    # attendees_changed signal below
+    attendee_total = models.PositiveIntegerField(default=0, editable=False)
+    # When the event was announced (``date`` is when it takes place)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["club", "-created_at", "-id"])]
 
     def __str__(self):
         return f"{self.name} ({self.club.name})"
 
     def attendee_count(self):
-        return self.attendees.count()
+        return self.attendee_total
+
+    def is_full(self):
+        return self.capacity is not None and self.attendee_total >= self.capacity
+
+
+class EventWaitlistEntry(models.Model):
+    """A user waiting for a place at a full event, promoted first-come first-served."""
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="waitlist"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="event_waitlist"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created_at", "id"]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "user"], name="unique_waitlist_entry"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} waiting for {self.event.name}"
+
+
+class PendingVote(models.Model):
+    """
+    A vote accepted in buffered mode (VOTE_BUFFERING), kept as an
+    append-only log. The vote flusher (clubs/votes.py) adds it to
+    PollOption.votes and sets ``flushed_at``.
+    """
+    poll = models.ForeignKey(Poll, on_delete=models.CASCADE, related_name="pending_votes")
+    option = models.ForeignKey(PollOption, on_delete=models.CASCADE, related_name="pending_votes")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="pending_votes"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    flushed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["poll", "user"], name="unique_pending_vote"),
+        ]
+        indexes = [
+            # The flusher's queue: unflushed rows in arrival order
+            models.Index(fields=["id"], condition=Q(flushed_at__isnull=True), name="pending_vote_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} voted {self.option_id} in poll {self.poll_id}"
+
+
+
+class IdempotencyKey(models.Model):
+    """
+    Result of a toggle request, stored under the client's Idempotency-Key so
+    a retried request (e.g. a mobile client on a flaky connection) replays
+    the first answer instead of toggling a second time.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys"
+    )
+    endpoint = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    response = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "endpoint", "key"], name="unique_idempotency_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.endpoint} {self.key}"
+
+
+class StoredReport(models.Model):
+    """
+    Index of a report file saved through the report storage backend
+    (clubs/storage.py). "My reports" pages list these rows instead of
+    asking the remote bucket for a listing on every page view.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('stored', 'Stored'),
+        ('failed', 'Failed'),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="stored_reports"
+    )
+    name = models.CharField(max_length=255)
+    path = models.CharField(max_length=500, unique=True)
+    backend = models.CharField(max_length=20)
+    url = models.CharField(max_length=1000)
+    size = models.PositiveIntegerField(default=0)
+    content_type = models.CharField(max_length=100, default="text/csv")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["owner", "-created_at"])]
+
+    def __str__(self):
+        return f"{self.path} ({self.status})"
+
+
+class ClubActivityRollup(models.Model):
+    """
+    What happened in one club during one hour or one day. Filled in as
+    activity happens (clubs/rollups.py), so analytics sum a few of these
+    rows instead of scanning posts, votes and RSVPs.
+    """
+    PERIOD_CHOICES = [
+        ("hour", "Hour"),
+        ("day", "Day"),
+    ]
+
+    club = models.ForeignKey(
+        Club, on_delete=models.CASCADE, related_name="activity_rollups"
+    )
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    # Start of the hour or day, in the site time zone
+    bucket = models.DateTimeField()
+    posts = models.PositiveIntegerField(default=0)
+    votes = models.PositiveIntegerField(default=0)
+    rsvps = models.PositiveIntegerField(default=0)
+    joins = models.PositiveIntegerField(default=0)
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["club", "period", "bucket"], name="unique_activity_bucket"),
+        ]
+        indexes = [models.Index(fields=["period", "bucket"])]
+
+    def __str__(self):
+        return f"{self.club} {self.period} {self.bucket:%Y-%m-%d %H:00}"
+
+# =====================
+# ⚙️ SIGNALS FOR CLUB PAGE CACHE
+# =====================
+# Versions are bumped once the write commits: bumped earlier, a page read in
+# between would cache the old data under the new version.
+
+def _bump_on_commit(bump, key):
+    transaction.on_commit(lambda: bump(key))
+
+
+@receiver([post_save, post_delete], sender=Club)
+def club_changed(sender, instance, **kwargs):
+    _bump_on_commit(bump_club_version, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ClubPost)
+@receiver([post_save, post_delete], sender=Poll)
+@receiver([post_save, post_delete], sender=Event)
+def club_content_changed(sender, instance, **kwargs):
+    """A post, poll or event was created, edited or deleted."""
+    _bump_on_commit(bump_club_version, instance.club_id)
+
+
+@receiver([post_save, post_delete], sender=PollOption)
+def poll_option_changed(sender, instance, **kwargs):
+    club_id = Poll.objects.filter(pk=instance.poll_id).values_list("club_id", flat=True).first()
+    _bump_on_commit(bump_club_version, club_id)
+    _bump_on_commit(bump_poll_tally_version, instance.poll_id)
+
+
+def _bump_for_m2m(instance, model, field, action, pk_set, club_ids_for, bump=bump_club_version):
+    """
+    Bump the owning club(s) after an m2m add/remove/clear (or whatever
+    ``club_ids_for`` maps to, with ``bump``).
+
+    ``instance`` is the model object on the forward side (a Club, PollOption
+    or Event) or a User when the relation was changed from the user's side,
+    in which case ``pk_set`` holds ids of ``model`` (or None for a clear).
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if isinstance(instance, model):
+        ids = [instance.pk]
+    elif pk_set is None:
+        ids = model.objects.filter(**{field: instance}).values_list("pk", flat=True)
+    else:
+        ids = pk_set
+    for club_id in set(club_ids_for(ids)):
+        _bump_on_commit(bump, club_id)
+
+
+@receiver(m2m_changed, sender=Club.members.through)
+def membership_changed(sender, instance, action, pk_set, **kwargs):
+    _bump_for_m2m(instance, Club, "members", action, pk_set, lambda ids: ids)
+
+
+@receiver(m2m_changed, sender=PollOption.votes.through)
+def votes_changed(sender, instance, action, pk_set, **kwargs):
+    _bump_for_m2m(
+        instance, PollOption, "votes", action, pk_set,
+        lambda ids: PollOption.objects.filter(pk__in=ids).values_list("poll__club_id", flat=True),
+    )
+    # Live result streams (clubs/live.py) watch each poll's tally version
+    _bump_for_m2m(
+        instance, PollOption, "votes", action, pk_set,
+        lambda ids: PollOption.objects.filter(pk__in=ids).values_list("poll_id", flat=True),
+        bump=bump_poll_tally_version,
+    )
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def attendees_changed(sender, instance, action, pk_set, counter_updated=False, **kwargs):
+    """
+    Recount attendee_total after attendees are changed directly (admin,
+    ``event.attendees.add()``); the RSVP engine updates the counter itself.
+    """
+    if action == "pre_clear" and not isinstance(instance, Event):
+        # Cleared from the user's side: note the events before the rows go
+        instance._cleared_event_ids = list(
+            Event.attendees.through.objects.filter(user_id=instance.pk).values_list("event_id", flat=True)
+        )
+    if action in ("post_add", "post_remove", "post_clear") and not counter_updated:
+        if isinstance(instance, Event):
+            event_ids = [instance.pk]
+        elif pk_set is None:
+            event_ids = getattr(instance, "_cleared_event_ids", [])
+        else:
+            event_ids = pk_set
+        attendees = (
+            Event.attendees.through.objects.filter(event_id=OuterRef("pk"))
+            .values("event_id").annotate(total=Count("id")).values("total")
+        )
+        Event.objects.filter(pk__in=event_ids).update(
+            attendee_total=Coalesce(Subquery(attendees), 0)
+        )
+    _bump_for_m2m(
+        instance, Event, "attendees", action, pk_set,
+        lambda ids: Event.objects.filter(pk__in=ids).values_list("club_id", flat=True),
+    )
+
+
+# =====================
+# ⚙️ SIGNALS FOR TABLE CHANGE COUNTERS
+# =====================
+
+def table_changed(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return  # logging in changes nothing a report shows
+    _bump_on_commit(bump_table_version, sender._meta.db_table)
+
+
+def m2m_table_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        _bump_on_commit(bump_table_version, sender._meta.db_table)
+
+
+for _model in (
+    Club, ClubPost, Poll, PollOption, Event,
+    settings.AUTH_USER_MODEL, "users.Profile", "users.Course", "users.StudentMark",
+):
+    post_save.connect(table_changed, sender=_model, dispatch_uid=f"table_version_save_{_model}")
+    post_delete.connect(table_changed, sender=_model, dispatch_uid=f"table_version_delete_{_model}")
+
+for _through in (Club.members.through, PollOption.votes.through, Event.attendees.through):
+    m2m_changed.connect(m2m_table_changed, sender=_through, dispatch_uid=f"table_version_m2m_{_through.__name__}")
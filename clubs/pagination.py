@@ -0,0 +1,139 @@
+from django.core import signing
+from django.db.models import Q
+from django.http import JsonResponse, QueryDict
+from django.template.loader import render_to_string
+from django.utils.functional import cached_property
+
+# -------------------------
+# KEYSET PAGINATION
+# -------------------------
+# Offset pagination (LIMIT/OFFSET) gets slower the deeper a user scrolls,
+# because the database still walks every skipped row. Keyset pagination
+# instead remembers the (sort value, id) of the last row shown and asks for
+# rows strictly after it, so every page costs the same indexed range scan.
+
+PAGE_SIZE = 20
+CURSOR_SALT = "clubs.pagination"
+
+
+class KeysetPage:
+    """
+    One page of results plus the cursor for the page after it.
+
+    The rows are fetched on first access, so a page whose template fragment
+    is served from cache never touches the database.
+    """
+
+    def __init__(self, paginator, queryset, cursor_param="cursor", params=None):
+        self.paginator = paginator
+        self.queryset = queryset
+        self.cursor_param = cursor_param
+        self.params = params
+
+    @cached_property
+    def _rows(self):
+        # Fetch one extra row to learn whether another page exists
+        return list(self.queryset[:self.paginator.per_page + 1])
+
+    @cached_property
+    def items(self):
+        return self._rows[:self.paginator.per_page]
+
+    @cached_property
+    def next_cursor(self):
+        if len(self._rows) <= self.paginator.per_page:
+            return None
+        return self.paginator.encode_cursor(self.items[-1])
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def next_query(self):
+        """Query string for the "load more" link, keeping search/filter params."""
+        if not self.has_next:
+            return None
+        params = self.params.copy() if self.params is not None else QueryDict(mutable=True)
+        params.pop("partial", None)
+        params[self.cursor_param] = self.next_cursor
+        return params.urlencode()
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset on a (field, 'id') key.
+
+    ``ordering`` is a pair such as ('-created_at', '-id') or ('date', 'id').
+    Both fields must sort in the same direction and the second one must be
+    unique so that the cursor always points at exactly one row.
+    """
+
+    def __init__(self, queryset, ordering=("-created_at", "-id"), per_page=PAGE_SIZE):
+        field, tiebreak = ordering
+        if field.startswith("-") != tiebreak.startswith("-"):
+            raise ValueError("Keyset ordering fields must share a direction.")
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.descending = field.startswith("-")
+        self.field = field.lstrip("-")
+        self.tiebreak = tiebreak.lstrip("-")
+
+    def encode_cursor(self, obj):
+        value = getattr(obj, self.field)
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        return signing.dumps([value, getattr(obj, self.tiebreak)], salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor):
+        """Return (value, tiebreak) or None for a missing/tampered cursor."""
+        if not cursor:
+            return None
+        try:
+            value, tiebreak = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, ValueError, TypeError):
+            return None
+        return value, tiebreak
+
+    def page(self, cursor=None, cursor_param="cursor", params=None):
+        queryset = self.queryset.order_by(*self.ordering)
+        position = self.decode_cursor(cursor)
+        if position is not None:
+            value, tiebreak = position
+            op = "lt" if self.descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{op}": value})
+                | Q(**{self.field: value, f"{self.tiebreak}__{op}": tiebreak})
+            )
+        return KeysetPage(self, queryset, cursor_param, params)
+
+
+def paginate(request, queryset, ordering=("-created_at", "-id"), cursor_param="cursor", per_page=PAGE_SIZE):
+    """Return the KeysetPage selected by ``request.GET[cursor_param]``."""
+    paginator = KeysetPaginator(queryset, ordering, per_page)
+    return paginator.page(request.GET.get(cursor_param), cursor_param, request.GET)
+
+
+def is_partial(request):
+    """True when the "load more" script is asking for rows only."""
+    return (
+        request.GET.get("partial") == "1"
+        or request.headers.get("x-requested-with") == "XMLHttpRequest"
+    )
+
+
+def load_more_response(request, template_name, page, context=None):
+    """Render just the rows of ``page`` for the "load more" script."""
+    context = dict(context or {}, page=page)
+    html = render_to_string(template_name, context, request=request)
+    return JsonResponse({"html": html, "next": page.next_query})
@@ -0,0 +1,211 @@
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable
+from django.http import FileResponse
+
+# -------------------------
+# PDF REPORT ENGINE
+# -------------------------
+# A report is described by a ReportSpec (title + sections) and drawn by
+# render_report(). Paragraph and table styles are built once per process
+# instead of on every request. Sections may be a generator and table rows
+# may stream from a queryset iterator; flowables are produced only as
+# reportlab reaches them and the PDF is written to a temporary file, so
+# memory stays flat however large the report is.
+# reportlab itself is imported inside the functions that draw, so importing
+# this module (or the report specs) does not load it at worker boot.
+
+SPOOL_MAX_SIZE = 1024 * 1024
+# Rows per table chunk: about one letter page of 11pt rows
+ROWS_PER_CHUNK = 40
+
+
+@lru_cache(maxsize=None)
+def get_styles():
+    """Paragraph styles shared by every report."""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        "normal": styles['Normal'],
+        "heading2": styles['Heading2'],
+        "heading3": styles['Heading3'],
+    }
+
+
+@lru_cache(maxsize=None)
+def get_table_style(name, header_font_size=11):
+    """Named table style ("grid", "summary" or "grades")."""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    if name == "grades":
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, -1), (-1, -1), colors.lightyellow),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')
+        ])
+    if name == "summary":
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('FONTSIZE', (0, 0), (-1, -1), 11)
+        ])
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), header_font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+
+@dataclass
+class Text:
+    """A paragraph; ``style`` is a key of get_styles()."""
+    text: str
+    style: str = "normal"
+    space_after: float = 0
+
+
+@dataclass
+class TableBlock:
+    """A table whose first row is the header; widths are in inches."""
+    rows: list
+    col_widths: list
+    style: str = "grid"
+    header_font_size: int = 11
+    space_after: float = 0.3
+
+
+@dataclass
+class StreamedTable:
+    """
+    A table fed from an iterable of rows (e.g. ``queryset.iterator()``).
+
+    Rows are pulled while the PDF is drawn and emitted as page-sized tables
+    that repeat the header, so a report over every student never holds the
+    whole population, or one giant Table, in memory.
+    """
+    header: list
+    rows: Iterable
+    col_widths: list
+    style: str = "grid"
+    header_font_size: int = 11
+    chunk_size: int = ROWS_PER_CHUNK
+    space_after: float = 0.3
+
+
+@dataclass
+class ReportSpec:
+    """Title plus sections; ``sections`` may be a generator for large reports."""
+    title: str
+    filename: str
+    sections: list = field(default_factory=list)
+
+    def add(self, *sections):
+        self.sections.extend(sections)
+        return self
+
+
+def _flowables(spec, generated_at):
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Table, Paragraph, Spacer
+
+    styles = get_styles()
+    yield Paragraph(spec.title, styles["title"])
+    yield Paragraph(f"Generated: {generated_at.strftime('%B %d, %Y at %I:%M %p')}", styles['normal'])
+    yield Spacer(1, 0.3*inch)
+
+    for section in spec.sections:
+        if isinstance(section, TableBlock):
+            table = Table(section.rows, colWidths=[w*inch for w in section.col_widths])
+            table.setStyle(get_table_style(section.style, section.header_font_size))
+            yield table
+        elif isinstance(section, StreamedTable):
+            style = get_table_style(section.style, section.header_font_size)
+            widths = [w*inch for w in section.col_widths]
+            rows = iter(section.rows)
+            while True:
+                chunk = list(islice(rows, section.chunk_size))
+                if not chunk:
+                    break
+                table = Table([section.header] + chunk, colWidths=widths, repeatRows=1)
+                table.setStyle(style)
+                yield table
+        else:
+            yield Paragraph(section.text, styles[section.style])
+        if section.space_after:
+            yield Spacer(1, section.space_after*inch)
+
+
+class _StreamedFlowables(list):
+    """
+    A flowable list that is filled from a generator as reportlab consumes it.
+
+    ``doc.build`` only looks at the front of the list (and puts split
+    remainders back there), so keeping a few flowables buffered is enough.
+    """
+
+    def __init__(self, source, lookahead=4):
+        super().__init__()
+        self._source = iter(source)
+        self._lookahead = lookahead
+        self._fill()
+
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+def render_report(spec, stream, generated_at=None):
+    """Draw ``spec`` as a PDF into the binary file-like ``stream``."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+
+    doc = SimpleDocTemplate(stream, pagesize=letter, pageCompression=1)
+    doc.build(_StreamedFlowables(_flowables(spec, generated_at or datetime.now())))
+    return stream
+
+
+def report_response(spec):
+    """Render ``spec`` into a spooled temp file and stream it as a download."""
+    stream = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    render_report(spec, stream)
+    stream.seek(0)
+    filename = f'{spec.filename}_{datetime.now().strftime("%Y%m%d")}.pdf'
+    return FileResponse(stream, as_attachment=True, filename=filename, content_type='application/pdf')
@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_poll_tally_version
+from .live import count_votes
+from .models import Poll
+from .votes import flush_votes
+
+# -------------------------
+# POLL LIFECYCLE
+# -------------------------
+# A poll takes votes from opens_at until closes_at, or until a lecturer
+# closes it. Closing freezes the results: the votes are counted one last
+# time and stored on the poll as ``results``, and ``closed_at`` records
+# when. From then on the club page, reports, the API and live streams all
+# show that snapshot and never read the vote tables for the poll again.
+# The snapshot is written once and never changes.
+#
+# A poll stops taking votes at its closes_at whether or not it has been
+# closed yet. close_due_polls (the close_polls command, run from cron)
+# freezes those polls' results; until then their tallies are counted as
+# before, and they no longer change.
+
+
+def open_polls(queryset=None, now=None):
+    """Polls taking votes ``now``: opened, not past closes_at and not closed."""
+    now = now or timezone.now()
+    queryset = Poll.objects.all() if queryset is None else queryset
+    return queryset.filter(
+        Q(closes_at__isnull=True) | Q(closes_at__gt=now),
+        opens_at__lte=now, closed_at__isnull=True,
+    )
+
+
+def close_poll(poll, when=None):
+    """
+    Close ``poll`` and freeze its results; returns False if it was already closed.
+
+    ``when`` (default now) becomes its closes_at, unless the poll was set to
+    close earlier than that.
+    """
+    when = when or timezone.now()
+    if poll.closes_at is None or poll.closes_at > when:
+        # Stop new votes before the final count
+        Poll.objects.filter(pk=poll.pk, closed_at__isnull=True).update(closes_at=when)
+        poll.closes_at = when
+    # Votes still in the write-behind log (clubs/votes.py) were cast in time
+    while flush_votes(poll_id=poll.pk):
+        pass
+
+    with transaction.atomic():
+        if not Poll.objects.select_for_update().filter(pk=poll.pk, closed_at__isnull=True).exists():
+            return False
+        poll.results = count_votes(poll.pk)
+        poll.closed_at = timezone.now()
+        poll.save(update_fields=["closes_at", "closed_at", "results"])
+        transaction.on_commit(lambda: bump_poll_tally_version(poll.pk))
+    return True
+
+
+def close_due_polls(now=None):
+    """Freeze the results of every poll past its closes_at; returns the polls closed."""
+    now = now or timezone.now()
+    due = Poll.objects.filter(closes_at__lte=now, closed_at__isnull=True).order_by("closes_at", "id")
+    return [poll for poll in due if close_poll(poll, now)]
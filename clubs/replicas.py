@@ -0,0 +1,172 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+
+# -------------------------
+# READ REPLICA ROUTING
+# -------------------------
+# With a "replica" database configured (REPLICA_DATABASE_URL), reads made
+# inside read_from_replica() - the analytics views and dashboards - go to
+# the replica so they don't compete with vote and RSVP
+# writes on the primary. Everything else, and every write, uses the
+# primary. Without a replica the router changes nothing.
+#
+# Read-your-writes: once a request writes, the rest of it reads from the
+# primary, and ReplicaPinMiddleware sets a signed cookie that keeps that
+# user's requests on the primary for REPLICA_PIN_SECONDS, long enough for
+# the replica to catch up.
+
+REPLICA_ALIAS = "replica"
+PIN_COOKIE = "db_pin"
+PIN_COOKIE_SALT = "clubs.replicas"
+REPLICA_PIN_SECONDS = 10
+
+
+class RoutingState:
+    """Per-request (or per-job) routing flags, shared by every thread the request uses."""
+
+    def __init__(self, pinned=False, sticky=False):
+        self.replica = False
+        self.pinned = pinned
+        # Requests switch to the primary once they write; report jobs don't
+        self.sticky = sticky
+        self.wrote = False
+
+
+# A mutable object rather than plain flags, so that writes made from
+# sync_to_async threads of an async view still pin the request
+_state = ContextVar("clubs_db_routing", default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections
+
+
+@contextmanager
+def _replica_reads():
+    state = _state.get()
+    token = None
+    if state is None:
+        state = RoutingState()
+        token = _state.set(state)
+    previous, state.replica = state.replica, True
+    try:
+        yield state
+    finally:
+        state.replica = previous
+        if token is not None:
+            _state.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """Send reads to the primary, even inside read_from_replica()."""
+    state = _state.get()
+    token = None
+    if state is None:
+        state = RoutingState()
+        token = _state.set(state)
+    previous, state.replica = state.replica, False
+    try:
+        yield state
+    finally:
+        state.replica = previous
+        if token is not None:
+            _state.reset(token)
+
+
+def read_from_replica(func=None):
+    """
+    Send reads to the replica, as a decorator (sync or async views) or as
+    ``with read_from_replica():``.
+    """
+    if func is None:
+        return _replica_reads()
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with _replica_reads():
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _replica_reads():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.replica and not state.pinned and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+            if state.sticky:
+                state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is kept in sync by the database, not by migrate
+        return False if db == REPLICA_ALIAS else None
+
+
+# -------------------------
+# READ-YOUR-WRITES PINNING
+# -------------------------
+
+def _pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", REPLICA_PIN_SECONDS)
+
+
+def _begin(request):
+    pinned = request.get_signed_cookie(
+        PIN_COOKIE, default=None, salt=PIN_COOKIE_SALT, max_age=_pin_seconds()
+    ) is not None
+    state = RoutingState(pinned=pinned, sticky=True)
+    return state, _state.set(state)
+
+
+def _finish(state, response):
+    if state.wrote:
+        response.set_signed_cookie(
+            PIN_COOKIE, "1", salt=PIN_COOKIE_SALT, max_age=_pin_seconds(),
+            httponly=True, samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def ReplicaPinMiddleware(get_response):
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            state, token = _begin(request)
+            try:
+                response = await get_response(request)
+            finally:
+                _state.reset(token)
+            return _finish(state, response)
+    else:
+        def middleware(request):
+            state, token = _begin(request)
+            try:
+                response = get_response(request)
+            finally:
+                _state.reset(token)
+            return _finish(state, response)
+    return middleware
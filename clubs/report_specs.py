@@ -0,0 +1,279 @@
+from itertools import groupby
+from operator import attrgetter
+from django.contrib.auth.models import User
+from django.db.models import Avg, Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.html import escape
+
+from users.models import StudentMark
+from .context import polls_with_vote_totals
+from .models import Club, ClubPost, Event, Poll
+from .pdf import ReportSpec, StreamedTable, TableBlock, Text
+from .polls import open_polls
+
+# -------------------------
+# LECTURER / ADMIN PDF REPORTS
+# -------------------------
+# Each builder runs the queries for one report and returns a ReportSpec;
+# clubs/pdf.py turns it into a PDF. Related rows are joined or annotated
+# up front so no builder queries once per table row, and the reports that
+# cover every student stream their rows from one ordered query.
+
+ITERATOR_CHUNK_SIZE = 2000
+
+
+def _truncate(text, length):
+    return text[:length] + '...' if len(text) > length else text
+
+
+def clubs_report():
+    clubs = Club.objects.annotate(
+        member_count=Count('members', distinct=True),
+        event_count=Count('events', distinct=True)
+    ).order_by('name')
+
+    data = [['Club Name', 'Members', 'Events', 'Description']]
+    for club in clubs:
+        data.append([club.name, str(club.member_count), str(club.event_count), _truncate(club.description, 50)])
+
+    return ReportSpec("All Clubs Report", "clubs_report").add(
+        TableBlock(data, [2, 1, 1, 3], header_font_size=12),
+        Text(f"<b>Total Clubs:</b> {len(data) - 1}"),
+    )
+
+
+def students_report():
+    students = User.objects.filter(profile__role='student').select_related('profile').annotate(
+        club_count=Count('clubs')
+    ).order_by('profile__name', 'id')
+
+    def rows():
+        for student in students.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            reg_num = getattr(student.profile, 'registration_number', 'N/A')
+            yield [student.profile.name, student.email, str(student.club_count), reg_num]
+
+    return ReportSpec("Students Report", "students_report").add(
+        StreamedTable(['Student Name', 'Email', 'Clubs Joined', 'Reg. Number'], rows(), [2, 2, 1.5, 1.5]),
+        Text(f"<b>Total Students:</b> {students.count()}"),
+    )
+
+
+def events_report():
+    events = Event.objects.select_related('club').order_by('-date')
+
+    data = [['Event Title', 'Club', 'Date', 'Location', 'Attendees']]
+    for event in events:
+        data.append([
+            event.name,
+            event.club.name,
+            event.date.strftime('%Y-%m-%d'),
+            getattr(event, 'location', 'TBD')[:30],
+            str(event.attendee_total)
+        ])
+
+    return ReportSpec("Events Report", "events_report").add(
+        TableBlock(data, [2, 1.5, 1, 2, 1]),
+        Text(f"<b>Total Events:</b> {len(data) - 1}"),
+    )
+
+
+def polls_report():
+    # Closed polls' totals come from their frozen results
+    polls = polls_with_vote_totals(Poll.objects.order_by('-created_at'))
+
+    data = [['Question', 'Club', 'Total Votes', 'Status', 'Created']]
+    for poll in polls:
+        status = 'Closed' if poll.is_closed else 'Active' if poll.is_open else 'Scheduled'
+        data.append([
+            _truncate(poll.question, 40),
+            poll.club.name,
+            str(poll.vote_total),
+            status,
+            poll.created_at.strftime('%Y-%m-%d')
+        ])
+
+    return ReportSpec("Polls Report", "polls_report").add(
+        TableBlock(data, [2.5, 1.5, 1, 1, 1]),
+        Text(f"<b>Total Polls:</b> {len(data) - 1}"),
+    )
+
+
+def _grades_sections():
+    marks = StudentMark.objects.filter(student__profile__role='student').select_related(
+        'student__profile', 'course'
+    ).order_by('student_id', 'id')
+
+    has_data = False
+    for _, student_marks in groupby(marks.iterator(chunk_size=ITERATOR_CHUNK_SIZE), key=attrgetter('student_id')):
+        student_marks = list(student_marks)
+        student = student_marks[0].student
+        data = [['Course', 'Marks', 'Grade', 'Grade Point']]
+        for mark in student_marks:
+            data.append([mark.course.name, str(mark.marks), mark.grade_letter, str(mark.grade_point)])
+
+        points = [mark.grade_point for mark in student_marks if mark.grade_point is not None]
+        avg_gpa = sum(points) / len(points) if points else None
+        data.append(['', '', 'GPA:', f"{avg_gpa:.2f}" if avg_gpa else 'N/A'])
+
+        has_data = True
+        yield Text(f"<b>{escape(getattr(student.profile, 'name', student.username))}</b>", "heading3")
+        yield TableBlock(data, [3, 1, 1, 1], style="grades", space_after=0.2)
+
+    if not has_data:
+        yield Text("<b>No grades data available yet.</b>", "heading2", space_after=0.2)
+        yield Text("Grades will appear here once lecturers have entered student marks.")
+
+
+def grades_report():
+    """Every student's marks, streamed from a single ordered query."""
+    return ReportSpec("Student Grades Report", "grades_report", sections=_grades_sections())
+
+
+def engagement_report():
+    avg_members = Club.objects.annotate(mc=Count('members')).aggregate(Avg('mc'))['mc__avg'] or 0
+    avg_attendance = Event.objects.aggregate(Avg('attendee_total'))['attendee_total__avg'] or 0
+
+    summary_data = [
+        ['Metric', 'Count'],
+        ['Total Students', str(User.objects.filter(profile__role='student').count())],
+        ['Total Clubs', str(Club.objects.count())],
+        ['Total Events', str(Event.objects.count())],
+        ['Total Polls', str(Poll.objects.count())],
+        ['Total Posts', str(ClubPost.objects.count())],
+        ['Avg Members/Club', f"{avg_members:.1f}"],
+        ['Avg Event Attendance', f"{avg_attendance:.1f}"],
+    ]
+
+    active_clubs = Club.objects.annotate(
+        post_count=Count('posts', distinct=True),
+        member_count=Count('members', distinct=True),
+        event_count=Count('events', distinct=True),
+    ).order_by('-post_count')[:10]
+    club_data = [['Club Name', 'Posts', 'Members', 'Events']]
+    for club in active_clubs:
+        club_data.append([club.name, str(club.post_count), str(club.member_count), str(club.event_count)])
+
+    return ReportSpec("Student Engagement Analytics", "engagement_report").add(
+        Text("<b>System Overview</b>", "heading2", space_after=0.1),
+        TableBlock(summary_data, [4, 2], style="summary"),
+        Text("<b>Most Active Clubs (by posts)</b>", "heading2", space_after=0.1),
+        TableBlock(club_data, [3, 1, 1, 1], space_after=0),
+    )
+
+
+def _count_per_club(queryset):
+    """Correlated COUNT(*) of ``queryset`` rows for the outer club."""
+    counts = queryset.filter(club=OuterRef('pk')).order_by().values('club').annotate(n=Count('*')).values('n')
+    return Coalesce(Subquery(counts), 0)
+
+
+def _system_sections():
+    yield Text("<b>1. Clubs Overview</b>", "heading2")
+    clubs = Club.objects.annotate(
+        member_total=_count_per_club(Club.members.through.objects),
+        event_total=_count_per_club(Event.objects),
+        post_total=_count_per_club(ClubPost.objects),
+        poll_total=_count_per_club(Poll.objects),
+    ).order_by('name', 'id')
+    if clubs.exists():
+        rows = (
+            [
+                club.name, club.meeting_time, _truncate(club.description, 40),
+                str(club.member_total), str(club.event_total), str(club.post_total), str(club.poll_total),
+            ]
+            for club in clubs.iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+        )
+        yield StreamedTable(
+            ['Club', 'Meeting Time', 'Description', 'Members', 'Events', 'Posts', 'Polls'],
+            rows, [1.3, 1.1, 2, 0.7, 0.6, 0.5, 0.5], space_after=0.2,
+        )
+    else:
+        yield Text("No clubs found in the system.", space_after=0.15)
+
+    yield Text("<b>2. Upcoming Events</b>", "heading2")
+    events = Event.objects.filter(date__gte=timezone.now()).select_related('club').order_by('date')[:10]
+    for event in events:
+        yield Text(f"<b>- {escape(event.name)}</b>")
+        yield Text(
+            f"Club: {escape(event.club.name)} | Date: {event.date.strftime('%Y-%m-%d')} | "
+            f"Attendees: {event.attendee_total}",
+            space_after=0.1,
+        )
+    if not events:
+        yield Text("No upcoming events found.", space_after=0.15)
+
+    yield Text("<b>3. Active Polls</b>", "heading2")
+    polls = polls_with_vote_totals(open_polls().order_by('-created_at'))[:10]
+    for poll in polls:
+        yield Text(f"<b>- {escape(poll.question)}</b>")
+        yield Text(f"Club: {escape(poll.club.name)} | Total Votes: {poll.vote_total}", space_after=0.1)
+    if not polls:
+        yield Text("No active polls found.", space_after=0.15)
+
+    yield Text("<b>4. Recent Club Posts</b>", "heading2")
+    posts = ClubPost.objects.select_related('club', 'author').order_by('-created_at')[:10]
+    for post in posts:
+        yield Text(f"<b>- {escape(post.title)}</b>")
+        yield Text(
+            f"Club: {escape(post.club.name)} | Author: {escape(post.author.username)} | "
+            f"{post.created_at.strftime('%Y-%m-%d')}",
+            space_after=0.1,
+        )
+    if not posts:
+        yield Text("No recent posts found.", space_after=0.15)
+
+    yield Text("<i>End of Report - Generated by School Clubs MS</i>")
+
+
+def system_report():
+    """The admin's whole-system summary, in a fixed handful of queries."""
+    return ReportSpec("School Clubs Management System Report", "system_report", sections=_system_sections())
+
+
+REPORTS = {
+    "clubs": clubs_report,
+    "students": students_report,
+    "events": events_report,
+    "polls": polls_report,
+    "grades": grades_report,
+    "engagement": engagement_report,
+    "system": system_report,
+}
+
+# Tables each report reads, by db_table name. A change to any of them gives
+# the report a new fingerprint (see clubs/artifacts.py).
+REPORT_TABLES = {
+    "clubs": ["clubs_club", "clubs_club_members", "clubs_event"],
+    "students": ["auth_user", "users_profile", "clubs_club_members"],
+    "events": ["clubs_event", "clubs_club", "clubs_event_attendees"],
+    "polls": ["clubs_poll", "clubs_club", "clubs_polloption", "clubs_polloption_votes"],
+    "grades": ["auth_user", "users_profile", "users_studentmark", "users_course"],
+    "engagement": [
+        "auth_user", "users_profile", "clubs_club", "clubs_club_members", "clubs_event",
+        "clubs_event_attendees", "clubs_poll", "clubs_clubpost",
+    ],
+    "system": [
+        "auth_user", "clubs_club", "clubs_club_members", "clubs_event", "clubs_event_attendees",
+        "clubs_poll", "clubs_polloption", "clubs_polloption_votes", "clubs_clubpost",
+    ],
+}
+
+
+def last_poll_boundary(now=None):
+    """The latest opens_at or closes_at that has passed, or None."""
+    now = now or timezone.now()
+    passed = Poll.objects.aggregate(
+        opened=Max('opens_at', filter=Q(opens_at__lte=now)),
+        closed=Max('closes_at', filter=Q(closes_at__lte=now)),
+    )
+    return max(filter(None, passed.values()), default=None)
+
+
+# Report content that changes with the clock rather than the tables: the
+# polls report's Status column and the system report's Active Polls move
+# whenever a poll opens or closes
+REPORT_CLOCKS = {
+    "polls": last_poll_boundary,
+    "system": last_poll_boundary,
+}
@@ -0,0 +1,402 @@
+from datetime import datetime
+import csv
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db.models import Count
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import render, aget_object_or_404
+from django.template.defaultfilters import filesizeformat
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods
+
+from users.models import Report
+from .artifacts import artifact_response
+from .context import clubs_with_activity_counts, polls_with_vote_totals
+from .models import Club, ClubPost, Event, Poll, StoredReport
+from .replicas import read_from_replica
+from .reports import (
+    ADMIN_CLOUD_REPORTS,
+    LECTURER_CLOUD_REPORTS,
+    generate_my_clubs_report,
+    generate_my_events_report,
+    generate_my_grades_report,
+    astore_report,
+    upload_status,
+    aget_my_reports
+)
+from .views import is_admin, is_lecturer, is_admin_or_lecturer
+
+# -------------------------
+# REPORT VIEWS
+# -------------------------
+# Report downloads, exports and cloud saves live apart from clubs/views.py
+# and are routed through clubs.lazy.lazy_view, so neither this module nor
+# the PDF stack behind it is imported until a report is first requested.
+
+
+# ============================================
+# STUDENT REPORTS - CSV DOWNLOADS
+# ============================================
+
+@login_required
+def download_my_clubs(request):
+    """Download my clubs as CSV"""
+    csv_data = generate_my_clubs_report(request.user)
+    
+    response = HttpResponse(csv_data, content_type='text/csv')
+    filename = f"my_clubs_{datetime.now().strftime('%Y%m%d')}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    return response
+
+
+@login_required
+def download_my_events(request):
+    """Download my events as CSV"""
+    csv_data = generate_my_events_report(request.user)
+    
+    response = HttpResponse(csv_data, content_type='text/csv')
+    filename = f"my_events_{datetime.now().strftime('%Y%m%d')}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    return response
+
+
+@login_required
+def download_my_grades(request):
+    """Download my grades as CSV"""
+    csv_data = generate_my_grades_report(request.user)
+    
+    response = HttpResponse(csv_data, content_type='text/csv')
+    filename = f"my_grades_{datetime.now().strftime('%Y%m%d')}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    return response
+
+
+STUDENT_CSV_REPORTS = {
+    'clubs': generate_my_clubs_report,
+    'events': generate_my_events_report,
+    'grades': generate_my_grades_report,
+}
+
+
+@login_required
+@require_http_methods(["POST"])
+async def save_report_cloud(request):
+    """Save student report to cloud storage"""
+    user = await request.auser()
+    report_type = request.POST.get('report_type', 'clubs')
+    
+    # Generate report
+    generate = STUDENT_CSV_REPORTS.get(report_type)
+    if generate is None:
+        return JsonResponse({'success': False, 'error': 'Invalid report type'}, status=400)
+    csv_data = await sync_to_async(generate)(user)
+    
+    # Save through the report storage backend
+    filename = f"student_{report_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    result = await astore_report(csv_data, filename, user.id)
+    
+    return upload_accepted(result)
+
+
+def upload_accepted(result, **extra):
+    """202 with the upload's job id to poll, or 500 if it could not be queued."""
+    if not result.get('success'):
+        return JsonResponse({'success': False, 'error': result.get('error', 'Failed to upload to cloud')}, status=500)
+    payload = {**result, **extra}
+    if result.get('job_id'):
+        payload['status_url'] = reverse('report_upload_status', args=[result['job_id']])
+    return JsonResponse(payload, status=202)
+
+
+@login_required
+async def report_upload_status(request, job_id):
+    """Poll a queued cloud upload"""
+    record = await aget_object_or_404(StoredReport, pk=job_id, owner=await request.auser())
+    return JsonResponse(upload_status(record))
+
+
+@login_required
+async def my_saved_reports(request):
+    """View all saved reports for student"""
+    user = await request.auser()
+    reports = await aget_my_reports(user.id)
+    
+    # Templates may still touch the lazy request.user, so render off the event loop
+    return await sync_to_async(render)(request, 'clubs/my_reports.html', {
+        'reports': reports
+    })
+
+
+# ============================================
+# LECTURER REPORTS - PDF DOWNLOADS
+# ============================================
+
+@login_required
+@user_passes_test(is_admin_or_lecturer)   # was is_lecturer
+def download_clubs_report(request):
+    """Generate and download all clubs report as PDF"""
+    return artifact_response("clubs")
+
+
+@login_required
+@user_passes_test(is_admin_or_lecturer)   # was is_lecturer
+def download_students_report(request):
+    """Generate and download students report as PDF"""
+    return artifact_response("students")
+
+
+@login_required
+@user_passes_test(is_admin_or_lecturer)   # was is_lecturer
+def download_events_report(request):
+    """Generate and download events report as PDF"""
+    return artifact_response("events")
+
+
+@login_required
+@user_passes_test(is_admin_or_lecturer)   # was is_lecturer
+def download_polls_report(request):
+    """Generate and download polls report as PDF"""
+    return artifact_response("polls")
+
+
+@login_required
+@user_passes_test(is_admin_or_lecturer)   # was is_lecturer
+def download_grades_report(request):
+    """Generate and download grades report as PDF"""
+    return artifact_response("grades")
+
+
+@login_required
+@user_passes_test(is_admin_or_lecturer)   # was is_lecturer
+def download_engagement_report(request):
+    """Generate and download student engagement analytics report as PDF"""
+    return artifact_response("engagement")
+
+
+# ============================================
+# LECTURER CLOUD SAVE & MANAGEMENT
+# ============================================
+
+@login_required
+@user_passes_test(is_lecturer)
+@require_http_methods(["POST"])
+async def lecturer_save_report_cloud(request):
+    """Save lecturer report to cloud storage"""
+    
+    report_type = request.POST.get('report_type')
+    
+    if not report_type:
+        return JsonResponse({'success': False, 'error': 'Report type is required'}, status=400)
+    if report_type not in LECTURER_CLOUD_REPORTS:
+        return JsonResponse({'success': False, 'error': 'Invalid report type'}, status=400)
+    
+    try:
+        # Generate a unique filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"lecturer_{report_type}_report_{timestamp}.pdf"
+        
+        # Generate the appropriate report content
+        # In a real implementation, you would generate the actual PDF here
+        # For now, we'll simulate with metadata
+        
+        # Save through the report storage backend
+        user = await request.auser()
+        result = await astore_report(
+            f"Lecturer {report_type} report data",  # Replace with actual PDF data
+            filename, 
+            user.id
+        )
+        
+        return upload_accepted(result, filename=filename, report_type=report_type, timestamp=timestamp)
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+async def _saved_reports(user):
+    """The user's generated and scheduled Report rows, newest first, then their stored uploads."""
+    # Scheduled runs are generated_by their schedule's owner
+    rows = (
+        Report.objects.filter(generated_by=user, status='completed')
+        .exclude(file='')
+        .order_by('-created_at')
+    )
+    reports = []
+    async for report in rows:
+        try:
+            size = filesizeformat(report.file.size)
+        except OSError:
+            # The row outlived its file (e.g. media was cleaned up)
+            continue
+        reports.append({
+            'name': report.title,
+            'date': report.created_at.strftime('%Y-%m-%d'),
+            'size': size,
+            'type': report.report_type or 'pdf',
+            'url': report.file.url,
+        })
+    for stored in await aget_my_reports(user.id):
+        reports.append({
+            'name': stored['name'],
+            'date': stored['created_at'].strftime('%Y-%m-%d'),
+            'size': filesizeformat(stored['metadata']['size']),
+            'type': stored['name'].rsplit('.', 1)[-1],
+            'url': stored['url'],
+        })
+    return reports
+
+
+@login_required
+@user_passes_test(is_lecturer)
+async def lecturer_saved_reports(request):
+    """View all saved reports for lecturer"""
+    reports = await _saved_reports(await request.auser())
+
+    context = {
+        'saved_reports': reports,
+        'total_reports': len(reports),
+    }
+    
+    return await sync_to_async(render)(request, 'clubs/lecturer_saved_reports.html', context)
+
+
+@login_required
+@user_passes_test(is_admin)
+async def admin_saved_reports(request):
+    """Admin: view saved reports (reuses lecturer template)."""
+    reports = await _saved_reports(await request.auser())
+
+    context = {
+        'saved_reports': reports,
+        'total_reports': len(reports),
+    }
+    return await sync_to_async(render)(request, 'clubs/lecturer_saved_reports.html', context)
+
+
+@login_required
+@user_passes_test(is_admin_or_lecturer)
+@read_from_replica
+def export_all_data(request):
+     """Export all system data as CSV"""
+     from django.contrib.auth.models import User
+     
+     response = HttpResponse(content_type='text/csv')
+     response['Content-Disposition'] = f'attachment; filename="system_export_{datetime.now().strftime("%Y%m%d")}.csv"'
+     
+     writer = csv.writer(response)
+     
+     # Header
+     writer.writerow(['CLUB MANAGEMENT SYSTEM - COMPLETE DATA EXPORT'])
+     writer.writerow([f'Generated: {datetime.now().strftime("%B %d, %Y at %I:%M %p")}'])
+     writer.writerow([])
+     
+     # Export Clubs
+     writer.writerow(['=== CLUBS ==='])
+     writer.writerow(['Club Name', 'Description', 'Members Count', 'Events Count', 'Posts Count'])
+     clubs = clubs_with_activity_counts(Club.objects.all())
+     for club in clubs:
+         writer.writerow([
+             club.name, 
+             club.description, 
+             club.member_count, 
+             club.event_count,
+             club.post_count
+         ])
+     
+     writer.writerow([])
+     
+     # Export Students
+     writer.writerow(['=== STUDENTS ==='])
+     writer.writerow(['Name', 'Email', 'Registration Number', 'Clubs Joined'])
+     students = User.objects.filter(profile__role='student').annotate(club_count=Count('clubs'))
+     for student in students:
+         reg_num = getattr(student.profile, 'registration_number', 'N/A')
+         writer.writerow([
+             student.profile.name,
+             student.email,
+             reg_num,
+             student.club_count
+         ])
+     
+     writer.writerow([])
+     
+     # Export Events
+     writer.writerow(['=== EVENTS ==='])
+     writer.writerow(['Title', 'Club', 'Date', 'Location', 'Attendees', 'Description'])
+     events = Event.objects.annotate(attendee_count=Count('attendees'))
+     for event in events:
+         title = getattr(event, 'title', None) or getattr(event, 'name', '')
+         location = getattr(event, 'location', '')
+         desc = getattr(event, 'description', '')
+         writer.writerow([
+             title,
+             event.club.name,
+             event.date.strftime('%Y-%m-%d'),
+             location,
+             event.attendee_count,
+             desc[:100] if desc else ''
+         ])
+     
+     writer.writerow([])
+     
+     # Export Polls
+     writer.writerow(['=== POLLS ==='])
+     writer.writerow(['Question', 'Club', 'Total Votes', 'Status', 'Created Date'])
+     # Closed polls report their frozen totals
+     polls = polls_with_vote_totals(Poll.objects.all())
+     for poll in polls:
+         status = 'Closed' if poll.is_closed else 'Active' if poll.is_open else 'Scheduled'
+         writer.writerow([
+             poll.question,
+             poll.club.name,
+             poll.vote_total,
+             status,
+             poll.created_at.strftime('%Y-%m-%d')
+         ])
+     
+     writer.writerow([])
+     
+     # Export Posts
+     writer.writerow(['=== POSTS ==='])
+     writer.writerow(['Title', 'Club', 'Author', 'Created Date', 'Content Preview'])
+     posts = ClubPost.objects.all().order_by('-created_at')
+     for post in posts:
+         content_preview = post.content[:100] + '...' if len(post.content) > 100 else post.content
+         writer.writerow([
+             post.title,
+             post.club.name,
+             post.author.profile.name,
+             post.created_at.strftime('%Y-%m-%d'),
+             content_preview
+         ])
+     
+     writer.writerow([])
+     writer.writerow(['=== END OF REPORT ==='])
+     
+     return response
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_http_methods(["POST"])
+async def admin_save_report_cloud(request):
+    """Admin: save a report stub to cloud (uses astore_report)."""
+    user = await request.auser()
+    report_type = request.POST.get('report_type', 'clubs')
+    if report_type not in ADMIN_CLOUD_REPORTS:
+        return JsonResponse({'success': False, 'error': 'Invalid report type'}, status=400)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"admin_{report_type}_report_{timestamp}.txt"
+
+    # Minimal report content (replace with real export data if available)
+    content = f"Admin {report_type} report\nGenerated by user {user.id} on {timestamp}\n\n"
+    content += "For full exports, call the dedicated export endpoints.\n"
+
+    result = await astore_report(content, filename, user.id)
+    return upload_accepted(result, filename=filename)
\ No newline at end of file
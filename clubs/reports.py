@@ -1,16 +1,7 @@
 import csv
 import io
+import uuid
 from datetime import datetime
-from django.conf import settings
-
-# -------------------------
-# SUPABASE CLIENT
-# -------------------------
-try:
-    from supabase import create_client
-    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-except Exception:
-    supabase = None
 
 # -------------------------
 # CSV GENERATORS
@@ -95,50 +86,111 @@ def generate_my_grades_report(user):
 
 
 # -------------------------
-# SUPABASE STORAGE FUNCTIONS
+# REPORT STORAGE FUNCTIONS
 # -------------------------
 
-def upload_to_supabase(csv_data, filename, user_id):
-    """Upload CSV to Supabase Storage using service role key"""
-    if not supabase:
-        return {'success': False, 'error': 'Supabase not configured'}
+# Report types the lecturer and admin cloud saves accept. The type goes into
+# the stored filename, so anything else is refused rather than cleaned up
+LECTURER_CLOUD_REPORTS = {'clubs', 'students', 'events', 'polls', 'grades', 'analytics'}
+ADMIN_CLOUD_REPORTS = {'clubs', 'users', 'posts', 'events'}
+
+def _new_stored_report(storage, content, filename, user_id, content_type):
+    from clubs.models import StoredReport
+
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    # Filenames only go down to the second, so a per-save folder keeps two
+    # saves in the same second from colliding on the unique path
+    file_path = f"student_{user_id}/{uuid.uuid4().hex[:12]}/{filename}"
+    record = StoredReport(
+        owner_id=user_id,
+        name=filename,
+        path=file_path,
+        backend=storage.name,
+        url=storage.url(file_path),
+        size=len(data),
+        content_type=content_type,
+    )
+    return record, data
+
+
+def _stored_result(record):
+    if record.status == 'failed':
+        return {'success': False, 'job_id': record.pk, 'error': record.error}
+    return {'success': True, 'job_id': record.pk, 'url': record.url, 'status': record.status}
+
+
+def store_report(content, filename, user_id, content_type="text/csv"):
+    """Index a report and queue its upload; returns the StoredReport id as ``job_id``."""
+    from clubs.storage import get_report_storage, get_upload_queue
 
     try:
-        bucket_name = "student-reports"
-        file_path = f"student_{user_id}/{filename}"
+        storage = get_report_storage()
+        record, data = _new_stored_report(storage, content, filename, user_id, content_type)
+        record.save()
+        get_upload_queue().submit(storage, record, data)
+        return _stored_result(record)
 
-        # Upload file
-        supabase.storage.from_(bucket_name).upload(
-            path=file_path,
-            file=csv_data.encode('utf-8')
-        )
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
 
-        # Get public URL (returned as a string now)
-        url = supabase.storage.from_(bucket_name).get_public_url(file_path)
 
-        return {'success': True, 'url': url}
+async def astore_report(content, filename, user_id, content_type="text/csv"):
+    """Async store_report() for async views."""
+    from asgiref.sync import sync_to_async
+    from clubs.storage import get_report_storage, get_upload_queue
+
+    try:
+        storage = get_report_storage()
+        record, data = _new_stored_report(storage, content, filename, user_id, content_type)
+        await record.asave()
+        # Registers an on_commit hook (or uploads inline when eager)
+        await sync_to_async(get_upload_queue().submit)(storage, record, data)
+        return _stored_result(record)
 
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
+def upload_status(record):
+    """Pollable state of a queued upload (a StoredReport)."""
+    from clubs.storage import STALE_UPLOAD_ERROR, stale_upload_cutoff
 
-def get_my_reports(user_id):
-    """List all reports for a student"""
-    if not supabase:
-        return []
+    if record.status == 'pending' and record.created_at < stale_upload_cutoff():
+        # Lost in a restart; report it as failed before the sweep records it
+        record.status, record.error = 'failed', STALE_UPLOAD_ERROR
+    return {
+        'job_id': record.pk,
+        'status': record.status,
+        'url': record.url if record.status == 'stored' else None,
+        'attempts': record.attempts,
+        'error': record.error or None,
+    }
 
-    try:
-        folder = f"student_{user_id}"
-        bucket_name = "student-reports"
-        files = supabase.storage.from_(bucket_name).list(folder)
 
-        for file in files:
-            file['url'] = supabase.storage.from_(bucket_name).get_public_url(
-                f"{folder}/{file['name']}"
-            ).public_url
+def _report_listing(record):
+    return {
+        'name': record.name,
+        'url': record.url,
+        'status': record.status,
+        'created_at': record.created_at,
+        'metadata': {'size': record.size, 'mimetype': record.content_type},
+    }
 
-        return files
-    except Exception as e:
-        print(f"Error listing files: {e}")
-        return []
+
+def _listed_reports(user_id):
+    from clubs.models import StoredReport
+    from clubs.storage import stale_upload_cutoff
+
+    return StoredReport.objects.filter(owner_id=user_id).exclude(status='failed').exclude(
+        status='pending', created_at__lt=stale_upload_cutoff()
+    )
+
+
+def get_my_reports(user_id):
+    """List all reports for a user from the StoredReport index"""
+    return [_report_listing(r) for r in _listed_reports(user_id)]
+
+
+async def aget_my_reports(user_id):
+    """Async get_my_reports() for async views."""
+    return [_report_listing(r) async for r in _listed_reports(user_id)]
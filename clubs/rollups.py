@@ -0,0 +1,284 @@
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import lru_cache
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncHour
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Club, ClubActivityRollup, ClubPost, Event, PollOption
+from .sqlite import retry_on_locked
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# CLUB ACTIVITY ROLLUPS
+# -------------------------
+# Each post, vote, RSVP, join and points award adds to its club's row for
+# the current hour and the current day. Analytics read those rows: a month
+# of daily activity for every club is a few hundred small rows however many
+# posts and votes there are.
+#
+# Every vote in a busy poll would add to the same two rows, so requests
+# don't write them. Once the request's transaction commits, its counts are
+# added up in memory, and a thread in each process writes them every
+# ROLLUP_FLUSH_INTERVAL seconds with one F() update per row. Gunicorn
+# workers write what is left as they exit (worker_exit in gunicorn.conf.py);
+# counts still held by a process that is killed are lost, and
+# backfill_activity_rollups rebuilds the rows from the raw tables. With
+# ROLLUPS_EAGER set, counts are written inline (like REPORT_UPLOADS_EAGER).
+#
+# Counts are of things that happened, so deleting a post or leaving a club
+# doesn't take them back; pages that show what exists now (manage_posts)
+# count the raw tables instead.
+
+PERIODS = ("hour", "day")
+COUNTERS = ("posts", "votes", "rsvps", "joins", "points")
+ROLLUP_FLUSH_INTERVAL = 2.0
+
+
+def bucket_start(when, period):
+    """Start of the hour or day (site time zone) that ``when`` falls in."""
+    local = timezone.localtime(when).replace(minute=0, second=0, microsecond=0)
+    return local.replace(hour=0) if period == "day" else local
+
+
+@retry_on_locked
+def write_activity(pending):
+    """Add ``{(club_id, period, bucket): Counter}`` to the rollup rows."""
+    with transaction.atomic():
+        for (club_id, period, bucket), counts in pending.items():
+            rows = ClubActivityRollup.objects.filter(club_id=club_id, period=period, bucket=bucket)
+            if rows.update(**{name: F(name) + n for name, n in counts.items()}):
+                continue
+            try:
+                with transaction.atomic():
+                    ClubActivityRollup.objects.create(club_id=club_id, period=period, bucket=bucket, **counts)
+            except IntegrityError:
+                # Another process created the row first
+                rows.update(**{name: F(name) + n for name, n in counts.items()})
+
+
+class ActivityBuffer:
+    """
+    Adds up activity counts in memory and writes them from a background thread.
+
+    The thread starts with the first count in the process and sleeps until
+    the next one; waiting ``interval`` after being woken lets a burst of
+    votes collect into one update per row.
+    """
+
+    def __init__(self, interval=ROLLUP_FLUSH_INTERVAL):
+        self.interval = interval
+        self._pending = defaultdict(Counter)
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def add(self, club_id, when, counts):
+        with self._lock:
+            for period in PERIODS:
+                self._pending[(club_id, period, bucket_start(when, period))].update(counts)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="activity-rollups", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def flush(self):
+        """Write everything added so far; returns the number of rows touched."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+        if pending:
+            write_activity(pending)
+        return len(pending)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing activity rollups failed")
+            finally:
+                # This thread's connection is not closed by the request cycle
+                connection.close()
+
+
+@lru_cache(maxsize=None)
+def get_activity_buffer():
+    return ActivityBuffer(interval=getattr(settings, "ROLLUP_FLUSH_INTERVAL", ROLLUP_FLUSH_INTERVAL))
+
+
+@receiver(setting_changed)
+def reset_activity_buffer(setting, **kwargs):
+    if setting == "ROLLUP_FLUSH_INTERVAL":
+        get_activity_buffer.cache_clear()
+
+
+def record_activity(club_id, when=None, **counts):
+    """Add ``counts`` (posts=1, points=10, ...) to the club's hour and day rows."""
+    counts = {name: n for name, n in counts.items() if n}
+    if club_id is None or not counts:
+        return
+    when = when or timezone.now()
+    if getattr(settings, "ROLLUPS_EAGER", False):
+        write_activity({(club_id, period, bucket_start(when, period)): counts for period in PERIODS})
+        return
+    # A rolled-back vote or post leaves the counts alone
+    transaction.on_commit(lambda: get_activity_buffer().add(club_id, when, counts))
+
+
+# -------------------------
+# READING ROLLUPS
+# -------------------------
+
+def _rollups(period, since, until=None, club_id=None):
+    rows = ClubActivityRollup.objects.filter(period=period, bucket__gte=bucket_start(since, period))
+    if until is not None:
+        rows = rows.filter(bucket__lt=until)
+    if club_id is not None:
+        rows = rows.filter(club_id=club_id)
+    return rows
+
+
+def _sums():
+    return {name: Sum(name, default=0) for name in COUNTERS}
+
+
+def activity_totals(since, period="day", club_id=None):
+    """Activity since ``since`` (rounded down to its hour or day), all clubs or one."""
+    return _rollups(period, since, club_id=club_id).aggregate(**_sums())
+
+
+def activity_by_club(since, period="day"):
+    """``{club_id: {"posts": ..., ...}}`` for clubs with activity since ``since``."""
+    rows = _rollups(period, since).values("club_id").annotate(**_sums()).order_by()
+    return {row.pop("club_id"): row for row in rows}
+
+
+def activity_series(since, period="day", club_id=None):
+    """Per-bucket activity since ``since``, oldest first; quiet buckets are left out."""
+    rows = _rollups(period, since, club_id=club_id).values("bucket").annotate(**_sums()).order_by("bucket")
+    return list(rows)
+
+
+# -------------------------
+# SIGNALS
+# -------------------------
+
+def _club_counts(instance, model, pk_set, club_ids_for):
+    """Number of rows added per club by an m2m post_add on ``model``'s relation."""
+    if isinstance(instance, model):
+        return Counter({next(iter(club_ids_for([instance.pk])), None): len(pk_set)})
+    return Counter(club_ids_for(pk_set))
+
+
+def _record_m2m(counter, instance, model, action, pk_set, club_ids_for):
+    if action != "post_add" or not pk_set:
+        return
+    for club_id, n in _club_counts(instance, model, pk_set, club_ids_for).items():
+        record_activity(club_id, **{counter: n})
+
+
+@receiver(post_save, sender=ClubPost)
+def post_created(sender, instance, created, **kwargs):
+    if created:
+        record_activity(instance.club_id, instance.created_at, posts=1)
+
+
+@receiver(post_save, sender="users.StudentPoints")
+def points_awarded(sender, instance, created, **kwargs):
+    if created:
+        record_activity(instance.club_id, instance.awarded_at, points=instance.points)
+
+
+@receiver(m2m_changed, sender=PollOption.votes.through)
+def votes_added(sender, instance, action, pk_set, **kwargs):
+    _record_m2m(
+        "votes", instance, PollOption, action, pk_set,
+        lambda ids: PollOption.objects.filter(pk__in=ids).values_list("poll__club_id", flat=True),
+    )
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def rsvps_added(sender, instance, action, pk_set, **kwargs):
+    _record_m2m(
+        "rsvps", instance, Event, action, pk_set,
+        lambda ids: Event.objects.filter(pk__in=ids).values_list("club_id", flat=True),
+    )
+
+
+@receiver(m2m_changed, sender=Club.members.through)
+def members_added(sender, instance, action, pk_set, **kwargs):
+    _record_m2m("joins", instance, Club, action, pk_set, lambda ids: ids)
+
+
+# -------------------------
+# BACKFILL
+# -------------------------
+
+def _hourly(queryset, club_field, time_field, aggregate):
+    """``(club_id, hour, n)`` for ``queryset`` grouped by club and hour of ``time_field``."""
+    rows = (
+        queryset.annotate(hour=TruncHour(time_field)).values(club_field, "hour")
+        .annotate(n=aggregate).order_by()
+    )
+    return ((row[club_field], row["hour"], row["n"]) for row in rows)
+
+
+def backfill_rollups():
+    """
+    Rebuild every rollup row from the raw tables; returns the number of rows.
+
+    Votes are dated by their poll's creation and RSVPs by the event date,
+    since neither records when it was made. Memberships carry no date at
+    all, so joins only count from when rollups were switched on and are
+    kept as they are.
+    """
+    from users.models import StudentPoints
+
+    counts = defaultdict(Counter)
+    sources = {
+        "posts": _hourly(ClubPost.objects.all(), "club_id", "created_at", Count("id")),
+        "points": _hourly(StudentPoints.objects.all(), "club_id", "awarded_at", Sum("points")),
+        "votes": _hourly(
+            PollOption.votes.through.objects.all(), "polloption__poll__club_id",
+            "polloption__poll__created_at", Count("id"),
+        ),
+    }
+    for counter, rows in sources.items():
+        for club_id, hour, n in rows:
+            for period in PERIODS:
+                counts[(club_id, period, bucket_start(hour, period))][counter] += n
+
+    rsvps = (
+        Event.attendees.through.objects.values("event__club_id", "event__date")
+        .annotate(n=Count("id")).order_by()
+    )
+    for row in rsvps:
+        day = timezone.make_aware(datetime.combine(row["event__date"], datetime.min.time()))
+        for period in PERIODS:
+            counts[(row["event__club_id"], period, day)]["rsvps"] += row["n"]
+
+    with transaction.atomic():
+        joins = {
+            (row["club_id"], row["period"], row["bucket"]): row["joins"]
+            for row in ClubActivityRollup.objects.filter(joins__gt=0).values("club_id", "period", "bucket", "joins")
+        }
+        for key, n in joins.items():
+            counts[key]["joins"] = n
+        ClubActivityRollup.objects.all().delete()
+        ClubActivityRollup.objects.bulk_create(
+            ClubActivityRollup(club_id=club_id, period=period, bucket=bucket, **values)
+            for (club_id, period, bucket), values in counts.items()
+        )
+    return len(counts)
@@ -0,0 +1,89 @@
+import random
+import time
+from functools import wraps
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# -------------------------
+# SQLITE PRODUCTION PROFILE
+# -------------------------
+# Small deployments run on the bundled db.sqlite3. With SQLITE_TUNING on,
+# every new SQLite connection switches to WAL (readers no longer block the
+# writer), relaxes fsync to once per checkpoint, waits on a busy database
+# instead of failing at once, and gets a larger page cache and mmap window.
+# Settings also make transactions BEGIN IMMEDIATE, so a transaction takes
+# the write lock up front instead of failing when it upgrades a read lock.
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,          # ms
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -32 * 1024,      # negative = KiB, so 32 MiB
+    "temp_store": "MEMORY",
+}
+
+WRITE_RETRY_ATTEMPTS = 5
+# Seconds before the first retry; doubled (with jitter) for each one after it
+WRITE_RETRY_BACKOFF = 0.05
+
+
+def sqlite_pragmas():
+    """The PRAGMAs applied to each connection, with SQLITE_BUSY_TIMEOUT applied."""
+    pragmas = dict(SQLITE_PRAGMAS)
+    pragmas["busy_timeout"] = getattr(settings, "SQLITE_BUSY_TIMEOUT", pragmas["busy_timeout"])
+    return pragmas
+
+
+def apply_pragmas(cursor, pragmas=None):
+    for name, value in (pragmas or sqlite_pragmas()).items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not getattr(settings, "SQLITE_TUNING", False):
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor)
+
+
+# -------------------------
+# RETRYING WRITES
+# -------------------------
+# busy_timeout covers most contention, but a write can still give up with
+# "database is locked" when many writers queue at once. Vote, RSVP and
+# membership writes are short and idempotent per request, so they are
+# simply retried.
+
+def is_lock_error(error):
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def retry_on_locked(func=None, *, attempts=WRITE_RETRY_ATTEMPTS, backoff=WRITE_RETRY_BACKOFF, using="default"):
+    """
+    Retry ``func`` when SQLite reports the database as locked or busy.
+
+    Only the outermost call retries: inside a transaction the failed
+    statement has already broken it, so the error goes up to whoever opened
+    the transaction. Other errors (and other backends' errors) are raised
+    unchanged.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if connections[using].in_atomic_block:
+                return func(*args, **kwargs)
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as e:
+                    if attempt == attempts or not is_lock_error(e):
+                        raise
+                    time.sleep(backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
@@ -0,0 +1,240 @@
+import logging
+import queue
+import threading
+import time
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import StoredReport
+from .sqlite import retry_on_locked
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# REPORT STORAGE BACKENDS
+# -------------------------
+# Saved reports go through get_report_storage() instead of calling the
+# Supabase SDK from views. Every saved file is indexed as a StoredReport row
+# whose public URL is known up front, so listing a user's reports is one
+# query. REPORT_STORAGE_BACKEND picks the backend:
+#   "local"    - files under MEDIA_ROOT/reports/stored/ (dev and tests)
+#   "supabase" - the project's Supabase storage bucket
+# Uploads are handed to the UploadQueue, so the request returns straight
+# away with the StoredReport id as a job id to poll. The queue only lives in
+# memory: an upload still pending after REPORT_UPLOAD_TIMEOUT was lost with
+# its process, and expire_stale_uploads() marks it failed.
+
+UPLOAD_BATCH_SIZE = 20
+UPLOAD_WORKERS = 2
+UPLOAD_MAX_ATTEMPTS = 4
+# Seconds before the first retry; doubled for each one after it
+UPLOAD_BACKOFF = 0.5
+# Seconds after which a still-pending upload is taken to be lost
+UPLOAD_TIMEOUT = 15 * 60
+STALE_UPLOAD_ERROR = "The upload was interrupted before it finished. Please save the report again."
+
+
+class ReportStorage:
+    """Base backend: ``upload`` and ``url`` are all a backend has to provide."""
+    name = None
+
+    def url(self, path):
+        raise NotImplementedError
+
+    def upload(self, path, content, content_type):
+        raise NotImplementedError
+
+
+class LocalReportStorage(ReportStorage):
+    name = "local"
+
+    def __init__(self, location=None, base_url=None):
+        self.location = Path(location or Path(settings.MEDIA_ROOT) / "reports" / "stored")
+        self.base_url = base_url or f"{settings.MEDIA_URL}reports/stored/"
+
+    def url(self, path):
+        return self.base_url + quote(path)
+
+    def upload(self, path, content, content_type):
+        target = (self.location / path).resolve()
+        if not target.is_relative_to(self.location.resolve()):
+            raise ValueError(f"Report path {path!r} is outside the report storage directory")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+
+class SupabaseReportStorage(ReportStorage):
+    name = "supabase"
+
+    def __init__(self, project_url, bucket, client_factory=None):
+        self.project_url = project_url.rstrip("/")
+        self.bucket = bucket
+        self._client_factory = client_factory
+
+    @property
+    def client(self):
+        if self._client_factory is None:
+            from .supabase_client import get_supabase
+            self._client_factory = get_supabase
+        return self._client_factory()
+
+    def url(self, path):
+        # Same URL get_public_url() builds, without a client call per file
+        return f"{self.project_url}/storage/v1/object/public/{self.bucket}/{quote(path)}"
+
+    def upload(self, path, content, content_type):
+        self.client.storage.from_(self.bucket).upload(
+            path=path, file=content, file_options={"content-type": content_type}
+        )
+
+
+class UploadQueue:
+    """
+    Runs uploads off the request thread.
+
+    A fixed number of worker threads bounds how many uploads hit the
+    storage endpoint at once. Each worker takes up to ``batch_size`` queued
+    uploads at a time and records their outcome in one update; a failed
+    upload is retried with exponential backoff before it is marked failed.
+    With ``eager`` set, uploads run inline (like CELERY_TASK_ALWAYS_EAGER).
+    """
+
+    def __init__(self, workers=UPLOAD_WORKERS, batch_size=UPLOAD_BATCH_SIZE,
+                 max_attempts=UPLOAD_MAX_ATTEMPTS, backoff=UPLOAD_BACKOFF, eager=False):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.eager = eager
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, storage, record, content):
+        item = (storage, record.pk, record.path, content, record.content_type)
+        if self.eager:
+            self._upload_batch([item])
+            record.refresh_from_db(fields=["status", "attempts", "error"])
+            return
+        # Queue only once the row is committed, so the workers can see it
+        transaction.on_commit(lambda: self._enqueue(item))
+
+    def _enqueue(self, item):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name="report-uploads", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        self._queue.put(item)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._upload_batch(batch)
+            except Exception:
+                logger.exception("Recording report upload results failed")
+            finally:
+                # This thread's connection is not closed by the request cycle
+                connection.close()
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _upload(self, storage, path, content, content_type):
+        """Upload with retries; returns the number of attempts it took."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                storage.upload(path, content, content_type)
+                return attempt
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    e.attempts = attempt
+                    raise
+                delay = self.backoff * 2 ** (attempt - 1)
+                logger.info("Report upload of %s failed (%s), retrying in %.1fs", path, e, delay)
+                time.sleep(delay)
+
+    def _upload_batch(self, batch):
+        stored, failed = {}, []
+        for storage, pk, path, content, content_type in batch:
+            try:
+                attempts = self._upload(storage, path, content, content_type)
+                stored.setdefault(attempts, []).append(pk)
+            except Exception as e:
+                logger.warning("Report upload of %s failed: %s", path, e)
+                failed.append((pk, e.attempts, str(e)))
+        self._record(stored, failed)
+
+    @staticmethod
+    @retry_on_locked
+    def _record(stored, failed):
+        # One status update per attempt count, normally just one for the batch
+        with transaction.atomic():
+            for attempts, pks in stored.items():
+                StoredReport.objects.filter(pk__in=pks).update(status='stored', attempts=attempts)
+            for pk, attempts, error in failed:
+                StoredReport.objects.filter(pk=pk).update(status='failed', attempts=attempts, error=error)
+
+    def flush(self):
+        """Block until every queued upload has finished or failed."""
+        self._queue.join()
+
+
+def stale_upload_cutoff(now=None):
+    """Uploads created before this and still pending are not coming."""
+    timeout = getattr(settings, "REPORT_UPLOAD_TIMEOUT", UPLOAD_TIMEOUT)
+    return (now or timezone.now()) - timedelta(seconds=timeout)
+
+
+def expire_stale_uploads(now=None):
+    """
+    Mark uploads left pending by a restart as failed; returns how many.
+
+    The file contents were only held by the queue of the process that
+    died, so there is nothing to re-queue; the owner sees the failure and
+    can save the report again.
+    """
+    return StoredReport.objects.filter(
+        status='pending', created_at__lt=stale_upload_cutoff(now)
+    ).update(status='failed', error=STALE_UPLOAD_ERROR)
+
+
+@lru_cache(maxsize=None)
+def get_report_storage():
+    backend = getattr(settings, "REPORT_STORAGE_BACKEND", "local")
+    if backend == "supabase":
+        return SupabaseReportStorage(
+            settings.SUPABASE_URL, getattr(settings, "REPORT_STORAGE_BUCKET", "student-reports")
+        )
+    return LocalReportStorage()
+
+
+@lru_cache(maxsize=None)
+def get_upload_queue():
+    return UploadQueue(
+        workers=getattr(settings, "REPORT_UPLOAD_WORKERS", UPLOAD_WORKERS),
+        max_attempts=getattr(settings, "REPORT_UPLOAD_MAX_ATTEMPTS", UPLOAD_MAX_ATTEMPTS),
+        backoff=getattr(settings, "REPORT_UPLOAD_BACKOFF", UPLOAD_BACKOFF),
+        eager=getattr(settings, "REPORT_UPLOADS_EAGER", False),
+    )
+
+
+@receiver(setting_changed)
+def reset_report_storage(setting, **kwargs):
+    if setting in ("REPORT_STORAGE_BACKEND", "REPORT_STORAGE_BUCKET", "MEDIA_ROOT", "MEDIA_URL", "SUPABASE_URL"):
+        get_report_storage.cache_clear()
+    if setting.startswith("REPORT_UPLOAD"):
+        get_upload_queue.cache_clear()
@@ -1,6 +1,7 @@
 # clubs/supabase_client.py
 import os
-from supabase import create_client, Client
+from functools import lru_cache
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Load .env file
@@ -10,8 +11,17 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise Exception("Supabase URL or KEY not configured in .env")
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+@lru_cache(maxsize=None)
+def get_supabase():
+    """
+    Create the Supabase client on first use.
+
+    Importing this module no longer needs the env vars (or the SDK), so the
+    site runs on the local report storage backend without them.
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ImproperlyConfigured("Supabase URL or KEY not configured in .env")
+
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
@@ -1,6 +1,10 @@
+import threading
+import time
 import pytest
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.utils import OperationalError
 from clubs.models import Club
 
 User = get_user_model()
@@ -40,3 +44,43 @@ def create_user(db, django_user_model):
             pass
         return user
     return make_user
+
+
+@pytest.fixture
+def run_concurrently():
+    """
+    Run ``target(*args)`` once per ``args`` tuple, all in threads at once,
+    and return the results in order. The test database is a shared
+    in-memory SQLite one, which reports contention as "table is locked"
+    rather than waiting, so each call retries on lock errors. Any other
+    error in a thread is raised here.
+    """
+    attempts = 10
+
+    def run(target, calls):
+        results, errors = [None] * len(calls), []
+
+        def call(index, args):
+            try:
+                for attempt in range(1, attempts + 1):
+                    try:
+                        results[index] = target(*args)
+                        break
+                    except OperationalError as e:
+                        if "locked" not in str(e).lower() or attempt == attempts:
+                            raise
+                        time.sleep(0.01 * attempt)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=call, args=(index, args)) for index, args in enumerate(calls)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return results
+    return run
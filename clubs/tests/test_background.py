@@ -0,0 +1,74 @@
+import threading
+import pytest
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteWrapper
+from clubs.background import start_background_thread
+from clubs.models import Club, Event
+from users.models import Report
+from users.report_tasks import start_report_generation
+
+
+@pytest.fixture
+def opened_connections(monkeypatch):
+    """Every database connection opened while the test runs."""
+    opened = []
+    # SQLite ignores close() on the in-memory test database, which would hide
+    # a leak. The shared-cache database survives other threads closing their
+    # connections while the test thread keeps its own open, so let them close.
+    in_memory = SQLiteWrapper.is_in_memory_db
+    monkeypatch.setattr(
+        SQLiteWrapper, "is_in_memory_db",
+        lambda self: in_memory(self) and threading.current_thread() is threading.main_thread(),
+    )
+
+    def track(sender, connection, **kwargs):
+        opened.append(connection)
+
+    connection_created.connect(track)
+    yield opened
+    connection_created.disconnect(track)
+
+
+def open_count(opened):
+    return sum(1 for wrapper in opened if wrapper.connection is not None)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_connection_count_stays_bounded_under_load(club, opened_connections):
+    """Soak: 20 waves of 8 concurrent background tasks querying the database."""
+    concurrency, waves = 8, 20
+    peak, after_waves = 0, []
+
+    for _ in range(waves):
+        started = threading.Barrier(concurrency + 1)
+        release = threading.Event()
+
+        def task():
+            Club.objects.filter(pk=club.pk).exists()
+            Event.objects.filter(club=club).count()
+            started.wait()
+            release.wait()
+
+        threads = [start_background_thread(task) for _ in range(concurrency)]
+        started.wait()
+        peak = max(peak, open_count(opened_connections))
+        release.set()
+        for thread in threads:
+            thread.join()
+        after_waves.append(open_count(opened_connections))
+
+    assert len(opened_connections) >= concurrency * waves
+    # At most one connection per running task, and none left behind
+    assert peak <= concurrency
+    assert after_waves == [0] * waves
+
+
+@pytest.mark.django_db(transaction=True)
+def test_report_thread_closes_its_connection(admin_user, opened_connections):
+    report = Report.objects.create(title="Nightly", generated_by=admin_user)
+    start_report_generation(report).join()
+
+    report.refresh_from_db()
+    assert report.status == "completed"
+    assert open_count([c for c in opened_connections if c is not connection]) == 0
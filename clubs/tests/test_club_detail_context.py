@@ -0,0 +1,80 @@
+import pytest
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from clubs.context import build_club_detail_context
+from clubs.models import ClubPost, Event, Poll, PollOption
+from users.models import Profile
+
+
+@pytest.fixture
+def populated_club(club, create_user):
+    def add_members(count, offset=0):
+        users = []
+        for i in range(offset, offset + count):
+            user = create_user(f"member{i}")
+            Profile.objects.create(user=user, role="student", name=f"Member {i}")
+            users.append(user)
+        club.members.add(*users)
+        return users
+
+    members = add_members(3)
+    poll = Poll.objects.create(club=club, question="Lunch?", created_by=members[0])
+    pizza = PollOption.objects.create(poll=poll, text="Pizza")
+    PollOption.objects.create(poll=poll, text="Salad")
+    pizza.votes.add(members[0], members[1])
+    event = Event.objects.create(club=club, name="Meetup", description="", date=timezone.now().date())
+    event.attendees.add(members[0])
+    ClubPost.objects.create(club=club, author=members[0], title="Hello", content="World")
+    return club, members, add_members
+
+
+def get_request(user):
+    request = RequestFactory().get("/")
+    request.user = user
+    return request
+
+
+@pytest.mark.django_db
+def test_context_precomputes_counts_and_user_state(populated_club):
+    club, members, _ = populated_club
+    context = build_club_detail_context(get_request(members[0]), club)
+
+    assert context["is_member"]
+    assert context["member_count"] == 3
+    assert context["post_count"] == 1
+    options = {o.text: o.num_votes for o in context["polls"][0].options.all()}
+    assert options == {"Pizza": 2, "Salad": 0}
+    assert context["events"][0].attendee_total == 1
+    assert context["rsvp_event_ids"] == {context["events"][0].id}
+    assert context["voted_poll_ids"] == {context["polls"][0].id}
+
+
+@pytest.mark.django_db
+def test_template_renders_without_queries(populated_club):
+    club, members, _ = populated_club
+    request = get_request(members[0])
+    context = build_club_detail_context(request, club)
+
+    with CaptureQueriesContext(connection) as queries:
+        html = render_to_string("clubs/club_detail.html", context, request=request)
+    assert len(queries) == 0, [q["sql"] for q in queries]
+    assert "Leave Club" in html
+    assert "✓ Voted" in html
+
+
+@pytest.mark.django_db
+def test_query_count_does_not_grow_with_members(populated_club, django_capture_on_commit_callbacks):
+    club, members, add_members = populated_club
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as queries:
+            build_club_detail_context(get_request(members[0]), club)
+        return len(queries)
+
+    small = count_queries()
+    with django_capture_on_commit_callbacks(execute=True):
+        add_members(10, offset=3)
+    assert count_queries() == small
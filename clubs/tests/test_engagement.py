@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from clubs.context import clubs_with_engagement, polls_with_vote_totals
+from clubs.models import Club, ClubPost, Event, Poll, PollOption
+from users.models import Profile
+
+
+@pytest.fixture
+def make_user(django_user_model):
+    # No passwords: they never log in, and hashing dominates the test time
+    return lambda username: django_user_model.objects.create_user(username=username)
+
+
+def fill(club, author, members=0, events=0, posts=0, polls=0, make_user=None):
+    club.members.add(*[make_user(f"{club.name}-m{i}") for i in range(members)])
+    for i in range(events):
+        Event.objects.create(club=club, name=f"E{i}", description="", date=timezone.now().date())
+    for i in range(posts):
+        ClubPost.objects.create(club=club, author=author, content=f"P{i}")
+    for i in range(polls):
+        Poll.objects.create(club=club, question=f"Q{i}", created_by=author)
+
+
+@pytest.mark.django_db
+def test_counts_do_not_fan_out_and_scores_are_normalized(make_user):
+    author = make_user("author")
+    chess, drama, quiet = (Club.objects.create(name=name) for name in ("Chess", "Drama", "Quiet"))
+    fill(chess, author, members=4, events=3, posts=5, polls=2, make_user=make_user)
+    fill(drama, author, members=2, events=1, posts=0, polls=1, make_user=make_user)
+
+    with CaptureQueriesContext(connection) as queries:
+        clubs = {club.name: club for club in clubs_with_engagement(Club.objects.all())}
+    assert len(queries) == 1
+
+    chess, drama, quiet = clubs["Chess"], clubs["Drama"], clubs["Quiet"]
+    assert (chess.member_count, chess.event_count, chess.post_count, chess.poll_count) == (4, 3, 5, 2)
+    assert (drama.member_count, drama.event_count, drama.post_count, drama.poll_count) == (2, 1, 0, 1)
+    assert chess.raw_score == pytest.approx(4 * 0.2 + 3 * 0.3 + 5 * 0.3 + 2 * 0.2)
+    assert chess.engagement_percentage == pytest.approx(100)
+    assert drama.engagement_percentage == pytest.approx(100 * 0.9 / 3.6)
+    assert (quiet.raw_score, quiet.engagement_percentage) == (0, 0)
+
+
+@pytest.mark.django_db
+def test_no_activity_scores_zero():
+    Club.objects.create(name="Quiet")
+    [club] = clubs_with_engagement(Club.objects.all())
+    assert club.engagement_percentage == 0
+
+
+@pytest.mark.django_db
+def test_poll_vote_totals(make_user):
+    author = make_user("author")
+    club = Club.objects.create(name="Chess")
+    voters = [make_user(f"v{i}") for i in range(3)]
+    busy, empty = (Poll.objects.create(club=club, question=q, created_by=author) for q in ("Busy", "Empty"))
+    a, b = (PollOption.objects.create(poll=busy, text=t) for t in "ab")
+    PollOption.objects.create(poll=empty, text="c")
+    a.votes.add(*voters)
+    b.votes.add(voters[0])
+
+    totals = {poll.question: poll.vote_total for poll in polls_with_vote_totals(Poll.objects.all())}
+    assert totals == {"Busy": 4, "Empty": 0}
+
+
+@pytest.mark.django_db
+def test_reports_page_shows_engagement(client, create_user, make_user):
+    lecturer = create_user("lecturer")
+    Profile.objects.create(user=lecturer, role="lecturer")
+    chess, drama = Club.objects.create(name="Chess"), Club.objects.create(name="Drama")
+    fill(chess, lecturer, members=2, events=2, posts=2, polls=2, make_user=make_user)
+    fill(drama, lecturer, members=2, make_user=make_user)
+    client.login(username="lecturer", password="testpass")
+
+    resp = client.get(reverse("reports"))
+
+    assert resp.status_code == 200
+    scores = {club.name: round(club.engagement_percentage) for club in resp.context["clubs"]}
+    assert scores == {"Chess": 100, "Drama": 20}
+    assert "20%" in resp.content.decode()
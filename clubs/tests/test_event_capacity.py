@@ -0,0 +1,122 @@
+import time
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from clubs.models import Event, EventWaitlistEntry
+from clubs.toggles import toggle_event_rsvp, fill_event_from_waitlist, ATTENDING, WAITLISTED, NOT_ATTENDING
+
+
+@pytest.fixture
+def make_event(club):
+    def make(capacity=None):
+        return Event.objects.create(
+            club=club, name="Hackathon", description="", date=timezone.now().date(), capacity=capacity
+        )
+    return make
+
+
+def bulk_users(django_user_model, prefix, count):
+    """Users without password hashing, which would dominate these tests."""
+    return django_user_model.objects.bulk_create(
+        [django_user_model(username=f"{prefix}{i}") for i in range(count)]
+    )
+
+
+@pytest.fixture
+def users(django_user_model):
+    return bulk_users(django_user_model, "student", 4)
+
+
+def waitlisted(event):
+    return list(EventWaitlistEntry.objects.filter(event=event).values_list("user__username", flat=True))
+
+
+@pytest.mark.django_db
+def test_full_event_waitlists_and_promotes_on_cancel(make_event, users):
+    event = make_event(capacity=2)
+    first, second, third, fourth = users[:4]
+
+    assert toggle_event_rsvp(event, first) == ATTENDING
+    assert toggle_event_rsvp(event, second) == ATTENDING
+    assert toggle_event_rsvp(event, third) == WAITLISTED
+    assert toggle_event_rsvp(event, fourth) == WAITLISTED
+    event.refresh_from_db()
+    assert event.attendee_total == 2 and event.is_full()
+
+    # The first user cancels: the longest-waiting user takes the place
+    assert toggle_event_rsvp(event, first) == NOT_ATTENDING
+    event.refresh_from_db()
+    assert set(event.attendees.all()) == {second, third}
+    assert event.attendee_total == 2
+    assert waitlisted(event) == [fourth.username]
+
+    # Leaving the waitlist does not touch the attendees
+    assert toggle_event_rsvp(event, fourth) == NOT_ATTENDING
+    assert waitlisted(event) == []
+    event.refresh_from_db()
+    assert event.attendee_total == 2
+
+
+@pytest.mark.django_db
+def test_raising_capacity_promotes_waitlist(make_event, users):
+    event = make_event(capacity=1)
+    for user in users[:3]:
+        toggle_event_rsvp(event, user)
+
+    event.capacity = 2
+    event.save()
+    assert fill_event_from_waitlist(event) == [users[1].pk]
+    event.capacity = None
+    event.save()
+    assert fill_event_from_waitlist(event) == [users[2].pk]
+    event.refresh_from_db()
+    assert event.attendee_total == 3
+
+
+@pytest.mark.django_db
+def test_counter_follows_direct_attendee_changes(make_event, users):
+    event = make_event()
+    event.attendees.add(*users[:3])
+    event.refresh_from_db()
+    assert event.attendee_total == 3
+
+    event.attendees.remove(users[0])
+    users[1].event_attendees.clear()
+    event.refresh_from_db()
+    assert event.attendee_total == 1
+
+
+@pytest.mark.django_db
+def test_rsvp_query_count_does_not_grow_with_attendees(make_event, django_user_model, users):
+    event = make_event(capacity=100)
+
+    def count_queries(user):
+        with CaptureQueriesContext(connection) as queries:
+            toggle_event_rsvp(event, user)
+        return len(queries)
+
+    count_queries(users[2])  # first write also creates the table change counters
+    small = count_queries(users[0])
+    event.attendees.add(*bulk_users(django_user_model, "extra", 20))
+    assert count_queries(users[1]) == small
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rsvp_stampede_never_overbooks(make_event, django_user_model, run_concurrently):
+    """Many students RSVP to a small event at once, each from its own thread."""
+    event = make_event(capacity=5)
+    students = bulk_users(django_user_model, "rush", 20)
+
+    started = time.perf_counter()
+    results = run_concurrently(toggle_event_rsvp, [(event, student) for student in students])
+    elapsed = time.perf_counter() - started
+
+    event.refresh_from_db()
+    assert results.count(ATTENDING) == 5
+    assert results.count(WAITLISTED) == 15
+    assert event.attendee_total == event.attendees.count() == 5
+    assert EventWaitlistEntry.objects.filter(event=event).count() == 15
+    # One locked row update per RSVP keeps the stampede fast, even with
+    # SQLite serializing the writers through lock retries
+    assert elapsed < 5, f"{len(students)} RSVPs took {elapsed:.2f}s"
@@ -0,0 +1,120 @@
+from datetime import timedelta
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from clubs.feed import feed_page
+from clubs.models import Club, ClubPost, Event, Poll
+
+
+@pytest.fixture
+def feed_club(django_user_model):
+    """Two clubs the reader is in and one they aren't, with a post, event and poll each."""
+    # No passwords: they never log in, and hashing dominates the test time
+    reader = django_user_model.objects.create_user(username="reader")
+    author = django_user_model.objects.create_user(username="author")
+    clubs = [Club.objects.create(name=name) for name in ("Chess", "Drama", "Other")]
+    for club in clubs[:2]:
+        club.members.add(reader)
+    for club in clubs:
+        ClubPost.objects.create(club=club, author=author, title=f"{club.name} post", content="Hello")
+        Event.objects.create(club=club, name=f"{club.name} event", description="", date=timezone.now().date())
+        Poll.objects.create(club=club, question=f"{club.name} poll", created_by=author)
+    return reader, author, clubs
+
+
+def headlines(page):
+    return [item["headline"] for item in page]
+
+
+@pytest.mark.django_db
+def test_feed_merges_the_users_clubs_newest_first(feed_club):
+    reader, _, _ = feed_club
+
+    with CaptureQueriesContext(connection) as queries:
+        page = feed_page(reader)
+    # The user's club ids, then one UNION for the page
+    assert len(queries) == 2
+
+    assert headlines(page) == [
+        "Drama poll", "Drama event", "Drama post", "Chess poll", "Chess event", "Chess post",
+    ]
+    assert not page.has_next
+    assert page.items[1]["kind"] == "event" and page.items[1]["event_date"] == timezone.now().date()
+
+
+@pytest.mark.django_db
+def test_cursor_pages_through_ties_without_gaps(feed_club):
+    reader, author, (chess, drama, _) = feed_club
+    # Same timestamp everywhere: ordering falls back to (kind, id)
+    same = timezone.now() - timedelta(hours=1)
+    for model in (ClubPost, Event, Poll):
+        model.objects.update(created_at=same)
+
+    seen, cursor = [], None
+    while True:
+        page = feed_page(reader, cursor, per_page=4)
+        seen += [(item["kind"], item["id"]) for item in page]
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+    assert len(seen) == len(set(seen)) == 6
+    assert [kind for kind, _ in seen] == ["post", "post", "poll", "poll", "event", "event"]
+
+
+@pytest.mark.django_db
+def test_feed_is_cached_per_user_briefly(feed_club):
+    reader, author, (chess, _, _) = feed_club
+    feed_page(reader)
+
+    ClubPost.objects.create(club=chess, author=author, title="Fresh", content="")
+    with CaptureQueriesContext(connection) as queries:
+        page = feed_page(reader)
+    assert len(queries) == 0
+    assert "Fresh" not in headlines(page)
+
+    cache.clear()
+    assert headlines(feed_page(reader))[0] == "Fresh"
+
+
+@pytest.mark.django_db
+def test_tampered_cursor_starts_from_the_top(feed_club):
+    reader, _, _ = feed_club
+    assert headlines(feed_page(reader, "nonsense"))[0] == "Drama poll"
+
+
+@pytest.mark.django_db
+def test_feed_page_and_load_more(client, create_user):
+    user = create_user("student")
+    club = Club.objects.create(name="Chess")
+    club.members.add(user)
+    for i in range(25):
+        ClubPost.objects.create(club=club, author=user, title=f"Post {i}", content="")
+    client.login(username="student", password="testpass")
+
+    resp = client.get(reverse("activity_feed"))
+    assert resp.status_code == 200
+    assert len(resp.context["feed"]) == 20
+    assert "Post 24" in resp.content.decode()
+
+    more = client.get(reverse("activity_feed"), {"cursor": resp.context["feed"].next_cursor, "partial": "1"})
+    data = more.json()
+    assert "Post 4" in data["html"] and "Post 5" not in data["html"]
+    assert data["next"] is None
+
+
+@pytest.mark.django_db
+def test_feed_api(feed_club):
+    reader, _, _ = feed_club
+    api = APIClient()
+    api.force_authenticate(reader)
+
+    first = api.get(reverse("feed_api"), {"limit": 4}).json()
+    assert [item["headline"] for item in first["items"]] == ["Drama poll", "Drama event", "Drama post", "Chess poll"]
+    rest = api.get(reverse("feed_api"), {"limit": 4, "cursor": first["next"]}).json()
+    assert [item["headline"] for item in rest["items"]] == ["Chess event", "Chess post"]
+    assert rest["next"] is None
+    assert api.get(reverse("feed_api"), {"limit": "all"}).status_code == 400
@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from clubs.cache import get_club_version
+from clubs.models import ClubPost, Event, Poll, PollOption
+from users.models import Profile
+
+
+@pytest.fixture
+def student(create_user):
+    user = create_user("student")
+    Profile.objects.create(user=user, role="student", name="Student")
+    return user
+
+
+@pytest.mark.django_db
+def test_version_bumps_on_club_content_changes(club, student, django_capture_on_commit_callbacks):
+    def bumped(action):
+        before = get_club_version(club.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            action()
+            # Not before the write commits, or a reader could cache old data under the new version
+            assert get_club_version(club.id) == before
+        return get_club_version(club.id) != before
+
+    post = ClubPost(club=club, author=student, title="Hello", content="World")
+    assert bumped(post.save)
+    poll = Poll.objects.create(club=club, question="Lunch?", created_by=student)
+    option = PollOption.objects.create(poll=poll, text="Pizza")
+    event = Event.objects.create(club=club, name="Meetup", description="", date=timezone.now().date())
+
+    assert bumped(lambda: option.votes.add(student))
+    assert bumped(lambda: event.attendees.add(student))
+    assert bumped(lambda: club.members.add(student))
+    # Changes made from the user's side of the relation count too
+    assert bumped(lambda: student.clubs.clear())
+    assert bumped(lambda: student.poll_votes.remove(option))
+    assert bumped(post.delete)
+
+
+@pytest.mark.django_db
+def test_other_club_versions_are_untouched(club, student):
+    from clubs.models import Club
+    other = Club.objects.create(name="Chess", description="", meeting_time="Fri")
+    before = get_club_version(other.id)
+    ClubPost.objects.create(club=club, author=student, title="Hello", content="World")
+    assert get_club_version(other.id) == before
+
+
+@pytest.mark.django_db
+def test_club_detail_serves_shared_fragments_from_cache(client, club, student, django_capture_on_commit_callbacks):
+    club.members.add(student)
+    for i in range(5):
+        ClubPost.objects.create(club=club, author=student, title=f"Post {i}", content="...")
+    client.login(username="student", password="testpass")
+    url = reverse("club_detail", args=[club.id])
+
+    with CaptureQueriesContext(connection) as cold:
+        client.get(url)
+    with CaptureQueriesContext(connection) as warm:
+        resp = client.get(url)
+    assert len(warm) < len(cold)
+    assert b"Post 4" in resp.content
+
+    # A new post bumps the version, so the next render includes it
+    with django_capture_on_commit_callbacks(execute=True):
+        ClubPost.objects.create(club=club, author=student, title="Fresh news", content="...")
+    assert b"Fresh news" in client.get(url).content
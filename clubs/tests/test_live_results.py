@@ -0,0 +1,135 @@
+import json
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from clubs.cache import get_poll_tally_version
+from clubs.live import tally_events, tally_snapshot
+from clubs.models import Club, Poll, PollOption
+from clubs.toggles import cast_vote
+
+
+@pytest.fixture
+def poll(create_user):
+    club = Club.objects.create(name="Chess")
+    poll = Poll.objects.create(club=club, question="Day?", created_by=create_user("lecturer"))
+    PollOption.objects.create(poll=poll, text="Monday")
+    PollOption.objects.create(poll=poll, text="Friday")
+    return poll
+
+
+@pytest.fixture
+def fast_stream(settings):
+    settings.POLL_RESULTS_INTERVAL = 0.01
+    settings.POLL_RESULTS_HEARTBEAT = 0
+    return settings
+
+
+def parse(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields.get("event"), json.loads(fields["data"]) if "data" in fields else None
+
+
+@pytest.mark.django_db
+def test_burst_of_votes_is_one_message(poll, fast_stream, django_capture_on_commit_callbacks):
+    monday, friday = poll.options.order_by("id")
+    # No passwords: they never log in, and hashing dominates the test time
+    voters = User.objects.bulk_create([User(username=f"v{i}") for i in range(30)])
+
+    def vote_burst():
+        with django_capture_on_commit_callbacks(execute=True):
+            for i, voter in enumerate(voters):
+                cast_vote(monday if i % 3 else friday, voter)
+
+    async def listen():
+        events = tally_events(poll.id)
+        messages = [await anext(events), await anext(events)]
+        await sync_to_async(vote_burst)()
+        messages += [await anext(events), await anext(events)]
+        await events.aclose()
+        return messages
+
+    retry, first, after_burst, quiet = async_to_sync(listen)()
+
+    assert retry == "retry: 10\n\n"
+    assert parse(first) == ("tally", {"poll": poll.id, "final": False, "total": 0, "options": [
+        {"id": monday.id, "text": "Monday", "votes": 0}, {"id": friday.id, "text": "Friday", "votes": 0},
+    ]})
+    event, tally = parse(after_burst)
+    assert event == "tally"
+    assert (tally["total"], [o["votes"] for o in tally["options"]]) == (30, [20, 10])
+    # Nothing changed since: only a keep-alive
+    assert quiet == ": keep-alive\n\n"
+
+
+@pytest.mark.django_db
+def test_reconnect_skips_tallies_the_client_has(poll):
+    version = str(get_poll_tally_version(poll.id))
+
+    async def replay(last_version):
+        return [event async for event in tally_events(poll.id, last_version, once=True)]
+
+    assert len(async_to_sync(replay)(version)) == 1
+    assert parse(async_to_sync(replay)("stale")[1])[0] == "tally"
+
+
+@pytest.mark.django_db
+def test_tallies_are_counted_once_per_version(poll, create_user, django_capture_on_commit_callbacks):
+    tally_snapshot(poll.id)
+    with CaptureQueriesContext(connection) as queries:
+        tally_snapshot(poll.id)
+    assert len(queries) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cast_vote(poll.options.first(), create_user("voter"))
+    assert tally_snapshot(poll.id)["total"] == 1
+
+
+@pytest.mark.django_db
+def test_stream_under_wsgi_sends_current_tallies(client, poll, create_user):
+    url = reverse("poll_results_stream", args=[poll.id])
+    assert client.get(url).status_code == 401
+
+    client.force_login(create_user("student"))
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "text/event-stream"
+    retry, message = resp.content.decode().split("\n\n", 1)
+    assert retry == "retry: 1000"
+    assert parse(message)[1]["total"] == 0
+
+    assert client.get(reverse("poll_results_stream", args=[999])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_stream_under_asgi_with_a_jwt(poll, create_user, settings):
+    settings.POLL_RESULTS_MAX_SECONDS = 0
+    token = str(RefreshToken.for_user(create_user("student")).access_token)
+
+    async def fetch():
+        client = AsyncClient()
+        resp = await client.get(
+            reverse("poll_results_stream", args=[poll.id]), headers={"Authorization": f"Bearer {token}"}
+        )
+        return resp, b"".join([chunk async for chunk in resp.streaming_content]).decode()
+
+    resp, body = async_to_sync(fetch)()
+    assert resp.status_code == 200 and resp.streaming
+    assert parse(body.split("\n\n")[1]) == ("tally", tally_snapshot(poll.id))
+
+
+@pytest.mark.django_db
+def test_results_api(poll, create_user):
+    api = APIClient()
+    api.force_authenticate(create_user("student"))
+    cast_vote(poll.options.first(), create_user("voter"))
+
+    resp = api.get(reverse("poll-results", args=[poll.id]))
+
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 1
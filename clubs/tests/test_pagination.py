@@ -0,0 +1,97 @@
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from clubs.models import ClubPost, Event
+from clubs.pagination import KeysetPaginator
+from users.models import Profile
+
+
+@pytest.fixture
+def author(create_user):
+    user = create_user("writer")
+    Profile.objects.create(user=user, role="admin", name="Writer")
+    return user
+
+
+def make_posts(club, author, count):
+    posts = [ClubPost.objects.create(club=club, author=author, title=f"Post {i}", content="...") for i in range(count)]
+    # Force identical timestamps so the id tiebreak is exercised
+    ClubPost.objects.update(created_at=timezone.now())
+    return posts
+
+
+@pytest.mark.django_db
+def test_keyset_pages_cover_every_row_once(club, author):
+    make_posts(club, author, 45)
+    paginator = KeysetPaginator(ClubPost.objects.all(), ("-created_at", "-id"), per_page=20)
+
+    seen, cursor = [], None
+    while True:
+        page = paginator.page(cursor)
+        seen.extend(post.id for post in page)
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == 45
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.django_db
+def test_keyset_ascending_date_ordering(club):
+    today = timezone.now().date()
+    for i in range(5):
+        Event.objects.create(club=club, name=f"Event {i}", description="", date=today + timedelta(days=i % 2))
+    paginator = KeysetPaginator(Event.objects.all(), ("date", "id"), per_page=2)
+
+    first = paginator.page()
+    second = paginator.page(first.next_cursor)
+    assert [e.id for e in first] + [e.id for e in second] == [
+        e.id for e in Event.objects.order_by("date", "id")[:4]
+    ]
+
+
+@pytest.mark.django_db
+def test_tampered_cursor_falls_back_to_first_page(club, author):
+    make_posts(club, author, 3)
+    paginator = KeysetPaginator(ClubPost.objects.all(), per_page=2)
+    assert [p.id for p in paginator.page("not-a-cursor")] == [p.id for p in paginator.page()]
+
+
+@pytest.mark.django_db
+def test_deep_page_query_count_is_constant(club, author, django_assert_max_num_queries):
+    make_posts(club, author, 100)
+    paginator = KeysetPaginator(ClubPost.objects.all(), per_page=10)
+    cursor = None
+    for _ in range(9):
+        cursor = paginator.page(cursor).next_cursor
+    with django_assert_max_num_queries(1):
+        assert len(paginator.page(cursor)) == 10
+
+
+@pytest.mark.django_db
+def test_manage_posts_load_more_partial(client, club, author):
+    make_posts(club, author, 25)
+    client.login(username="writer", password="testpass")
+
+    resp = client.get(reverse("manage_posts"))
+    assert resp.status_code == 200
+    assert resp.context["posts"].has_next
+
+    more = client.get(reverse("manage_posts") + "?" + resp.context["posts"].next_query + "&partial=1")
+    data = more.json()
+    assert data["next"] is None
+    assert data["html"].count("post-card") == 5
+
+
+@pytest.mark.django_db
+def test_my_activity_counts_every_attendee(client, club, create_user):
+    student, other = create_user("student"), create_user("other")
+    event = Event.objects.create(club=club, name="Meetup", description="", date=timezone.now().date())
+    event.attendees.add(student, other)
+    client.force_login(student)
+
+    response = client.get(reverse("my_activity"))
+
+    assert [e.attendee_total for e in response.context["rsvp_events"]] == [2]
@@ -0,0 +1,109 @@
+import io
+import tempfile
+import tracemalloc
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from clubs.models import Event
+from clubs.pdf import ReportSpec, StreamedTable, TableBlock, Text, get_styles, get_table_style, render_report
+from clubs.report_specs import grades_report, students_report
+from users.models import Course, Profile, StudentMark
+
+
+@pytest.fixture
+def lecturer(create_user):
+    user = create_user("lecturer")
+    Profile.objects.create(user=user, role="lecturer", name="Lecturer")
+    return user
+
+
+@pytest.fixture
+def students(django_user_model):
+    users = django_user_model.objects.bulk_create(
+        [django_user_model(username=f"student{i}", email=f"student{i}@example.com") for i in range(3)]
+    )
+    Profile.objects.bulk_create([Profile(user=u, role="student", name=f"Student {i}") for i, u in enumerate(users)])
+    return users
+
+
+def test_styles_are_built_once():
+    assert get_styles() is get_styles()
+    assert get_table_style("grid") is get_table_style("grid")
+
+
+def test_render_report_writes_pdf():
+    spec = ReportSpec("Example", "example").add(
+        TableBlock([["A", "B"], ["1", "2"]], [1, 1]),
+        Text("<b>Done</b>"),
+    )
+    stream = render_report(spec, io.BytesIO())
+    assert stream.getvalue().startswith(b"%PDF")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", ["clubs", "students", "events", "polls", "grades", "engagement"])
+def test_download_endpoints_stream_pdfs(client, club, lecturer, students, name):
+    club.members.add(*students)
+    Event.objects.create(club=club, name="Meetup", description="", date=timezone.now().date())
+    client.login(username="lecturer", password="testpass")
+
+    resp = client.get(reverse(f"download_{name}_report"))
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/pdf"
+    assert f"{name}_report_" in resp["Content-Disposition"]
+    assert b"".join(resp.streaming_content).startswith(b"%PDF")
+
+
+@pytest.mark.django_db
+def test_grades_report_covers_every_student_with_marks(django_user_model, students):
+    course = Course.objects.create(code="CS101", name="Intro", credit_units=3)
+    more = django_user_model.objects.bulk_create([django_user_model(username=f"extra{i}") for i in range(25)])
+    Profile.objects.bulk_create([Profile(user=u, role="student", name=f"Extra {i}") for i, u in enumerate(more)])
+    for student in [students[0]] + more:
+        StudentMark.objects.create(student=student, course=course, marks=75)
+
+    sections = list(grades_report().sections)
+    names = [s.text for s in sections if isinstance(s, Text)]
+    # No longer cut off at 20 students
+    assert len(names) == 26 and names[0] == "<b>Student 0</b>"
+    gpa_row = sections[1].rows[-1]
+    assert gpa_row[2] == "GPA:" and gpa_row[3] != "N/A"
+
+
+@pytest.mark.django_db
+def test_large_reports_render_with_flat_query_count(django_user_model, students):
+    def render_queries():
+        with CaptureQueriesContext(connection) as queries:
+            render_report(students_report(), io.BytesIO())
+            render_report(grades_report(), io.BytesIO())
+        return len(queries)
+
+    few = render_queries()
+    more = django_user_model.objects.bulk_create([django_user_model(username=f"extra{i}") for i in range(50)])
+    Profile.objects.bulk_create([Profile(user=u, role="student", name="Extra") for u in more])
+    assert render_queries() == few
+
+
+def test_streamed_table_uses_less_memory_than_one_big_table():
+    header = ["Name", "Email", "Clubs", "Reg"]
+
+    def peak(make_section, row_count=1000):
+        rows = ([f"Student {i}", f"s{i}@example.com", "3", "N/A"] for i in range(row_count))
+        tracemalloc.start()
+        spec = ReportSpec("Big", "big").add(make_section(rows))
+        with tempfile.TemporaryFile() as stream:
+            render_report(spec, stream)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_bytes
+
+    def streamed(rows):
+        return StreamedTable(header, rows, [2, 2, 1.5, 1.5])
+
+    def single_table(rows):
+        return TableBlock([header] + list(rows), [2, 2, 1.5, 1.5])
+
+    peak(streamed, 40)  # warm up fonts and styles
+    assert peak(streamed) < 0.75 * peak(single_table)
@@ -0,0 +1,210 @@
+from datetime import timedelta
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.serializers import PollSerializer
+from clubs.context import polls_with_vote_totals
+from clubs.live import tally_events, tally_snapshot
+from clubs.models import Club, PendingVote, Poll, PollOption
+from clubs.polls import close_due_polls, close_poll, open_polls
+from clubs.toggles import cast_vote
+from clubs.votes import VoteFlusher
+from users.models import Profile
+
+VOTES_TABLE = PollOption.votes.through._meta.db_table
+
+
+@pytest.fixture
+def lecturer(create_user):
+    user = create_user("lecturer")
+    Profile.objects.create(user=user, role="lecturer")
+    return user
+
+
+@pytest.fixture
+def poll(lecturer):
+    club = Club.objects.create(name="Chess")
+    poll = Poll.objects.create(club=club, question="Day?", created_by=lecturer)
+    PollOption.objects.create(poll=poll, text="Monday")
+    PollOption.objects.create(poll=poll, text="Friday")
+    return poll
+
+
+def vote(poll, *counts):
+    """Cast ``counts[i]`` votes for the poll's i-th option from fresh users."""
+    for option, n in zip(poll.options.order_by("id"), counts):
+        for voter in User.objects.bulk_create([User(username=f"o{option.id}-{i}") for i in range(n)]):
+            cast_vote(option, voter)
+
+
+def touches_votes(queries):
+    return any(VOTES_TABLE in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+def test_open_polls_follow_the_timestamps(poll, lecturer):
+    now = timezone.now()
+    later = Poll.objects.create(club=poll.club, question="Later?", created_by=lecturer, opens_at=now + timedelta(hours=1))
+    ended = Poll.objects.create(club=poll.club, question="Ended?", created_by=lecturer, closes_at=now)
+    closing = Poll.objects.create(club=poll.club, question="Soon?", created_by=lecturer, closes_at=now + timedelta(hours=1))
+
+    assert set(open_polls()) == {poll, closing}
+    assert poll.is_open and closing.is_open
+    assert not later.is_open and not later.is_closed
+    assert ended.is_closed and not ended.is_open
+
+
+@pytest.mark.django_db
+def test_closing_freezes_the_results_once(poll):
+    vote(poll, 3, 1)
+    monday, friday = poll.options.order_by("id")
+
+    assert close_poll(poll)
+    poll.refresh_from_db()
+    assert poll.closed_at is not None and not poll.is_open
+    assert poll.results == {"total": 4, "options": [
+        {"id": monday.id, "text": "Monday", "votes": 3},
+        {"id": friday.id, "text": "Friday", "votes": 1},
+    ]}
+
+    # A vote that slips in afterwards changes nothing, nor does closing again
+    cast_vote(friday, User.objects.create(username="late"))
+    assert not close_poll(poll)
+    poll.refresh_from_db()
+    assert poll.results["total"] == 4
+    assert tally_snapshot(poll.id) == {"poll": poll.id, "final": True, **poll.results}
+    assert polls_with_vote_totals(Poll.objects.filter(pk=poll.pk)).get().vote_total == 4
+    assert poll.total_votes() == 4
+
+
+@pytest.mark.django_db
+def test_closing_counts_buffered_votes(poll, monkeypatch):
+    monkeypatch.setattr(VoteFlusher, "wake", lambda self: None)
+    option = poll.options.first()
+    for voter in User.objects.bulk_create([User(username=f"s{i}") for i in range(2)]):
+        PendingVote.objects.create(poll=poll, option=option, user=voter)
+
+    close_poll(poll)
+
+    assert poll.results["total"] == 2
+    assert not PendingVote.objects.filter(flushed_at__isnull=True).exists()
+
+
+@pytest.mark.django_db
+def test_readers_of_a_closed_poll_skip_the_vote_tables(client, poll, lecturer):
+    vote(poll, 2, 2)
+    close_poll(poll)
+    poll = Poll.objects.get(pk=poll.pk)
+    client.force_login(lecturer)
+
+    with CaptureQueriesContext(connection) as queries:
+        data = PollSerializer(poll).data
+        response = client.get(reverse("club_detail", args=[poll.club_id]))
+
+    assert [option["votes_count"] for option in data["options"]] == [2, 2]
+    assert data["is_open"] is False
+    assert response.context["active_polls"] == []
+    assert [p.final_results for p in response.context["closed_polls"]] == [poll.results["options"]]
+    assert not touches_votes(queries)
+
+
+@pytest.mark.django_db
+def test_poll_past_its_closing_time(client, poll, create_user):
+    vote(poll, 1, 0)
+    Poll.objects.filter(pk=poll.pk).update(closes_at=timezone.now() - timedelta(minutes=1))
+    student = create_user("student")
+    client.force_login(student)
+
+    response = client.post(reverse("vote_poll", args=[poll.id]), {"option": poll.options.last().id})
+    assert "not taking votes" in str(list(get_messages(response.wsgi_request))[-1])
+    api = APIClient()
+    api.force_authenticate(student)
+    assert api.post(reverse("poll-vote", args=[poll.id]), {"option": poll.options.last().id}).status_code == 400
+
+    # Shown as closed with its live count until the results are frozen
+    closed = client.get(reverse("club_detail", args=[poll.club_id])).context["closed_polls"]
+    assert [option["votes"] for option in closed[0].final_results] == [1, 0]
+
+    assert close_due_polls() == [poll]
+    assert close_due_polls() == []
+    assert Poll.objects.get(pk=poll.pk).results["total"] == 1
+
+
+@pytest.mark.django_db
+def test_lecturer_closes_a_poll(client, poll, lecturer, create_user):
+    student = create_user("student")
+    client.force_login(student)
+    client.post(reverse("close_poll", args=[poll.id]))
+    assert Poll.objects.get(pk=poll.pk).closed_at is None
+
+    client.force_login(lecturer)
+    client.post(reverse("close_poll", args=[poll.id]))
+    assert Poll.objects.get(pk=poll.pk).closed_at is not None
+
+    api = APIClient()
+    api.force_authenticate(lecturer)
+    assert api.post(reverse("poll-close", args=[poll.id])).status_code == 400
+
+
+@pytest.mark.django_db
+def test_close_polls_command(poll, capsys):
+    Poll.objects.filter(pk=poll.pk).update(closes_at=timezone.now())
+
+    call_command("close_polls")
+
+    assert f"closed poll {poll.id} (0 votes)" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_stream_ends_with_the_final_results(poll):
+    close_poll(poll)
+
+    async def listen():
+        return [message async for message in tally_events(poll.id)]
+
+    retry, final = async_to_sync(listen)()
+    assert '"final": true' in final
+
+
+@pytest.mark.django_db
+def test_create_poll_with_an_end_date(client, poll, lecturer):
+    client.force_login(lecturer)
+    url = reverse("create_poll")
+    form = {"club": poll.club_id, "question": "Venue?", "option_1": "Hall", "option_2": "Lab"}
+
+    client.post(url, {**form, "end_date": "2000-01-01T10:00"})
+    assert not Poll.objects.filter(question="Venue?").exists()
+
+    client.post(url, {**form, "end_date": (timezone.localtime() + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M")})
+    assert Poll.objects.get(question="Venue?").closes_at > timezone.now()
+
+
+@pytest.mark.django_db
+def test_system_report_and_export_use_frozen_totals(client, poll, lecturer):
+    from clubs.pdf import Text
+    from clubs.report_specs import system_report
+
+    vote(poll, 2, 2)
+    close_poll(poll)
+    # A vote that reaches the table after closing isn't counted
+    poll.options.first().votes.add(User.objects.create(username="late"))
+    other = Poll.objects.create(club=poll.club, question="Time?", created_by=lecturer)
+    PollOption.objects.create(poll=other, text="Noon")
+    vote(other, 1)
+
+    texts = [s.text for s in system_report().sections if isinstance(s, Text)]
+    active = texts[texts.index("<b>3. Active Polls</b>") + 1:texts.index("<b>4. Recent Club Posts</b>")]
+    assert active == ["<b>- Time?</b>", "Club: Chess | Total Votes: 1"]
+
+    client.force_login(lecturer)
+    rows = client.get(reverse("export_all_data")).content.decode().splitlines()
+    polls = rows[rows.index("=== POLLS ===") + 1:]
+    assert polls[0] == "Question,Club,Total Votes,Status,Created Date"
+    assert {row.rsplit(",", 1)[0] for row in polls[1:3]} == {"Day?,Chess,4,Closed", "Time?,Chess,1,Active"}
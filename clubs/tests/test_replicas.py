@@ -0,0 +1,80 @@
+import sqlite3
+import pytest
+from django.db import connection, connections, router
+from django.urls import reverse
+from clubs.models import Club
+from clubs.replicas import PIN_COOKIE, REPLICA_ALIAS, read_from_primary, read_from_replica
+from users.models import Profile
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """
+    A second SQLite database registered as the replica.
+
+    Call the returned function to "replicate": it copies the primary into
+    the replica file, which then lags until the next call.
+    """
+    path = tmp_path / "replica.sqlite3"
+    connections.settings[REPLICA_ALIAS] = {**connection.settings_dict, "NAME": str(path)}
+    # Connect directly: the test case only lets aliases it was set up with
+    # open connections through ensure_connection()
+    connections[REPLICA_ALIAS].connect()
+
+    def sync():
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+
+    yield sync
+    connections[REPLICA_ALIAS].close()
+    del connections[REPLICA_ALIAS]
+    del connections.settings[REPLICA_ALIAS]
+
+
+def test_reads_stay_on_primary_without_a_replica():
+    with read_from_replica():
+        assert router.db_for_read(Club) == "default"
+    assert router.allow_migrate(REPLICA_ALIAS, "clubs") is False
+
+
+@pytest.mark.django_db(transaction=True)
+def test_report_reads_go_to_the_replica(client, create_user, replica):
+    Profile.objects.create(user=create_user("lecturer"), role="lecturer")
+    Club.objects.create(name="Chess")
+    replica()
+    Club.objects.create(name="Not replicated yet")
+
+    with read_from_replica():
+        assert router.db_for_read(Club) == REPLICA_ALIAS
+        assert [c.name for c in Club.objects.all()] == ["Chess"]
+    assert router.db_for_read(Club) == "default"
+    assert Club.objects.count() == 2
+    # Report artifacts are rendered from the primary even inside a replica block
+    with read_from_replica(), read_from_primary():
+        assert Club.objects.count() == 2
+
+    client.login(username="lecturer", password="testpass")
+    resp = client.get(reverse("reports"))
+    assert [c.name for c in resp.context["clubs"]] == ["Chess"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_read_their_own_writes(client, create_user, replica):
+    Profile.objects.create(user=create_user("student"), role="student")
+    club = Club.objects.create(name="Chess")
+    client.login(username="student", password="testpass")
+    replica()
+
+    resp = client.post(reverse("toggle_membership", args=[club.id]))
+    # The join went to the primary and pinned this user to it
+    assert PIN_COOKIE in resp.cookies
+    resp = client.get(reverse("student_dashboard"))
+    assert [c.name for c in resp.context["user_clubs"]] == ["Chess"]
+
+    # Once the pin expires, dashboards read the (still lagging) replica again
+    del client.cookies[PIN_COOKIE]
+    resp = client.get(reverse("student_dashboard"))
+    assert resp.context["user_clubs"] == []
+    assert PIN_COOKIE not in resp.cookies
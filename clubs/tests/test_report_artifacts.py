@@ -0,0 +1,128 @@
+import os
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from clubs.artifacts import artifact_dir, data_fingerprint, evict_artifacts, get_report_artifact
+from clubs.checks import check_shared_cache
+from clubs.models import Club, Poll, PollOption
+from clubs.report_specs import REPORT_TABLES
+from users.models import Profile
+
+
+@pytest.fixture
+def lecturer(create_user):
+    user = create_user("lecturer")
+    Profile.objects.create(user=user, role="lecturer", name="Lecturer")
+    return user
+
+
+def download(client, name="download_clubs_report"):
+    resp = client.get(reverse(name))
+    assert resp.status_code == 200
+    return b"".join(resp.streaming_content)
+
+
+@pytest.mark.django_db
+def test_repeat_download_reuses_artifact(client, club, lecturer):
+    client.login(username="lecturer", password="testpass")
+    first = download(client)
+    assert len(list(artifact_dir().glob("clubs-*.pdf"))) == 1
+
+    with CaptureQueriesContext(connection) as queries:
+        second = download(client)
+    assert second == first
+    # Only the session/user lookups and the fingerprint; no report queries
+    assert not any("clubs_club" in q["sql"] and "COUNT" in q["sql"] for q in queries)
+
+
+@pytest.mark.django_db
+def test_data_change_produces_new_artifact(club, lecturer, django_capture_on_commit_callbacks):
+    before = data_fingerprint(REPORT_TABLES["clubs"])
+    first = get_report_artifact("clubs")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Club.objects.create(name="Chess", description="", meeting_time="Fri")
+        # Until the write commits, a render could only store the old data
+        assert data_fingerprint(REPORT_TABLES["clubs"]) == before
+    assert data_fingerprint(REPORT_TABLES["clubs"]) != before
+    assert get_report_artifact("clubs") != first
+
+    # Memberships are tracked through the m2m table
+    fingerprint = data_fingerprint(REPORT_TABLES["clubs"])
+    with django_capture_on_commit_callbacks(execute=True):
+        club.members.add(lecturer)
+    assert data_fingerprint(REPORT_TABLES["clubs"]) != fingerprint
+
+
+@pytest.mark.django_db
+def test_login_does_not_invalidate_reports(client, lecturer):
+    before = data_fingerprint(REPORT_TABLES["students"])
+    client.login(username="lecturer", password="testpass")
+    assert data_fingerprint(REPORT_TABLES["students"]) == before
+
+
+@pytest.mark.django_db
+def test_poll_opening_or_a_new_day_produces_new_artifact(club, lecturer, monkeypatch):
+    now = timezone.now()
+    poll = Poll.objects.create(club=club, question="Day?", created_by=lecturer, opens_at=now + timedelta(minutes=5))
+    first = get_report_artifact("polls")
+
+    # Nothing is written when the poll opens; only the clock moves
+    monkeypatch.setattr(timezone, "now", lambda: now + timedelta(minutes=10))
+    assert poll.is_open
+    second = get_report_artifact("polls")
+    assert second != first
+
+    monkeypatch.setattr(timezone, "localdate", lambda: now.date() + timedelta(days=1))
+    assert get_report_artifact("polls") != second
+
+
+@pytest.mark.django_db
+def test_votes_bump_report_versions_without_a_shared_row(club, lecturer, django_capture_on_commit_callbacks):
+    poll = Poll.objects.create(club=club, question="Day?", created_by=lecturer)
+    option = PollOption.objects.create(poll=poll, text="Monday")
+    before = data_fingerprint(REPORT_TABLES["polls"])
+
+    with CaptureQueriesContext(connection) as queries, django_capture_on_commit_callbacks(execute=True):
+        option.votes.add(lecturer)
+
+    assert data_fingerprint(REPORT_TABLES["polls"]) != before
+    assert not any("version" in q["sql"] for q in queries)
+
+
+def test_eviction_removes_least_recently_served(media_root):
+    directory = artifact_dir()
+    directory.mkdir(parents=True)
+    paths = []
+    for i in range(4):
+        path = directory / f"clubs-{i}.pdf"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+        paths.append(path)
+    # Serving the oldest makes it the most recent
+    os.utime(paths[0], (2000, 2000))
+
+    removed = evict_artifacts(max_bytes=250, max_files=10)
+    assert removed == [paths[1], paths[2]]
+    assert evict_artifacts(max_bytes=10_000, max_files=1) == [paths[3]]
+    assert [p.name for p in directory.glob("*.pdf")] == ["clubs-0.pdf"]
+
+
+@pytest.mark.django_db
+def test_sendfile_header(client, settings, club, lecturer):
+    settings.REPORT_SENDFILE_HEADER = "X-Accel-Redirect"
+    client.login(username="lecturer", password="testpass")
+    resp = client.get(reverse("download_clubs_report"))
+    assert resp["X-Accel-Redirect"].startswith("/media/reports/artifacts/clubs-")
+    assert resp.content == b""
+
+
+def test_per_process_cache_is_flagged_outside_debug(settings):
+    settings.DEBUG = False
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    assert [w.id for w in check_shared_cache(None)] == ["clubs.W001"]
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+    assert check_shared_cache(None) == []
@@ -0,0 +1,101 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.models import StoredReport
+from clubs.reports import get_my_reports, store_report
+from clubs.storage import LocalReportStorage, SupabaseReportStorage, get_report_storage, get_upload_queue
+
+
+class FakeBucket:
+    def __init__(self, uploads):
+        self.uploads = uploads
+
+    def upload(self, path, file, file_options):
+        if path.endswith("broken.csv"):
+            raise IOError("bucket unavailable")
+        self.uploads.append(path)
+
+
+class FakeClient:
+    def __init__(self):
+        self.uploads = []
+        self.storage = self
+
+    def from_(self, bucket):
+        return FakeBucket(self.uploads)
+
+
+@pytest.mark.django_db
+def test_local_backend_saves_and_indexes_reports(client, create_user, media_root):
+    user = create_user("student")
+    client.login(username="student", password="testpass")
+
+    resp = client.post(reverse("save_report_cloud"), {"report_type": "clubs"})
+    assert resp.status_code == 202 and resp.json()["success"] is True
+    record = StoredReport.objects.get(owner=user)
+    assert record.status == "stored" and record.backend == "local"
+    assert record.url == resp.json()["url"]
+    assert (media_root / "reports" / "stored" / record.path).read_text().startswith("Club Name")
+
+    resp = client.get(reverse("my_saved_reports"))
+    assert [r["name"] for r in resp.context["reports"]] == [record.name]
+
+
+@pytest.mark.django_db
+def test_listing_is_one_query(create_user):
+    user = create_user("student")
+    for i in range(5):
+        store_report("a,b\n", f"report_{i}.csv", user.id)
+    with CaptureQueriesContext(connection) as queries:
+        reports = get_my_reports(user.id)
+    assert len(reports) == 5 and len(queries) == 1
+
+
+@pytest.mark.django_db
+def test_same_filename_saved_twice_gets_two_paths(create_user):
+    user = create_user("student")
+    first = store_report("a,b\n", "report.csv", user.id)
+    second = store_report("a,b\n", "report.csv", user.id)
+    assert first["success"] and second["success"] and first["url"] != second["url"]
+    paths = list(StoredReport.objects.values_list("path", flat=True))
+    assert len(set(paths)) == 2
+    assert all(p.startswith(f"student_{user.id}/") and p.endswith("/report.csv") for p in paths)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_remote_backend_uploads_in_background(create_user, settings):
+    user = create_user("student")
+    settings.REPORT_STORAGE_BACKEND = "supabase"
+    settings.SUPABASE_URL = "https://project.supabase.co/"
+    settings.REPORT_UPLOADS_EAGER = False
+    settings.REPORT_UPLOAD_BACKOFF = 0
+    fake = FakeClient()
+    backend = get_report_storage()
+    assert isinstance(backend, SupabaseReportStorage)
+    backend._client_factory = lambda: fake
+
+    results = [store_report("a,b\n", name, user.id) for name in ("one.csv", "two.csv", "broken.csv")]
+    # The request only queues the upload; the URL is known up front
+    assert all(r["status"] == "pending" for r in results)
+    one = StoredReport.objects.get(name="one.csv")
+    assert results[0]["url"] == (
+        f"https://project.supabase.co/storage/v1/object/public/student-reports/{one.path}"
+    )
+
+    get_upload_queue().flush()
+    assert sorted(fake.uploads) == sorted(
+        StoredReport.objects.filter(name__in=["one.csv", "two.csv"]).values_list("path", flat=True)
+    )
+    statuses = dict(StoredReport.objects.values_list("name", "status"))
+    assert statuses == {"one.csv": "stored", "two.csv": "stored", "broken.csv": "failed"}
+    assert [r["name"] for r in get_my_reports(user.id)] == ["two.csv", "one.csv"]
+
+
+def test_local_backend_refuses_paths_outside_its_directory(tmp_path):
+    storage = LocalReportStorage(location=tmp_path / "stored", base_url="/stub/")
+    with pytest.raises(ValueError):
+        storage.upload("student_1/../../escaped.csv", b"a,b\n", "text/csv")
+    assert not (tmp_path / "escaped.csv").exists()
+    storage.upload("student_1/ok.csv", b"a,b\n", "text/csv")
+    assert (tmp_path / "stored" / "student_1" / "ok.csv").read_bytes() == b"a,b\n"
@@ -0,0 +1,183 @@
+import time
+from datetime import timedelta
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from clubs.models import Club, ClubActivityRollup, ClubPost, Event, Poll, PollOption
+from clubs.rollups import (
+    activity_by_club, activity_totals, backfill_rollups, bucket_start, get_activity_buffer, record_activity,
+)
+from users.awards import award_points_in_bulk
+from users.models import Profile, StudentPoints
+
+
+@pytest.fixture
+def make_user(django_user_model):
+    # No passwords: they never log in, and hashing dominates the test time
+    return lambda username: django_user_model.objects.create_user(username=username)
+
+
+def rollup(club, period, **filters):
+    row = ClubActivityRollup.objects.filter(club=club, period=period, **filters).values(
+        "posts", "votes", "rsvps", "joins", "points"
+    )
+    return dict(row.get())
+
+
+@pytest.mark.django_db
+def test_signals_fill_hour_and_day_rows(make_user):
+    club = Club.objects.create(name="Chess")
+    lecturer = make_user("lecturer")
+    students = [make_user(f"s{i}") for i in range(3)]
+
+    club.members.add(*students)
+    ClubPost.objects.create(club=club, author=lecturer, content="Hello")
+    ClubPost.objects.create(club=club, author=lecturer, content="Again")
+    poll = Poll.objects.create(club=club, question="Day?", created_by=lecturer)
+    option = PollOption.objects.create(poll=poll, text="Monday")
+    option.votes.add(students[0], students[1])
+    students[2].poll_votes.add(option)
+    event = Event.objects.create(club=club, name="Open", description="", date=timezone.now().date())
+    event.attendees.add(*students[:2])
+    StudentPoints.objects.create(student=students[0], club=club, points=15, reason="Win", awarded_by=lecturer)
+
+    expected = {"posts": 2, "votes": 3, "rsvps": 2, "joins": 3, "points": 15}
+    assert rollup(club, "hour") == expected
+    assert rollup(club, "day") == expected
+    assert ClubActivityRollup.objects.get(club=club, period="day").bucket == bucket_start(timezone.now(), "day")
+
+    # Counts are of things that happened: removals don't take them back
+    club.members.remove(students[0])
+    option.votes.clear()
+    assert rollup(club, "day") == expected
+
+
+@pytest.mark.django_db
+def test_record_activity_buckets_by_hour_and_day():
+    club = Club.objects.create(name="Chess")
+    morning = timezone.now().replace(hour=9, minute=30) - timedelta(days=2)
+    record_activity(club.id, morning, posts=1)
+    record_activity(club.id, morning.replace(hour=14), posts=2, points=5)
+    record_activity(club.id, timezone.now(), posts=4)
+
+    assert ClubActivityRollup.objects.filter(period="hour").count() == 3
+    assert ClubActivityRollup.objects.filter(period="day").count() == 2
+    assert rollup(club, "day", bucket=bucket_start(morning, "day"))["posts"] == 3
+    assert activity_totals(morning)["posts"] == 7
+    assert activity_totals(timezone.now() - timedelta(days=1)) == {
+        "posts": 4, "votes": 0, "rsvps": 0, "joins": 0, "points": 0,
+    }
+    assert activity_by_club(morning)[club.id]["points"] == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_votes_are_written_to_rollups_in_the_background(make_user, settings):
+    settings.ROLLUPS_EAGER = False
+    settings.ROLLUP_FLUSH_INTERVAL = 0.05
+    club = Club.objects.create(name="Chess")
+    lecturer = make_user("lecturer")
+    option = PollOption.objects.create(poll=Poll.objects.create(club=club, question="Day?", created_by=lecturer),
+                                       text="Monday")
+    students = [make_user(f"s{i}") for i in range(20)]
+    get_activity_buffer().flush()
+
+    with CaptureQueriesContext(connection) as queries:
+        for student in students:
+            option.votes.add(student)
+        # A vote that is rolled back is not counted
+        with transaction.atomic():
+            option.votes.add(lecturer)
+            transaction.set_rollback(True)
+    assert not any("clubs_clubactivityrollup" in q["sql"] for q in queries.captured_queries)
+
+    deadline = time.monotonic() + 5
+    while not ClubActivityRollup.objects.filter(club=club, period="day", votes=20).exists():
+        assert time.monotonic() < deadline, "rollups were not written"
+        time.sleep(0.02)
+    assert rollup(club, "hour")["votes"] == 20
+
+
+@pytest.mark.django_db
+def test_bulk_award_records_points(make_user):
+    club = Club.objects.create(name="Chess")
+    lecturer = make_user("lecturer")
+    students = [make_user(f"s{i}") for i in range(4)]
+    Profile.objects.bulk_create([Profile(user=s, role="student") for s in students])
+    club.members.add(*students)
+
+    award_points_in_bulk(club, lecturer, 10, "Tournament", [s.id for s in students], "members")
+
+    assert rollup(club, "hour")["points"] == 40
+    assert rollup(club, "day")["points"] == 40
+
+
+@pytest.mark.django_db
+def test_backfill_matches_signals_and_keeps_joins(make_user):
+    club = Club.objects.create(name="Chess")
+    lecturer = make_user("lecturer")
+    student = make_user("student")
+    club.members.add(student)
+    ClubPost.objects.create(club=club, author=lecturer, content="Hello")
+    option = PollOption.objects.create(
+        poll=Poll.objects.create(club=club, question="Day?", created_by=lecturer), text="Monday"
+    )
+    option.votes.add(student)
+    StudentPoints.objects.create(student=student, club=club, points=5, reason="Win", awarded_by=lecturer)
+    live = {period: rollup(club, period) for period in ("hour", "day")}
+
+    ClubActivityRollup.objects.update(posts=0, votes=0, points=0)
+    assert backfill_rollups() == 2
+
+    assert {period: rollup(club, period) for period in ("hour", "day")} == live
+
+
+@pytest.mark.django_db
+def test_backfill_dates_rsvps_by_event_day(make_user):
+    club = Club.objects.create(name="Chess")
+    day = timezone.localdate() - timedelta(days=3)
+    event = Event.objects.create(club=club, name="Open", description="", date=day)
+    event.attendees.add(make_user("student"))
+    ClubActivityRollup.objects.all().delete()
+
+    backfill_rollups()
+
+    row = ClubActivityRollup.objects.get(club=club, period="day")
+    assert (timezone.localtime(row.bucket).date(), row.rsvps) == (day, 1)
+
+
+@pytest.mark.django_db
+def test_prune_hourly_keeps_day_rows():
+    club = Club.objects.create(name="Chess")
+    record_activity(club.id, timezone.now() - timedelta(days=10), posts=1)
+    record_activity(club.id, timezone.now(), posts=1)
+
+    call_command("backfill_activity_rollups", "--prune-hourly", "7")
+
+    assert ClubActivityRollup.objects.filter(period="hour").count() == 1
+    assert ClubActivityRollup.objects.filter(period="day").count() == 2
+
+
+@pytest.mark.django_db
+def test_reports_read_rollups(client, create_user):
+    lecturer = create_user("lecturer")
+    Profile.objects.create(user=lecturer, role="lecturer")
+    club = Club.objects.create(name="Chess")
+    ClubPost.objects.create(club=club, author=lecturer, content="Today")
+    record_activity(club.id, timezone.now() - timedelta(days=3), posts=1, votes=2)
+    client.login(username="lecturer", password="testpass")
+
+    resp = client.get(reverse("reports"))
+    assert resp.status_code == 200
+    [row] = resp.context["club_activity"]
+    assert (row["club"], row["posts"], row["votes"]) == (club, 2, 2)
+    assert len(resp.context["daily_activity"]) == 2
+
+    # Post counts are of posts that still exist, so they come from ClubPost
+    old = ClubPost.objects.create(club=club, author=lecturer, content="Old")
+    ClubPost.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=3))
+    ClubPost.objects.create(club=club, author=lecturer, content="Deleted").delete()
+    resp = client.get(reverse("manage_posts"))
+    assert (resp.context["today_posts"], resp.context["week_posts"]) == (1, 2)
@@ -0,0 +1,75 @@
+import pytest
+from django.db import OperationalError, connection, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from clubs.sqlite import retry_on_locked
+from users.management.commands.benchmark_sqlite_writes import run_write_benchmark
+
+
+def flaky(failures, message="database is locked"):
+    calls = []
+
+    def write():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise OperationalError(message)
+        return "ok"
+
+    return write, calls
+
+
+@pytest.mark.django_db
+def test_tuning_profile_applies_pragmas(settings, tmp_path):
+    settings.SQLITE_TUNING = True
+    settings.SQLITE_BUSY_TIMEOUT = 2500
+    db = DatabaseWrapper({**connection.settings_dict, "NAME": str(tmp_path / "tuned.sqlite3")})
+    try:
+        with db.cursor() as cursor:
+            pragmas = {
+                name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size")
+            }
+    finally:
+        db.close()
+    # synchronous: 1 = NORMAL
+    assert pragmas == {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 2500, "cache_size": -32768}
+
+
+@pytest.mark.django_db
+def test_profile_is_off_by_default(tmp_path):
+    db = DatabaseWrapper({**connection.settings_dict, "NAME": str(tmp_path / "plain.sqlite3")})
+    try:
+        with db.cursor() as cursor:
+            assert cursor.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        db.close()
+
+
+def test_locked_writes_are_retried():
+    write, calls = flaky(2)
+    assert retry_on_locked(write, backoff=0)() == "ok"
+    assert len(calls) == 3
+
+
+def test_retries_give_up_and_skip_other_errors():
+    write, calls = flaky(10)
+    with pytest.raises(OperationalError):
+        retry_on_locked(write, attempts=3, backoff=0)()
+    assert len(calls) == 3
+
+    write, calls = flaky(1, message="no such table: clubs_club")
+    with pytest.raises(OperationalError):
+        retry_on_locked(write, backoff=0)()
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_no_retry_inside_a_transaction():
+    write, calls = flaky(1)
+    with pytest.raises(OperationalError), transaction.atomic():
+        retry_on_locked(write, backoff=0)()
+    assert len(calls) == 1
+
+
+def test_tuned_writers_do_not_hit_locks(tmp_path):
+    result = run_write_benchmark(str(tmp_path / "bench.sqlite3"), tuned=True, writers=4, writes=25)
+    assert result["writes"] == 100 and result["errors"] == 0
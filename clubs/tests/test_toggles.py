@@ -0,0 +1,99 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from clubs.cache import get_club_version
+from clubs.models import Club, Event, IdempotencyKey
+from clubs.toggles import toggle_club_membership, toggle_event_rsvp, run_idempotent, ATTENDING, NOT_ATTENDING
+from users.models import Profile
+
+
+@pytest.fixture
+def student(create_user):
+    user = create_user("student")
+    Profile.objects.create(user=user, role="student", name="Student")
+    return user
+
+
+def membership_rows(club, user):
+    return Club.members.through.objects.filter(club=club, user=user).count()
+
+
+@pytest.mark.django_db
+def test_toggle_joins_then_leaves_and_bumps_club_version(club, student, django_capture_on_commit_callbacks):
+    before = get_club_version(club.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert toggle_club_membership(club, student) is True
+    assert membership_rows(club, student) == 1
+    assert get_club_version(club.id) != before
+
+    before = get_club_version(club.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert toggle_club_membership(club, student) is False
+    assert membership_rows(club, student) == 0
+    assert get_club_version(club.id) != before
+
+
+@pytest.mark.django_db
+def test_rsvp_toggle(club, student):
+    event = Event.objects.create(club=club, name="Meetup", description="", date=timezone.now().date())
+    assert toggle_event_rsvp(event, student) == ATTENDING
+    assert list(event.attendees.all()) == [student]
+    assert toggle_event_rsvp(event, student) == NOT_ATTENDING
+    assert not event.attendees.exists()
+
+
+@pytest.mark.django_db
+def test_same_idempotency_key_toggles_once(club, student):
+    def toggle():
+        return {"joined": toggle_club_membership(club, student)}
+
+    first, replayed = run_idempotent(student, "club:membership", "tap-1", toggle)
+    assert first == {"joined": True} and not replayed
+    second, replayed = run_idempotent(student, "club:membership", "tap-1", toggle)
+    assert second == {"joined": True} and replayed
+    assert membership_rows(club, student) == 1
+
+    # A new key is a new tap
+    third, _ = run_idempotent(student, "club:membership", "tap-2", toggle)
+    assert third == {"joined": False}
+
+
+@pytest.mark.django_db
+def test_api_toggle_replays_retried_request(club, student):
+    api = APIClient()
+    api.force_authenticate(student)
+    url = reverse("club-toggle-membership", args=[club.id])
+
+    first = api.post(url, HTTP_IDEMPOTENCY_KEY="abc")
+    retry = api.post(url, HTTP_IDEMPOTENCY_KEY="abc")
+    assert first.status_code == retry.status_code == 200
+    assert first.data == retry.data and first.data["joined"] is True
+    assert retry["Idempotent-Replayed"] == "true"
+    assert membership_rows(club, student) == 1
+    assert IdempotencyKey.objects.filter(user=student).count() == 1
+
+
+@pytest.mark.django_db
+def test_html_rsvp_uses_idempotency_key(client, club, student):
+    event = Event.objects.create(club=club, name="Meetup", description="", date=timezone.now().date())
+    client.login(username="student", password="testpass")
+    url = reverse("rsvp_event", args=[event.id])
+    client.post(url, {"idempotency_key": "form-1"})
+    client.post(url, {"idempotency_key": "form-1"})
+    assert list(event.attendees.all()) == [student]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_toggles_never_duplicate_rows(club, student, run_concurrently):
+    """Fire several taps at once: some share a key (retries), the rest are new."""
+    keys = ["a", "a", "a", "b", "c"]
+
+    def toggle(key):
+        return run_idempotent(student, "club:membership", key, lambda: {"joined": toggle_club_membership(club, student)})
+
+    run_concurrently(toggle, [(key,) for key in keys])
+
+    # Three distinct taps: join, leave, join
+    assert membership_rows(club, student) == 1
+    assert IdempotencyKey.objects.filter(user=student).count() == 3
@@ -0,0 +1,119 @@
+import io
+import threading
+import time
+from datetime import timedelta
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from clubs import storage
+from clubs.models import StoredReport
+from clubs.reports import get_my_reports
+from clubs.storage import LocalReportStorage, UploadQueue
+
+
+class FlakyStorage(LocalReportStorage):
+    """Filesystem stand-in for a remote bucket that fails the first few uploads."""
+
+    def __init__(self, location, failures):
+        super().__init__(location=location, base_url="/stub/")
+        self.failures = failures
+        self.calls = 0
+
+    def upload(self, path, content, content_type):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("storage endpoint timed out")
+        super().upload(path, content, content_type)
+
+
+class SlowStorage(LocalReportStorage):
+    def __init__(self, location):
+        super().__init__(location=location, base_url="/stub/")
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def upload(self, path, content, content_type):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        super().upload(path, content, content_type)
+        with self.lock:
+            self.active -= 1
+
+
+def make_record(user, name):
+    return StoredReport.objects.create(owner=user, name=name, path=f"u{user.id}/{name}", backend="stub", url=name)
+
+
+@pytest.mark.django_db
+def test_save_returns_202_with_pollable_job(client, create_user):
+    create_user("student")
+    create_user("other")
+    client.login(username="student", password="testpass")
+
+    resp = client.post(reverse("save_report_cloud"), {"report_type": "events"})
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job["status_url"] == reverse("report_upload_status", args=[job["job_id"]])
+
+    status = client.get(job["status_url"]).json()
+    assert status["status"] == "stored" and status["attempts"] == 1 and status["url"] == job["url"]
+
+    client.login(username="other", password="testpass")
+    assert client.get(job["status_url"]).status_code == 404
+
+
+@pytest.mark.django_db
+def test_failed_upload_retries_with_exponential_backoff(create_user, tmp_path, monkeypatch):
+    user = create_user("student")
+    delays = []
+    monkeypatch.setattr(storage.time, "sleep", delays.append)
+    uploads = UploadQueue(max_attempts=4, backoff=0.5, eager=True)
+
+    record = make_record(user, "flaky.csv")
+    uploads.submit(FlakyStorage(tmp_path, failures=2), record, b"a,b\n")
+    assert (record.status, record.attempts) == ("stored", 3)
+    assert delays == [0.5, 1.0]
+    assert (tmp_path / record.path).read_bytes() == b"a,b\n"
+
+    record = make_record(user, "down.csv")
+    uploads.submit(FlakyStorage(tmp_path, failures=10), record, b"a,b\n")
+    assert (record.status, record.attempts) == ("failed", 4)
+    assert "timed out" in record.error
+
+
+@pytest.mark.django_db(transaction=True)
+def test_queue_bounds_concurrent_uploads(create_user, tmp_path):
+    user = create_user("student")
+    slow = SlowStorage(tmp_path)
+    uploads = UploadQueue(workers=2, batch_size=1)
+
+    records = [make_record(user, f"r{i}.csv") for i in range(6)]
+    for record in records:
+        uploads.submit(slow, record, b"a,b\n")
+    uploads.flush()
+
+    assert slow.peak <= 2
+    assert set(StoredReport.objects.values_list("status", flat=True)) == {"stored"}
+
+
+@pytest.mark.django_db
+def test_uploads_lost_in_a_restart_are_marked_failed(client, create_user, settings):
+    settings.REPORT_UPLOAD_TIMEOUT = 600
+    user = create_user("student")
+    client.login(username="student", password="testpass")
+    # Queued by a process that has since gone; nothing will ever upload it
+    lost = make_record(user, "lost.csv")
+    StoredReport.objects.filter(pk=lost.pk).update(created_at=timezone.now() - timedelta(minutes=11))
+    fresh = make_record(user, "fresh.csv")
+
+    status = client.get(reverse("report_upload_status", args=[lost.pk])).json()
+    assert status["status"] == "failed" and status["error"] == storage.STALE_UPLOAD_ERROR
+    assert client.get(reverse("report_upload_status", args=[fresh.pk])).json()["status"] == "pending"
+    assert [r["name"] for r in get_my_reports(user.id)] == ["fresh.csv"]
+
+    call_command("expire_report_uploads", stdout=io.StringIO())
+    statuses = dict(StoredReport.objects.values_list("name", "status"))
+    assert statuses == {"lost.csv": "failed", "fresh.csv": "pending"}
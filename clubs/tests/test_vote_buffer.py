@@ -0,0 +1,130 @@
+import pytest
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.urls import reverse
+from rest_framework.test import APIClient
+from clubs.cache import get_poll_tally_version
+from clubs.models import Club, ClubActivityRollup, PendingVote, Poll, PollOption
+from clubs.votes import VoteFlusher, flush_votes, get_vote_flusher, has_voted, submit_vote
+from users.management.commands.benchmark_votes import run_vote_benchmark
+
+
+@pytest.fixture
+def poll(create_user):
+    club = Club.objects.create(name="Lecture")
+    poll = Poll.objects.create(club=club, question="Answer?", created_by=create_user("lecturer"))
+    for text in ("A", "B"):
+        PollOption.objects.create(poll=poll, text=text)
+    return poll
+
+
+@pytest.fixture
+def no_flusher(monkeypatch):
+    """Keep buffered votes in the log until the test flushes them itself."""
+    monkeypatch.setattr(VoteFlusher, "wake", lambda self: None)
+
+
+def tallies(poll):
+    return [option.votes.count() for option in poll.options.order_by("id")]
+
+
+@pytest.mark.django_db
+def test_buffered_votes_are_logged_then_flushed_in_one_batch(poll, no_flusher, django_capture_on_commit_callbacks):
+    a, b = poll.options.order_by("id")
+    # No passwords: they never log in, and hashing dominates the test time
+    voters = User.objects.bulk_create([User(username=f"s{i}") for i in range(6)])
+    version = get_poll_tally_version(poll.id)
+
+    assert all(submit_vote(a if i % 3 else b, voter, buffered=True) for i, voter in enumerate(voters))
+    # Accepted but not counted yet; a second vote is refused either way
+    assert tallies(poll) == [0, 0]
+    assert has_voted(poll.id, voters[0].id)
+    assert not submit_vote(a, voters[0], buffered=True)
+    assert not submit_vote(b, voters[0], buffered=False)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert flush_votes() == 6
+        # Caches and rollups hear of the batch only once it commits
+        assert get_poll_tally_version(poll.id) == version
+        assert not ClubActivityRollup.objects.filter(club=poll.club).exists()
+    assert tallies(poll) == [4, 2]
+    assert not PendingVote.objects.filter(flushed_at__isnull=True).exists()
+    assert get_poll_tally_version(poll.id) != version
+    assert ClubActivityRollup.objects.get(club=poll.club, period="day").votes == 6
+    assert flush_votes() == 0
+
+    # Counted votes still block a second one
+    assert not submit_vote(b, voters[1], buffered=True)
+
+
+@pytest.mark.django_db
+def test_flush_takes_at_most_a_batch(poll, no_flusher):
+    option = poll.options.first()
+    for voter in User.objects.bulk_create([User(username=f"s{i}") for i in range(5)]):
+        submit_vote(option, voter, buffered=True)
+
+    assert [flush_votes(batch_size=2) for _ in range(4)] == [2, 2, 1, 0]
+    assert option.votes.count() == 5
+
+
+@pytest.mark.django_db
+def test_vote_view_and_api_in_buffered_mode(client, poll, create_user, settings, no_flusher):
+    settings.VOTE_BUFFERING = True
+    a, b = poll.options.order_by("id")
+    student = create_user("student")
+    client.force_login(student)
+    url = reverse("vote_poll", args=[poll.id])
+
+    client.post(url, {"option": a.id})
+    resp = client.post(url, {"option": b.id})
+    assert "already voted" in str(list(get_messages(resp.wsgi_request))[-1])
+    assert list(PendingVote.objects.values_list("user__username", "option_id")) == [("student", a.id)]
+
+    other = PollOption.objects.create(
+        poll=Poll.objects.create(club=poll.club, question="Other?", created_by=student), text="C"
+    )
+    assert client.post(url, {"option": other.id}).status_code == 404
+
+    api = APIClient()
+    api.force_authenticate(create_user("student2"))
+    vote_url = reverse("poll-vote", args=[poll.id])
+    assert api.post(vote_url, {"option": b.id}).status_code == 202
+    assert api.post(vote_url, {"option": b.id}).status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_background_flusher_counts_buffered_votes(poll):
+    option = poll.options.first()
+    flusher = VoteFlusher(interval=0.01)
+    for voter in User.objects.bulk_create([User(username=f"s{i}") for i in range(3)]):
+        PendingVote.objects.create(poll=poll, option=option, user=voter)
+
+    flusher.wake()
+    # Returns once the thread has flushed and ended; reading the tallies while
+    # it writes would trip the shared in-memory database's table locks
+    flusher.stop()
+    assert option.votes.count() == 3
+
+    # A stopped flusher starts again on the next vote
+    PendingVote.objects.create(poll=poll, option=option, user=User.objects.create(username="late"))
+    flusher.wake()
+    flusher.stop()
+    assert option.votes.count() == 4
+
+
+@pytest.fixture
+def stop_flusher():
+    """End the process-wide flusher buffered votes start, before the test database goes."""
+    yield
+    get_vote_flusher().stop()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("buffered", [False, True])
+def test_vote_benchmark(buffered, stop_flusher):
+    result = run_vote_benchmark(voters=20, writers=2, buffered=buffered)
+
+    assert result["votes"] + result["errors"] == 20
+    assert result["tallied"] == result["votes"]
+    assert not User.objects.filter(username__startswith="vote-bench").exists()
+    assert not Club.objects.exists()
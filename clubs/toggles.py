@@ -0,0 +1,205 @@
+from datetime import timedelta
+from django.db import IntegrityError, router, transaction
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
+
+from .models import Event, EventWaitlistEntry, IdempotencyKey
+from .sqlite import retry_on_locked
+
+# -------------------------
+# ATOMIC MEMBERSHIP / RSVP TOGGLES
+# -------------------------
+# "if user in club.members.all()" loads every member to answer a yes/no
+# question, and two taps arriving together can both see "not a member" and
+# both try to join. Here the toggle is a single indexed DELETE on the
+# through table; if nothing was deleted the row is inserted instead, and the
+# unique (owner, user) index turns a racing duplicate insert into a no-op.
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+
+def _toggle(instance, field_name, user):
+    """
+    Add ``user`` to ``instance.<field_name>`` or remove them if present.
+
+    Returns True when the user ends up in the relation. m2m_changed is sent
+    the same way ``add()``/``remove()`` would, so the club page cache keeps
+    invalidating.
+    """
+    field = instance._meta.get_field(field_name)
+    through = field.remote_field.through
+    lookup = {
+        f"{field.m2m_field_name()}_id": instance.pk,
+        f"{field.m2m_reverse_field_name()}_id": user.pk,
+    }
+    using = router.db_for_write(through, instance=instance)
+
+    with transaction.atomic(using=using):
+        removed, _ = through.objects.using(using).filter(**lookup).delete()
+        if removed:
+            action, joined = "remove", False
+        else:
+            try:
+                with transaction.atomic(using=using):
+                    through.objects.using(using).create(**lookup)
+            except IntegrityError:
+                # A concurrent request inserted the same row first
+                return True
+            action, joined = "add", True
+
+        m2m_changed.send(
+            sender=through, action=f"post_{action}", instance=instance, reverse=False,
+            model=field.related_model, pk_set={user.pk}, using=using,
+        )
+    return joined
+
+
+@retry_on_locked
+def toggle_club_membership(club, user):
+    """Join or leave ``club``; returns True if the user is now a member."""
+    return _toggle(club, "members", user)
+
+
+# -------------------------
+# CAPACITY-LIMITED RSVPS
+# -------------------------
+# An RSVP locks the event row (SELECT ... FOR UPDATE), so concurrent RSVPs
+# for the same event queue up behind one another while other events are
+# unaffected. Under the lock the capacity check reads the denormalized
+# attendee_total instead of counting attendees, and each change is one
+# insert/delete plus one counter update on the already-locked row.
+
+ATTENDING = "attending"
+WAITLISTED = "waitlisted"
+NOT_ATTENDING = "not_attending"
+
+
+def _send_attendees_changed(event, action, user_ids, using):
+    m2m_changed.send(
+        sender=Event.attendees.through, action=action, instance=event, reverse=False,
+        model=Event.attendees.field.related_model, pk_set=set(user_ids), using=using,
+        counter_updated=True,
+    )
+
+
+def _promote_from_waitlist(event, using):
+    """Move waitlisted users into free places on a locked ``event``; returns their ids."""
+    if event.capacity is None:
+        free = None
+    else:
+        free = event.capacity - event.attendee_total
+        if free <= 0:
+            return []
+    entries = list(event.waitlist.using(using).order_by("created_at", "id")[:free])
+    if not entries:
+        return []
+
+    user_ids = [entry.user_id for entry in entries]
+    EventWaitlistEntry.objects.using(using).filter(pk__in=[entry.pk for entry in entries]).delete()
+    Event.attendees.through.objects.using(using).bulk_create(
+        [Event.attendees.through(event_id=event.pk, user_id=user_id) for user_id in user_ids]
+    )
+    event.attendee_total += len(user_ids)
+    return user_ids
+
+
+@retry_on_locked
+def toggle_event_rsvp(event, user):
+    """
+    RSVP to ``event``, join its waitlist when full, or cancel either.
+
+    Returns ATTENDING, WAITLISTED or NOT_ATTENDING for the user's new state.
+    Cancelling an RSVP hands the place to the longest-waiting user.
+    """
+    through = Event.attendees.through
+    using = router.db_for_write(Event, instance=event)
+
+    with transaction.atomic(using=using):
+        locked = (
+            Event.objects.using(using).select_for_update()
+            .only("id", "club_id", "capacity", "attendee_total").get(pk=event.pk)
+        )
+        removed, _ = through.objects.using(using).filter(event_id=locked.pk, user_id=user.pk).delete()
+        if removed:
+            locked.attendee_total -= 1
+            promoted = _promote_from_waitlist(locked, using)
+            status = NOT_ATTENDING
+        elif EventWaitlistEntry.objects.using(using).filter(event_id=locked.pk, user_id=user.pk).delete()[0]:
+            return NOT_ATTENDING
+        elif locked.is_full():
+            EventWaitlistEntry.objects.using(using).create(event_id=locked.pk, user_id=user.pk)
+            return WAITLISTED
+        else:
+            through.objects.using(using).create(event_id=locked.pk, user_id=user.pk)
+            locked.attendee_total += 1
+            promoted = []
+            status = ATTENDING
+
+        Event.objects.using(using).filter(pk=locked.pk).update(attendee_total=locked.attendee_total)
+        if status == ATTENDING:
+            _send_attendees_changed(locked, "post_add", [user.pk], using)
+        else:
+            _send_attendees_changed(locked, "post_remove", [user.pk], using)
+        if promoted:
+            _send_attendees_changed(locked, "post_add", promoted, using)
+
+    event.attendee_total = locked.attendee_total
+    return status
+
+
+def fill_event_from_waitlist(event):
+    """Promote waitlisted users after an event's capacity was raised or removed."""
+    using = router.db_for_write(Event, instance=event)
+    with transaction.atomic(using=using):
+        locked = (
+            Event.objects.using(using).select_for_update()
+            .only("id", "club_id", "capacity", "attendee_total").get(pk=event.pk)
+        )
+        promoted = _promote_from_waitlist(locked, using)
+        if promoted:
+            Event.objects.using(using).filter(pk=locked.pk).update(attendee_total=locked.attendee_total)
+            _send_attendees_changed(locked, "post_add", promoted, using)
+    event.attendee_total = locked.attendee_total
+    return promoted
+
+
+@retry_on_locked
+def cast_vote(option, user):
+    """Record ``user``'s vote for a poll ``option``."""
+    option.votes.add(user)
+
+
+@retry_on_locked
+def run_idempotent(user, endpoint, key, action):
+    """
+    Run ``action()`` once per (user, endpoint, key) and return its result.
+
+    ``action`` must return a JSON-serialisable dict. A retry with the same
+    key gets the stored dict back without running ``action`` again; without
+    a key the action simply runs. Returns ``(result, replayed)``.
+    """
+    if not key:
+        return action(), False
+
+    with transaction.atomic():
+        IdempotencyKey.objects.filter(
+            user=user, created_at__lt=timezone.now() - IDEMPOTENCY_KEY_TTL
+        ).delete()
+        try:
+            # Claiming the key and running the action share one transaction,
+            # so a concurrent retry waits on the unique index and then replays.
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(user=user, endpoint=endpoint, key=key[:255])
+        except IntegrityError:
+            record = IdempotencyKey.objects.get(user=user, endpoint=endpoint, key=key[:255])
+            return record.response, True
+
+        result = action()
+        record.response = result
+        record.save(update_fields=["response"])
+    return result, False
+
+
+def idempotency_key(request):
+    """Client-supplied key from the Idempotency-Key header or a form field."""
+    return request.headers.get("Idempotency-Key") or request.POST.get("idempotency_key")
@@ -1,6 +1,7 @@
 from django.urls import path
 from django.contrib.auth import views as auth_views
 from . import views
+from .lazy import lazy_view
 
 urlpatterns = [
     # ============================================
@@ -29,6 +30,8 @@ urlpatterns = [
     # POLL & EVENT VIEWS
     # ============================================
     path('polls/<int:poll_id>/vote/', views.vote_poll, name='vote_poll'),
+    path('polls/<int:poll_id>/results/stream/', views.poll_results_stream, name='poll_results_stream'),
+    path('polls/<int:poll_id>/close/', views.close_poll_view, name='close_poll'),
     path('polls/create/', views.create_poll, name='create_poll'),
     path('events/<int:event_id>/rsvp/', views.rsvp_event, name='rsvp_event'),
     
@@ -46,54 +49,55 @@ urlpatterns = [
     # ============================================
     # STUDENT REPORTS - CSV DOWNLOADS & CLOUD SAVE
     # ============================================
-    path('student/reports/download/clubs/', views.download_my_clubs, name='download_my_clubs'),
-    path('student/reports/download/events/', views.download_my_events, name='download_my_events'),
-    path('student/reports/download/grades/', views.download_my_grades, name='download_my_grades'),
-    path('student/reports/save-cloud/', views.save_report_cloud, name='save_report_cloud'),
-    path('student/reports/saved/', views.my_saved_reports, name='my_saved_reports'),
+    path('student/reports/download/clubs/', lazy_view("clubs.report_views.download_my_clubs"), name='download_my_clubs'),
+    path('student/reports/download/events/', lazy_view("clubs.report_views.download_my_events"), name='download_my_events'),
+    path('student/reports/download/grades/', lazy_view("clubs.report_views.download_my_grades"), name='download_my_grades'),
+    path('student/reports/save-cloud/', lazy_view("clubs.report_views.save_report_cloud", asynchronous=True), name='save_report_cloud'),
+    path('student/reports/saved/', lazy_view("clubs.report_views.my_saved_reports", asynchronous=True), name='my_saved_reports'),
+    path('reports/uploads/<int:job_id>/', lazy_view("clubs.report_views.report_upload_status", asynchronous=True), name='report_upload_status'),
     
     # ============================================
     # LECTURER REPORTS - PDF DOWNLOADS
     # ============================================
     path('lecturer/reports/download/clubs/', 
-         views.download_clubs_report, 
+         lazy_view("clubs.report_views.download_clubs_report"), 
          name='download_clubs_report'),
     
     path('lecturer/reports/download/students/', 
-         views.download_students_report, 
+         lazy_view("clubs.report_views.download_students_report"), 
          name='download_students_report'),
     
     path('lecturer/reports/download/events/', 
-         views.download_events_report, 
+         lazy_view("clubs.report_views.download_events_report"), 
          name='download_events_report'),
     
     path('lecturer/reports/download/polls/', 
-         views.download_polls_report, 
+         lazy_view("clubs.report_views.download_polls_report"), 
          name='download_polls_report'),
     
     path('lecturer/reports/download/grades/', 
-         views.download_grades_report, 
+         lazy_view("clubs.report_views.download_grades_report"), 
          name='download_grades_report'),
     
     path('lecturer/reports/download/engagement/', 
-         views.download_engagement_report, 
+         lazy_view("clubs.report_views.download_engagement_report"), 
          name='download_engagement_report'),
     
     # ============================================
     # LECTURER CLOUD SAVE & MANAGEMENT
     # ============================================
     path('lecturer/reports/save-cloud/', 
-         views.lecturer_save_report_cloud, 
+         lazy_view("clubs.report_views.lecturer_save_report_cloud", asynchronous=True), 
          name='lecturer_save_report_cloud'),
     
     path('lecturer/reports/saved/', 
-         views.lecturer_saved_reports, 
+         lazy_view("clubs.report_views.lecturer_saved_reports", asynchronous=True), 
          name='lecturer_saved_reports'),
     
     # ============================================
     # LECTURER DATA EXPORT
     # ============================================
     path('lecturer/reports/export-all/', 
-         views.export_all_data, 
+         lazy_view("clubs.report_views.export_all_data"), 
          name='export_all_data'),
 ]
\ No newline at end of file
@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import IntegrityError, connection, router, transaction
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import PendingVote, PollOption
+from .sqlite import retry_on_locked
+from .toggles import cast_vote
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# BUFFERED (WRITE-BEHIND) VOTING
+# -------------------------
+# In a poll launched to a full lecture, hundreds of votes land on the same
+# few options within seconds. With VOTE_BUFFERING on, a vote is a single
+# insert into the PendingVote log, whose unique (poll, user) index turns a
+# second vote into an IntegrityError, and the student gets an answer at
+# once. A flusher thread in each process folds the log into
+# PollOption.votes: VOTE_FLUSH_INTERVAL seconds after the first new vote,
+# up to VOTE_FLUSH_BATCH votes per transaction. Once that commits it sends
+# one m2m_changed per option, so the club page cache, live tallies and
+# activity rollups update once per batch rather than once per vote.
+#
+# Tallies trail the votes by about the flush interval. Flushed rows stay in
+# the log with flushed_at set.
+
+VOTE_FLUSH_INTERVAL = 0.5
+VOTE_FLUSH_BATCH = 500
+# Seconds between checks while idle, to pick up votes another process left
+VOTE_FLUSH_IDLE = 5
+
+
+def buffering_enabled():
+    return getattr(settings, "VOTE_BUFFERING", False)
+
+
+def _counted_vote(poll_id, user_id):
+    return PollOption.votes.through.objects.filter(polloption__poll_id=poll_id, user_id=user_id)
+
+
+def has_voted(poll_id, user_id):
+    """True if the user has voted in the poll, whether counted yet or still buffered."""
+    return (
+        _counted_vote(poll_id, user_id).exists()
+        or PendingVote.objects.filter(poll_id=poll_id, user_id=user_id).exists()
+    )
+
+
+@retry_on_locked
+def buffer_vote(option, user):
+    """Log a vote for the flusher; returns False if the user already voted in the poll."""
+    if _counted_vote(option.poll_id, user.pk).exists():
+        return False
+    try:
+        with transaction.atomic():
+            PendingVote.objects.create(poll_id=option.poll_id, option=option, user=user)
+    except IntegrityError:
+        # Already in the log (an earlier vote, or a double tap racing this one)
+        return False
+    transaction.on_commit(get_vote_flusher().wake)
+    return True
+
+
+def submit_vote(option, user, buffered=None):
+    """
+    Vote for ``option`` unless the user already voted in its poll; returns
+    True if the vote was accepted. ``buffered`` defaults to VOTE_BUFFERING.
+    """
+    if buffered is None:
+        buffered = buffering_enabled()
+    if buffered:
+        return buffer_vote(option, user)
+    if has_voted(option.poll_id, user.pk):
+        return False
+    cast_vote(option, user)
+    return True
+
+
+def _announce_votes(voters, using):
+    """Send one post_add m2m_changed per option for ``{option_id: user_ids}``."""
+    through = PollOption.votes.through
+    for option in PollOption.objects.using(using).filter(pk__in=voters):
+        m2m_changed.send(
+            sender=through, action="post_add", instance=option, reverse=False,
+            model=PollOption.votes.field.related_model, pk_set=voters[option.pk], using=using,
+        )
+
+
+@retry_on_locked
+def flush_votes(batch_size=VOTE_FLUSH_BATCH, poll_id=None):
+    """
+    Add up to ``batch_size`` buffered votes (all polls', or one poll's) to the
+    tallies; returns how many were flushed.
+    """
+    through = PollOption.votes.through
+    using = router.db_for_write(through)
+    with transaction.atomic(using=using):
+        # Concurrent flushers (one per worker) take disjoint batches where the
+        # database supports SKIP LOCKED; elsewhere writers are serialized anyway
+        pending = PendingVote.objects.using(using).select_for_update(skip_locked=True).filter(
+            flushed_at__isnull=True
+        )
+        if poll_id is not None:
+            pending = pending.filter(poll_id=poll_id)
+        pending = list(pending.order_by("id").values_list("id", "option_id", "user_id")[:batch_size])
+        if not pending:
+            return 0
+        through.objects.using(using).bulk_create(
+            [through(polloption_id=option_id, user_id=user_id) for _, option_id, user_id in pending],
+            ignore_conflicts=True,
+        )
+        PendingVote.objects.using(using).filter(id__in=[pk for pk, _, _ in pending]).update(
+            flushed_at=timezone.now()
+        )
+
+        voters = defaultdict(set)
+        for _, option_id, user_id in pending:
+            voters[option_id].add(user_id)
+        # Caches and rollups follow the tallies only once the batch is in
+        transaction.on_commit(lambda: _announce_votes(voters, using), using=using)
+    return len(pending)
+
+
+class VoteFlusher:
+    """
+    Flushes the vote log from a background thread shortly after votes arrive.
+
+    The thread starts with the first buffered vote in the process. Waiting
+    ``interval`` after being woken lets a burst of votes collect into one
+    batch.
+    """
+
+    def __init__(self, interval=VOTE_FLUSH_INTERVAL, batch_size=VOTE_FLUSH_BATCH, idle=VOTE_FLUSH_IDLE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.idle = idle
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def wake(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="vote-flusher", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self):
+        """Flush what is waiting, then end the thread; the next wake() starts a new one."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopped.set()
+            self._wake.set()
+            thread.join()
+            self._thread = None
+            self._stopped.clear()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if self._wake.wait(self.idle) and not self._stopped.is_set():
+                time.sleep(self.interval)
+            self._wake.clear()
+            try:
+                while flush_votes(self.batch_size) == self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("Flushing buffered votes failed")
+            finally:
+                # This thread's connection is not closed by the request cycle
+                connection.close()
+
+
+@lru_cache(maxsize=None)
+def get_vote_flusher():
+    return VoteFlusher(
+        interval=getattr(settings, "VOTE_FLUSH_INTERVAL", VOTE_FLUSH_INTERVAL),
+        batch_size=getattr(settings, "VOTE_FLUSH_BATCH", VOTE_FLUSH_BATCH),
+    )
+
+
+@receiver(setting_changed)
+def reset_vote_flusher(setting, **kwargs):
+    if setting.startswith("VOTE_FLUSH"):
+        get_vote_flusher.cache_clear()
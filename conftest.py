@@ -0,0 +1,30 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached club fragments must not leak between tests reusing the same ids."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """Keep report artifacts out of the project's media/ folder."""
+    settings.MEDIA_ROOT = tmp_path / "media"
+    return settings.MEDIA_ROOT
+
+
+@pytest.fixture(autouse=True)
+def local_report_storage(settings):
+    """Saved reports go to MEDIA_ROOT instead of the real bucket, uploaded inline."""
+    settings.REPORT_STORAGE_BACKEND = "local"
+    settings.REPORT_UPLOADS_EAGER = True
+
+
+@pytest.fixture(autouse=True)
+def eager_rollups(settings):
+    """Activity rollups are written inline, so tests can read them straight away."""
+    settings.ROLLUPS_EAGER = True
@@ -0,0 +1,26 @@
+# gunicorn.conf.py - read by the Procfile's gunicorn command
+import os
+
+# SERVER_MODE=wsgi (default) serves student_project.wsgi on sync workers.
+# SERVER_MODE=asgi serves student_project.asgi on uvicorn workers, so the
+# async views (dashboards, saved reports, cloud saves) free the worker while
+# they wait on the database or storage. Worker count comes from
+# WEB_CONCURRENCY as usual; `manage.py loadtest` compares the two modes.
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "student_project.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "student_project.wsgi:application"
+
+
+def worker_exit(server, worker):
+    # Write the activity counts this worker still holds in memory
+    # (clubs/rollups.py) before it goes
+    from clubs.rollups import get_activity_buffer
+
+    try:
+        get_activity_buffer().flush()
+    except Exception:
+        server.log.exception("Writing activity rollups on worker exit failed")
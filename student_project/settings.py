@@ -29,6 +29,32 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
+# Where saved reports go (clubs/storage.py): "local" (MEDIA_ROOT) or
+# "supabase" (background, batched uploads to REPORT_STORAGE_BUCKET)
+REPORT_STORAGE_BACKEND = config(
+    'REPORT_STORAGE_BACKEND', default='supabase' if SUPABASE_URL and SUPABASE_KEY else 'local'
+)
+REPORT_STORAGE_BUCKET = config('REPORT_STORAGE_BUCKET', default='student-reports')
+
+# Background upload queue: concurrent uploads, attempts per file, the
+# first retry delay in seconds (doubled on each retry) and the seconds after
+# which a still-pending upload counts as lost (expire_report_uploads)
+REPORT_UPLOAD_WORKERS = config('REPORT_UPLOAD_WORKERS', default=2, cast=int)
+REPORT_UPLOAD_MAX_ATTEMPTS = config('REPORT_UPLOAD_MAX_ATTEMPTS', default=4, cast=int)
+REPORT_UPLOAD_BACKOFF = config('REPORT_UPLOAD_BACKOFF', default=0.5, cast=float)
+REPORT_UPLOAD_TIMEOUT = config('REPORT_UPLOAD_TIMEOUT', default=15 * 60, cast=int)
+
+# Buffered poll voting (clubs/votes.py): votes go to an append-only log and
+# a background flusher adds them to the tallies in batches, every
+# VOTE_FLUSH_INTERVAL seconds (at most VOTE_FLUSH_BATCH votes at a time)
+VOTE_BUFFERING = config('VOTE_BUFFERING', default=False, cast=bool)
+VOTE_FLUSH_INTERVAL = config('VOTE_FLUSH_INTERVAL', default=0.5, cast=float)
+VOTE_FLUSH_BATCH = config('VOTE_FLUSH_BATCH', default=500, cast=int)
+
+# Club activity rollups (clubs/rollups.py) are added up in memory and
+# written every ROLLUP_FLUSH_INTERVAL seconds
+ROLLUP_FLUSH_INTERVAL = config('ROLLUP_FLUSH_INTERVAL', default=2.0, cast=float)
+
 # -----------------------------
 # INSTALLED APPS
 # -----------------------------
@@ -90,6 +116,7 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # BEFORE CommonMiddleware
+    'clubs.replicas.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -116,6 +143,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'student_project.wsgi.application'
+ASGI_APPLICATION = 'student_project.asgi.application'
 
 # -----------------------------
 # DATABASE
@@ -124,8 +152,58 @@ WSGI_APPLICATION = 'student_project.wsgi.application'
 DATABASES = {
     'default': dj_database_url.config(
         default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
-        conn_max_age=600
+        conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
+        # Check a persistent connection before reusing it for a new request
+        conn_health_checks=True,
+    )
+}
+
+# Optional read replica for report and dashboard reads (clubs/replicas.py).
+# Tests mirror it onto the default database.
+if config('REPLICA_DATABASE_URL', default=''):
+    DATABASES['replica'] = dj_database_url.parse(
+        config('REPLICA_DATABASE_URL'),
+        conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
+        conn_health_checks=True,
     )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['clubs.replicas.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write something
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+# On PostgreSQL, use Django's psycopg connection pool: each worker process
+# keeps at most DB_POOL_MAX_SIZE connections open and threads borrow from
+# them. The pool replaces persistent connections, so CONN_MAX_AGE is 0.
+for database in DATABASES.values():
+    if database['ENGINE'] == 'django.db.backends.postgresql' and config('DB_POOL', default=True, cast=bool):
+        database['CONN_MAX_AGE'] = 0
+        database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            # Seconds a request waits for a free connection before failing
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+
+# Optional SQLite production profile (clubs/sqlite.py): WAL, busy_timeout,
+# larger page cache and mmap on each connection. Transactions also start
+# with BEGIN IMMEDIATE so concurrent writers wait for the lock in turn.
+SQLITE_TUNING = config('SQLITE_TUNING', default=False, cast=bool)
+SQLITE_BUSY_TIMEOUT = config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int)  # ms
+if SQLITE_TUNING and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {})['transaction_mode'] = 'IMMEDIATE'
+
+# -----------------------------
+# CACHE
+# -----------------------------
+# Local memory by default. Deployments with several gunicorn workers should
+# point CACHE_BACKEND/CACHE_LOCATION at a shared cache (e.g. Redis) so that
+# club page version bumps and the report artifact counters are seen by every
+# worker and management command (check clubs.W001 warns otherwise).
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='club-ms'),
+    }
 }
 
 # -----------------------------
@@ -161,6 +239,18 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Cached report PDFs (media/reports/artifacts/) are evicted, least recently
+# served first, beyond these limits. Set REPORT_SENDFILE_HEADER to
+# "X-Accel-Redirect" (nginx) or "X-Sendfile" (Apache) to let the web server
+# send them.
+REPORT_ARTIFACT_MAX_BYTES = config('REPORT_ARTIFACT_MAX_BYTES', default=50 * 1024 * 1024, cast=int)
+REPORT_ARTIFACT_MAX_FILES = config('REPORT_ARTIFACT_MAX_FILES', default=200, cast=int)
+REPORT_SENDFILE_HEADER = config('REPORT_SENDFILE_HEADER', default=None)
+
+# Runs of each scheduled report (users/schedules.py) kept in media/reports/;
+# older ones are deleted after each run
+REPORT_SCHEDULE_KEEP_RUNS = config('REPORT_SCHEDULE_KEEP_RUNS', default=10, cast=int)
+
 # -----------------------------
 # DEFAULT PK
 # -----------------------------
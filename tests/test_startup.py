@@ -0,0 +1,48 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+HEAVY_PACKAGES = ("reportlab", "supabase")
+FIRST_PARTY = ("clubs", "users", "api", "student_project")
+# Cumulative import time allowed for the project's own modules. Loading
+# reportlab alone costs well over this, so pulling it back into boot fails.
+IMPORT_BUDGET_US = 100_000
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def boot_imports():
+    """Run ``python -X importtime manage.py check`` and parse its timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "manage.py", "check"],
+        cwd=BASE_DIR, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    imports = []
+    for match in IMPORT_LINE.finditer(result.stderr):
+        _, cumulative, indent, module = match.groups()
+        imports.append((module, int(cumulative), len(indent)))
+    return imports
+
+
+def test_boot_skips_heavy_dependencies_and_stays_within_budget():
+    imports = boot_imports()
+    modules = {module for module, _, _ in imports}
+
+    heavy = sorted(m for m in modules if m.split(".")[0] in HEAVY_PACKAGES)
+    assert heavy == [], f"imported at startup: {heavy[:5]}"
+    assert "clubs.report_views" not in modules
+
+    # -X importtime lists children before their parent, so walk it backwards
+    # and count each outermost project module once, children included
+    own, stack = 0, []
+    for module, cumulative, indent in reversed(imports):
+        while stack and stack[-1][1] >= indent:
+            stack.pop()
+        is_own = module.split(".")[0] in FIRST_PARTY
+        if is_own and not any(own_parent for own_parent, _ in stack):
+            own += cumulative
+        stack.append((is_own, indent))
+    assert own < IMPORT_BUDGET_US, f"project modules took {own / 1000:.0f}ms to import"
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Profile, StudentPoints, Course, StudentMark, StudentGPA
+from .models import Profile, StudentPoints, StudentPointsTotal, PointsAwardBatch, Course, StudentMark, StudentGPA, ReportSchedule, Report
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
@@ -10,11 +10,27 @@ class ProfileAdmin(admin.ModelAdmin):
 @admin.register(StudentPoints)
 class StudentPointsAdmin(admin.ModelAdmin):
     list_display = ('student', 'club', 'points', 'reason', 'awarded_by', 'awarded_at')
-    readonly_fields = ('awarded_at',)
+    readonly_fields = ('awarded_at', 'batch')
     list_filter = ('club', 'student', 'awarded_by')
     search_fields = ('student__username', 'club__name', 'reason')
 
 
+@admin.register(PointsAwardBatch)
+class PointsAwardBatchAdmin(admin.ModelAdmin):
+    list_display = ('club', 'source', 'event', 'points', 'reason', 'student_count', 'awarded_by', 'created_at')
+    readonly_fields = ('club', 'source', 'event', 'points', 'reason', 'student_count', 'awarded_by', 'created_at')
+    list_filter = ('source', 'club')
+    search_fields = ('reason', 'club__name', 'awarded_by__username')
+
+
+@admin.register(StudentPointsTotal)
+class StudentPointsTotalAdmin(admin.ModelAdmin):
+    list_display = ('student', 'club', 'total')
+    readonly_fields = ('student', 'club', 'total')
+    list_filter = ('club',)
+    search_fields = ('student__username', 'club__name')
+
+
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
     list_display = ('code', 'name', 'credit_units')
@@ -34,3 +50,18 @@ class StudentGPAAdmin(admin.ModelAdmin):
     list_display = ('student', 'gpa', 'cgpa', 'updated_at')
     readonly_fields = ('gpa', 'cgpa', 'updated_at')
     search_fields = ('student__username',)
+
+
+@admin.register(ReportSchedule)
+class ReportScheduleAdmin(admin.ModelAdmin):
+    list_display = ('report_type', 'cron', 'owner', 'enabled', 'last_run_at')
+    readonly_fields = ('last_run_at',)
+    list_filter = ('report_type', 'enabled')
+
+
+@admin.register(Report)
+class ReportAdmin(admin.ModelAdmin):
+    list_display = ('title', 'report_type', 'generated_by', 'status', 'schedule', 'created_at')
+    readonly_fields = ('created_at',)
+    list_filter = ('status', 'report_type')
+    search_fields = ('title', 'generated_by__username')
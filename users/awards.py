@@ -0,0 +1,88 @@
+import csv
+import io
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from clubs.rollups import record_activity
+from .leaderboard import add_to_totals_bulk
+from .models import PointsAwardBatch, StudentPoints
+
+# -------------------------
+# BULK POINTS AWARDS
+# -------------------------
+# One request awards the same points to a whole group: the club's members
+# (or a selection of them), an event's attendees, or the students listed in
+# a CSV. Only the club's members with a student profile can receive
+# points; lecturers and outsiders in a group are left out. The awards are
+# inserted with one bulk_create, the leaderboard totals get one update per
+# leaderboard, and a PointsAwardBatch row records who awarded what to
+# whom. It all happens in one transaction, so a batch is either awarded in
+# full or not at all.
+
+MAX_POINTS = 100
+
+
+class BulkAwardError(ValueError):
+    """The request can't be awarded as given; the message is shown to the lecturer."""
+
+
+def parse_points(value):
+    try:
+        points = int(value)
+    except (TypeError, ValueError):
+        raise BulkAwardError("Points must be a whole number.")
+    if not 1 <= points <= MAX_POINTS:
+        raise BulkAwardError(f"Points must be between 1 and {MAX_POINTS}.")
+    return points
+
+
+def club_students(club):
+    """The club's members who are students: everyone a bulk award can reach."""
+    return User.objects.filter(clubs=club, profile__role='student')
+
+
+def students_from_csv(upload, club):
+    """
+    Ids of the students listed in an uploaded CSV.
+
+    The first column of each row is a username; a header row ("username"
+    or "student") is skipped. A name that is not one of the club's
+    students fails the whole upload.
+    """
+    try:
+        text = upload.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise BulkAwardError("The CSV file must be UTF-8 text.")
+    values = [row[0].strip() for row in csv.reader(io.StringIO(text)) if row and row[0].strip()]
+    if values and values[0].lower() in ('username', 'student'):
+        values = values[1:]
+
+    names = set(values)
+    by_name = dict(club_students(club).filter(username__in=names).values_list('username', 'id'))
+    unknown = sorted(names - by_name.keys())
+    if unknown:
+        raise BulkAwardError(f"Not students of {club.name}: {', '.join(unknown[:10])}")
+    return set(by_name.values())
+
+
+def award_points_in_bulk(club, awarded_by, points, reason, student_ids, source, event=None):
+    """Award ``points`` to the club's students in ``student_ids``; returns the PointsAwardBatch."""
+    student_ids = sorted(set(club_students(club).filter(id__in=student_ids).values_list('id', flat=True)))
+    if not student_ids:
+        raise BulkAwardError("There are no students to award points to.")
+
+    with transaction.atomic():
+        batch = PointsAwardBatch.objects.create(
+            club=club, awarded_by=awarded_by, source=source, event=event,
+            points=points, reason=reason, student_count=len(student_ids),
+        )
+        # bulk_create skips the per-award post_save signal, so the totals
+        # and the activity rollup are updated here in one pass instead
+        StudentPoints.objects.bulk_create([
+            StudentPoints(student_id=sid, club=club, points=points, reason=reason,
+                          awarded_by=awarded_by, batch=batch)
+            for sid in student_ids
+        ])
+        add_to_totals_bulk(student_ids, club.id, points)
+        record_activity(club.id, batch.created_at, points=points * len(student_ids))
+    return batch
@@ -0,0 +1,172 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+
+from .models import StudentPoints, StudentPointsTotal
+
+# -------------------------
+# STUDENT POINTS LEADERBOARDS
+# -------------------------
+# Each award adds its points to two StudentPointsTotal rows with an F()
+# update: the student's total in that club and their overall total (club
+# NULL). Leaderboards never sum StudentPoints; they walk the
+# (club, -total, student) index, so the top N and the rows around a student
+# are index seeks, and a rank is one index range count of the rows with a
+# higher total.
+#
+# That count still reads one index entry per student ahead, so a rank low
+# on the overall board costs more than one near the top. Counts are not
+# cached: totals change with every award, and an index range count is
+# cheap next to serving a stale rank.
+#
+# Ranks are competition ranks ("1224"): tied students share a rank and are
+# listed by student id.
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+DEFAULT_AROUND = 2
+MAX_AROUND = 10
+
+
+def _scope(club_id):
+    """Totals on one leaderboard: a club's, or the overall one for None."""
+    return StudentPointsTotal.objects.filter(club_id=club_id)
+
+
+def _ahead_of(row):
+    """Rows listed before ``row``: a higher total, or the same total and a lower student id."""
+    return Q(total__gt=row.total) | Q(total=row.total, student_id__lt=row.student_id)
+
+
+def _behind(row):
+    return Q(total__lt=row.total) | Q(total=row.total, student_id__gt=row.student_id)
+
+
+def _count_above(club_id, total):
+    """How many students on the leaderboard have more than ``total`` points."""
+    return _scope(club_id).filter(total__gt=total).count()
+
+
+def _participants(club_id):
+    return _scope(club_id).count()
+
+
+def add_to_totals(student_id, club_id, points, create=True):
+    """
+    Add ``points`` to the student's club and overall totals.
+
+    Missing rows are created unless ``create`` is False (used when points
+    are taken away, where a missing row has nothing to subtract from).
+    """
+    with transaction.atomic():
+        for scope in (club_id, None):
+            rows = StudentPointsTotal.objects.filter(student_id=student_id, club_id=scope)
+            if rows.update(total=F('total') + points) or not create:
+                continue
+            try:
+                with transaction.atomic():
+                    StudentPointsTotal.objects.create(student_id=student_id, club_id=scope, total=points)
+            except IntegrityError:
+                # A concurrent award created the row first
+                rows.update(total=F('total') + points)
+
+
+def add_to_totals_bulk(student_ids, club_id, points):
+    """
+    Add the same ``points`` to many students' club and overall totals.
+
+    Two statements per leaderboard whatever the number of students: insert
+    the missing rows at zero (rows a concurrent award creates are left
+    alone), then bump every row with one F() update.
+    """
+    with transaction.atomic():
+        for scope in (club_id, None):
+            StudentPointsTotal.objects.bulk_create(
+                [StudentPointsTotal(student_id=sid, club_id=scope, total=0) for sid in student_ids],
+                ignore_conflicts=True,
+            )
+            StudentPointsTotal.objects.filter(club_id=scope, student_id__in=student_ids).update(
+                total=F('total') + points
+            )
+
+
+def rebuild_totals(student_ids=None):
+    """Recount totals from StudentPoints, for everyone or just ``student_ids``."""
+    awards = StudentPoints.objects.all()
+    totals = StudentPointsTotal.objects.all()
+    if student_ids is not None:
+        awards = awards.filter(student_id__in=student_ids)
+        totals = totals.filter(student_id__in=student_ids)
+
+    rows, overall = [], {}
+    for row in awards.values('student_id', 'club_id').annotate(total=Sum('points')).order_by():
+        rows.append(StudentPointsTotal(**row))
+        overall[row['student_id']] = overall.get(row['student_id'], 0) + row['total']
+    rows += [StudentPointsTotal(student_id=sid, club_id=None, total=total) for sid, total in overall.items()]
+
+    with transaction.atomic():
+        totals.delete()
+        StudentPointsTotal.objects.bulk_create(rows)
+    return len(rows)
+
+
+def _ranked(rows, position, first_rank):
+    """Leaderboard entries for consecutive ``rows``, the first at ``position``."""
+    entries = []
+    for offset, row in enumerate(rows):
+        if not entries:
+            rank = first_rank
+        elif row.total == entries[-1]['total']:
+            rank = entries[-1]['rank']
+        else:
+            rank = position + offset
+        entries.append({
+            'rank': rank,
+            'student_id': row.student_id,
+            'username': row.student.username,
+            'total': row.total,
+        })
+    return entries
+
+
+def top(club_id=None, limit=DEFAULT_LIMIT):
+    """The first ``limit`` entries of a club's (or the overall) leaderboard."""
+    rows = _scope(club_id).select_related('student').order_by('-total', 'student_id')[:limit]
+    return _ranked(rows, 1, 1)
+
+
+def rank_of(student_id, club_id=None):
+    """``(rank, total)`` for a student, or None if they have no points there."""
+    row = _scope(club_id).filter(student_id=student_id).only('total').first()
+    if row is None:
+        return None
+    return _count_above(club_id, row.total) + 1, row.total
+
+
+def standing(student_id, club_id=None, around=DEFAULT_AROUND):
+    """
+    A student's rank plus the ``around`` entries either side of them.
+
+    ``rank`` is None (and ``neighbours`` empty) if the student has no points
+    on that leaderboard.
+    """
+    scope = _scope(club_id).select_related('student')
+    me = scope.filter(student_id=student_id).first()
+    if me is None:
+        return {'rank': None, 'total': 0, 'participants': _participants(club_id), 'neighbours': []}
+
+    above = list(scope.filter(_ahead_of(me)).order_by('total', '-student_id')[:around])[::-1]
+    below = list(scope.filter(_behind(me)).order_by('-total', 'student_id')[:around])
+    rows = above + [me] + below
+
+    first = rows[0]
+    first_rank = _count_above(club_id, first.total) + 1
+    # Only the students tied with the first row are counted afresh
+    tied_ahead = _scope(club_id).filter(total=first.total, student_id__lt=first.student_id).count()
+    entries = _ranked(rows, first_rank + tied_ahead, first_rank)
+    mine = entries[len(above)]
+    return {
+        'rank': mine['rank'],
+        'total': mine['total'],
+        'participants': _participants(club_id),
+        'neighbours': entries,
+    }
@@ -0,0 +1,27 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from clubs.models import ClubActivityRollup
+from clubs.rollups import backfill_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the hourly and daily club activity rollups from posts, votes, RSVPs "
+        "and points awards (after enabling rollups, or to repair them)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune-hourly', type=int, metavar='DAYS',
+            help="Only delete hourly rows older than DAYS days (daily rows are kept) instead of rebuilding.",
+        )
+
+    def handle(self, *args, **options):
+        if options['prune_hourly'] is not None:
+            cutoff = timezone.now() - timedelta(days=options['prune_hourly'])
+            deleted, _ = ClubActivityRollup.objects.filter(period='hour', bucket__lt=cutoff).delete()
+            self.stdout.write(f"Deleted {deleted} hourly rollup rows older than {cutoff:%Y-%m-%d %H:%M}")
+            return
+        self.stdout.write(f"Wrote {backfill_rollups()} rollup rows")
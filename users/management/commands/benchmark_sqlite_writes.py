@@ -0,0 +1,84 @@
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand
+
+from clubs.sqlite import apply_pragmas, sqlite_pragmas
+
+SCHEMA = """
+CREATE TABLE vote (id INTEGER PRIMARY KEY, option_id INTEGER, user_id INTEGER, UNIQUE (option_id, user_id));
+CREATE TABLE tally (option_id INTEGER PRIMARY KEY, total INTEGER NOT NULL);
+INSERT INTO tally VALUES (1, 0);
+"""
+
+
+def _connect(path, tuned):
+    # Django's defaults: sqlite3's 5s busy wait, and transactions opened
+    # explicitly (by atomic()) with a deferred BEGIN
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    if tuned:
+        apply_pragmas(conn.cursor(), sqlite_pragmas())
+    return conn
+
+
+def run_write_benchmark(path, tuned, writers=8, writes=200):
+    """
+    ``writers`` threads each record ``writes`` votes on a fresh database.
+
+    Every write reads the tally, inserts a vote and bumps the tally in one
+    transaction, like an RSVP under its capacity check. Returns throughput
+    and how many writes failed with "database is locked".
+    """
+    setup = _connect(path, tuned)
+    setup.executescript(SCHEMA)
+    setup.close()
+
+    done, errors = [0] * writers, [0] * writers
+    begin = "BEGIN IMMEDIATE" if tuned else "BEGIN"
+
+    def writer(n):
+        conn = _connect(path, tuned)
+        for i in range(writes):
+            try:
+                conn.execute(begin)
+                conn.execute("SELECT total FROM tally WHERE option_id = 1").fetchone()
+                conn.execute("INSERT INTO vote (option_id, user_id) VALUES (1, ?)", (n * writes + i,))
+                conn.execute("UPDATE tally SET total = total + 1 WHERE option_id = 1")
+                conn.execute("COMMIT")
+                done[n] += 1
+            except sqlite3.OperationalError:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                errors[n] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {"writes": sum(done), "errors": sum(errors), "elapsed": elapsed, "wps": sum(done) / elapsed}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent SQLite writer throughput with Django's default SQLite "
+        "settings and with the SQLITE_TUNING profile, on throwaway database files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads.")
+        parser.add_argument("--writes", type=int, default=200, help="Writes per thread.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['writers']} writers x {options['writes']} writes")
+        self.stdout.write(f"{'profile':<10}{'writes/s':>10}{'ok':>8}{'locked':>8}")
+        for label, tuned in (("default", False), ("tuned", True)):
+            with tempfile.TemporaryDirectory() as tmp:
+                r = run_write_benchmark(str(Path(tmp) / "bench.sqlite3"), tuned,
+                                        options["writers"], options["writes"])
+            self.stdout.write(f"{label:<10}{r['wps']:>10.0f}{r['writes']:>8}{r['errors']:>8}")
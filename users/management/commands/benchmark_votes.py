@@ -0,0 +1,87 @@
+import threading
+import time
+import uuid
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError
+
+from clubs.background import start_background_thread
+from clubs.models import Club, Poll, PollOption
+from clubs.votes import flush_votes, submit_vote
+
+
+def run_vote_benchmark(voters=500, writers=16, buffered=False, options=4):
+    """
+    ``writers`` threads cast one vote each for ``voters`` new users on a
+    throwaway poll, in direct or buffered mode.
+
+    Returns how fast votes were acknowledged, how long until all of them
+    were counted in the tallies (the flush, for buffered votes) and how many
+    failed. The poll, its club and the users are deleted afterwards.
+    """
+    tag = uuid.uuid4().hex[:8]
+    owner = User.objects.create_user(username=f"vote-bench-{tag}")
+    club = Club.objects.create(name=f"Vote benchmark {tag}", created_by=owner)
+    poll = Poll.objects.create(club=club, question="Benchmark", created_by=owner)
+    choices = [PollOption.objects.create(poll=poll, text=f"Option {n}") for n in range(options)]
+    users = User.objects.bulk_create([User(username=f"vote-bench-{tag}-{n}") for n in range(voters)])
+
+    ballots = iter([(choices[n % options], user) for n, user in enumerate(users)])
+    lock = threading.Lock()
+    errors = [0] * writers
+
+    def writer(n):
+        while True:
+            with lock:
+                ballot = next(ballots, None)
+            if ballot is None:
+                return
+            try:
+                submit_vote(*ballot, buffered=buffered)
+            except OperationalError:
+                errors[n] += 1
+
+    try:
+        started = time.perf_counter()
+        threads = [start_background_thread(writer, n, name=f"vote-bench-{n}") for n in range(writers)]
+        for thread in threads:
+            thread.join()
+        acknowledged = time.perf_counter() - started
+        if buffered:
+            while flush_votes():
+                pass
+        counted = time.perf_counter() - started
+        tallied = PollOption.votes.through.objects.filter(polloption__poll=poll).count()
+    finally:
+        club.delete()
+        User.objects.filter(username__startswith=f"vote-bench-{tag}").delete()
+
+    accepted = voters - sum(errors)
+    return {
+        "votes": accepted,
+        "errors": sum(errors),
+        "tallied": tallied,
+        "vps": accepted / acknowledged,
+        "counted_after": counted,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare poll voting throughput with direct and buffered (VOTE_BUFFERING) votes: "
+        "concurrent voters on a throwaway poll in the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--voters", type=int, default=500, help="Votes to cast, one per new user.")
+        parser.add_argument("--writers", type=int, default=16, help="Concurrent voting threads.")
+        parser.add_argument("--modes", default="direct,buffered", help="Comma-separated modes to compare.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['voters']} votes from {options['writers']} concurrent writers")
+        self.stdout.write(f"{'mode':<10}{'votes/s':>10}{'counted s':>11}{'tallied':>9}{'errors':>8}")
+        for mode in options["modes"].split(","):
+            r = run_vote_benchmark(options["voters"], options["writers"], buffered=mode == "buffered")
+            self.stdout.write(
+                f"{mode:<10}{r['vps']:>10.0f}{r['counted_after']:>11.2f}{r['tallied']:>9}{r['errors']:>8}"
+            )
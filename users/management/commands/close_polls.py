@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from clubs.polls import close_due_polls
+
+
+class Command(BaseCommand):
+    help = "Freeze the results of polls past their closing time (run every minute from cron, or with --loop)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep running, checking once a minute.")
+
+    def handle(self, *args, **options):
+        while True:
+            # See run_report_schedules: nothing else recycles this connection
+            close_old_connections()
+            for poll in close_due_polls():
+                self.stdout.write(
+                    f"{timezone.now():%Y-%m-%d %H:%M} closed poll {poll.pk} ({poll.results['total']} votes)"
+                )
+            if not options['loop']:
+                break
+            time.sleep(60 - timezone.now().second)
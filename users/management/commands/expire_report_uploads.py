@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from clubs.storage import expire_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Mark saved reports whose upload was lost in a restart as failed (run from cron, or with --loop)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep running, checking once a minute.")
+
+    def handle(self, *args, **options):
+        while True:
+            # See run_report_schedules: nothing else recycles this connection
+            close_old_connections()
+            expired = expire_stale_uploads()
+            if expired:
+                self.stdout.write(f"{timezone.now():%Y-%m-%d %H:%M} marked {expired} lost uploads failed")
+            if not options['loop']:
+                break
+            time.sleep(60 - timezone.now().second)
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ["/users/dashboard/student/", "/clubs/student/reports/saved/"]
+
+
+def summarize(latencies, errors, elapsed):
+    """Throughput and latency percentiles (ms) for one load-test run."""
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+    return {
+        "requests": len(ordered) + errors,
+        "errors": errors,
+        "rps": len(ordered) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+    }
+
+
+async def _login(client, username, password):
+    await client.get("/users/login/")
+    response = await client.post(
+        "/users/login/",
+        data={"username": username, "password": password},
+        headers={"X-CSRFToken": client.cookies.get("csrftoken", "")},
+    )
+    if "sessionid" not in client.cookies:
+        raise CommandError(f"Could not log in as {username} (HTTP {response.status_code})")
+
+
+async def run_load(base_url, paths, total, concurrency, username, password):
+    """Send ``total`` GETs across ``paths`` with ``concurrency`` in flight."""
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        await _login(client, username, password)
+        latencies, errors = [], 0
+        pending = iter(range(total))
+
+        async def user_loop():
+            nonlocal errors
+            for i in pending:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user_loop() for _ in range(concurrency)))
+        return summarize(latencies, errors, time.perf_counter() - started)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare sync (WSGI) and async (ASGI, uvicorn workers) throughput: starts "
+        "gunicorn in each mode with the same worker count and loads the same pages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", required=True, help="Account the simulated clients log in as.")
+        parser.add_argument("--password", required=True)
+        parser.add_argument("--modes", default="wsgi,asgi", help="Comma-separated SERVER_MODE values to compare.")
+        parser.add_argument("--workers", type=int, default=2, help="gunicorn workers in every mode.")
+        parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight at once.")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per mode.")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--path", action="append", dest="paths", help="Page to load (repeatable).")
+
+    def handle(self, *args, **options):
+        base_url = f"http://127.0.0.1:{options['port']}"
+        paths = options["paths"] or DEFAULT_PATHS
+        results = {}
+        for mode in options["modes"].split(","):
+            server = self._start_server(mode, options["workers"], options["port"])
+            try:
+                self._wait_until_up(base_url, server)
+                results[mode] = asyncio.run(run_load(
+                    base_url, paths, options["requests"], options["concurrency"],
+                    options["username"], options["password"],
+                ))
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+
+        self.stdout.write(
+            f"{options['workers']} workers, {options['concurrency']} concurrent clients, "
+            f"{options['requests']} requests over {', '.join(paths)}"
+        )
+        self.stdout.write(f"{'mode':<6}{'req/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for mode, r in results.items():
+            self.stdout.write(
+                f"{mode:<6}{r['rps']:>10.1f}{r['mean_ms']:>10.1f}{r['p50_ms']:>10.1f}"
+                f"{r['p95_ms']:>10.1f}{r['errors']:>8}"
+            )
+
+    def _start_server(self, mode, workers, port):
+        env = {**os.environ, "SERVER_MODE": mode, "WEB_CONCURRENCY": str(workers)}
+        return subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py",
+             "--bind", f"127.0.0.1:{port}", "--workers", str(workers)],
+            cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def _wait_until_up(self, base_url, server, timeout=30):
+        import httpx
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("gunicorn exited during startup (is uvicorn-worker installed for asgi?)")
+            try:
+                httpx.get(f"{base_url}/users/login/", timeout=1)
+                return
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        raise CommandError(f"gunicorn did not answer on {base_url} within {timeout}s")
@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from users.schedules import run_all_schedules, run_due_schedules
+
+
+class Command(BaseCommand):
+    help = "Pre-generate the reports whose ReportSchedule is due (run every minute from cron, or with --loop)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep running, checking schedules once a minute.")
+        parser.add_argument('--force', action='store_true', help="Run every enabled schedule now, due or not.")
+
+    def handle(self, *args, **options):
+        if options['force']:
+            self._report(run_all_schedules())
+            return
+
+        while True:
+            # A long-running loop has no request cycle to drop stale or
+            # broken connections (CONN_MAX_AGE / CONN_HEALTH_CHECKS) for it
+            close_old_connections()
+            self._report(run_due_schedules())
+            if not options['loop']:
+                break
+            # Wake up at the start of the next minute
+            time.sleep(60 - timezone.now().second)
+
+    def _report(self, reports):
+        for report in reports:
+            self.stdout.write(f"{timezone.now():%Y-%m-%d %H:%M} generated {report.title} ({report.status})")
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_totals(apps, schema_editor):
+    StudentPoints = apps.get_model('users', 'StudentPoints')
+    StudentPointsTotal = apps.get_model('users', 'StudentPointsTotal')
+    rows, overall = [], {}
+    for row in StudentPoints.objects.values('student_id', 'club_id').annotate(total=Sum('points')).order_by():
+        rows.append(StudentPointsTotal(**row))
+        overall[row['student_id']] = overall.get(row['student_id'], 0) + row['total']
+    rows += [StudentPointsTotal(student_id=sid, club_id=None, total=total) for sid, total in overall.items()]
+    StudentPointsTotal.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0007_storedreport_attempts'),
+        ('users', '0005_reportschedule'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentPointsTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.IntegerField(default=0)),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='points_totals', to='clubs.club')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_totals', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Student Points Totals',
+                'indexes': [models.Index(fields=['club', '-total', 'student'], name='points_total_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'club'), name='unique_points_total_per_club'), models.UniqueConstraint(condition=models.Q(('club__isnull', True)), fields=('student',), name='unique_overall_points_total')],
+            },
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
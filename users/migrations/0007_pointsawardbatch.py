@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0007_storedreport_attempts'),
+        ('users', '0006_studentpointstotal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointsAwardBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('members', 'Club members'), ('event', 'Event attendees'), ('csv', 'CSV upload')], max_length=10)),
+                ('points', models.IntegerField()),
+                ('reason', models.CharField(max_length=200)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('awarded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_batches', to=settings.AUTH_USER_MODEL)),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_batches', to='clubs.club')),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='points_batches', to='clubs.event')),
+            ],
+            options={
+                'verbose_name_plural': 'Points Award Batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='studentpoints',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='awards', to='users.pointsawardbatch'),
+        ),
+    ]
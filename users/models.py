@@ -1,8 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from .utils import get_grade_point, calculate_gpa, calculate_cgpa
 
 
@@ -35,6 +36,7 @@ class StudentPoints(models.Model):
     reason = models.CharField(max_length=200)
     awarded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='points_awarded')
     awarded_at = models.DateTimeField(auto_now_add=True)
+    batch = models.ForeignKey('PointsAwardBatch', on_delete=models.SET_NULL, null=True, blank=True, related_name='awards')
     
     class Meta:
         verbose_name_plural = "Student Points"
@@ -43,6 +45,57 @@ class StudentPoints(models.Model):
         return f"{self.student.username} - {self.points} points for {self.reason}"
 
 
+class PointsAwardBatch(models.Model):
+    """Audit record of one bulk award: who gave how many points to which group."""
+    SOURCE_CHOICES = [
+        ('members', 'Club members'),
+        ('event', 'Event attendees'),
+        ('csv', 'CSV upload'),
+    ]
+
+    club = models.ForeignKey('clubs.Club', on_delete=models.CASCADE, related_name='points_batches')
+    awarded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='points_batches')
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    event = models.ForeignKey('clubs.Event', on_delete=models.SET_NULL, null=True, blank=True, related_name='points_batches')
+    points = models.IntegerField()
+    reason = models.CharField(max_length=200)
+    student_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "Points Award Batches"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.points} points to {self.student_count} students in {self.club} ({self.get_source_display()})"
+
+
+class StudentPointsTotal(models.Model):
+    """
+    Running total of a student's points in one club, or across all clubs
+    when ``club`` is NULL. Kept up to date from StudentPoints by the signals
+    below; leaderboards read only this table (see users/leaderboard.py).
+    """
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='points_totals')
+    club = models.ForeignKey('clubs.Club', on_delete=models.CASCADE, null=True, blank=True, related_name='points_totals')
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Student Points Totals"
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'club'], name='unique_points_total_per_club'),
+            # NULLs are distinct in the constraint above
+            models.UniqueConstraint(fields=['student'], condition=models.Q(club__isnull=True), name='unique_overall_points_total'),
+        ]
+        indexes = [
+            # Leaderboard order: one index range per club (NULL = overall)
+            models.Index(fields=['club', '-total', 'student'], name='points_total_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.total} points ({self.club or 'all clubs'})"
+
+
 # =====================
 # 🎓 ACADEMIC MODELS
 # =====================
@@ -116,6 +169,58 @@ def update_student_gpa(sender, instance, **kwargs):
     record.update_gpa()
 
 
+# =====================
+# ⚙️ SIGNALS FOR POINTS TOTALS
+# =====================
+
+@receiver(post_save, sender=StudentPoints)
+def points_awarded(sender, instance, created, **kwargs):
+    from .leaderboard import add_to_totals, rebuild_totals
+
+    if created:
+        add_to_totals(instance.student_id, instance.club_id, instance.points)
+    else:
+        # An award was edited (admin); the old value is gone, so recount
+        rebuild_totals(student_ids=[instance.student_id])
+
+
+@receiver(post_delete, sender=StudentPoints)
+def points_revoked(sender, instance, **kwargs):
+    from .leaderboard import add_to_totals
+
+    add_to_totals(instance.student_id, instance.club_id, -instance.points, create=False)
+
+
+# =====================
+# 📄 REPORTS
+# =====================
+
+class ReportSchedule(models.Model):
+    """
+    Pre-generates a PDF report on a cron schedule (see the
+    run_report_schedules management command) so the day's downloads are
+    served from a finished file.
+    """
+    report_type = models.CharField(max_length=30)
+    cron = models.CharField(
+        max_length=100, default="0 2 * * *",
+        help_text="minute hour day-of-month month day-of-week, e.g. '0 2 * * *' for 02:00 daily",
+    )
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='report_schedules')
+    enabled = models.BooleanField(default=True)
+    last_run_at = models.DateTimeField(blank=True, null=True)
+
+    def clean(self):
+        from .schedules import parse_cron
+        try:
+            parse_cron(self.cron)
+        except ValueError as e:
+            raise ValidationError({'cron': str(e)})
+
+    def __str__(self):
+        return f"{self.report_type} report ({self.cron})"
+
+
 class Report(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -128,6 +233,10 @@ class Report(models.Model):
     generated_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     file = models.FileField(upload_to='reports/', blank=True, null=True)
+    report_type = models.CharField(max_length=30, blank=True)
+    schedule = models.ForeignKey(
+        ReportSchedule, on_delete=models.SET_NULL, related_name='reports', blank=True, null=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
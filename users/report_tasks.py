@@ -1,13 +1,15 @@
 import threading
 from io import BytesIO
 from django.core.files.base import ContentFile
-from reportlab.pdfgen import canvas
+from clubs.background import closing_connections, start_background_thread
 from .models import Report
 import time
 
 
 def generate_report_background(report_id):
     """Handles the actual PDF generation asynchronously."""
+    from reportlab.pdfgen import canvas
+
     report = Report.objects.get(id=report_id)
     report.status = 'processing'
     report.save()
@@ -38,8 +40,7 @@ def generate_report_background(report_id):
 
 def start_report_generation(report):
     """Starts the background thread."""
-    thread = threading.Thread(target=generate_report_background, args=(report.id,))
-    thread.start()
+    return start_background_thread(generate_report_background, report.id)
 
 
 def _report_worker_loop():
@@ -54,6 +55,6 @@ def start_report_worker(daemon=True):
     Start a background thread for report tasks. Tests will patch threading.Thread,
     or call this to ensure the attribute exists.
     """
-    t = threading.Thread(target=_report_worker_loop, daemon=daemon)
+    t = threading.Thread(target=closing_connections(_report_worker_loop), daemon=daemon)
     t.start()
     return t
@@ -0,0 +1,171 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from clubs.artifacts import get_report_artifact
+from clubs.report_specs import REPORTS
+from .models import Report, ReportSchedule
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# SCHEDULED REPORT PRE-GENERATION
+# -------------------------
+# ReportSchedule rows hold a five-field cron spec. run_due_schedules() is
+# called once a minute (by cron, or by run_report_schedules --loop) and
+# renders every report whose spec matched a minute since it last ran. With
+# a shared cache (see clubs/artifacts.py) the rendered PDF is also the one
+# the next download of that report is served.
+
+CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+# How far back a missed run is still made up for (e.g. after downtime)
+MAX_CATCH_UP = timedelta(days=1)
+# Runs kept per schedule; older Reports and their files are deleted
+SCHEDULE_KEEP_RUNS = 10
+
+
+def _parse_field(field, low, high):
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/")
+            step = int(step)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-"))
+        else:
+            start = end = int(part)
+            if step != 1:
+                end = high
+        if not (low <= start <= end <= high) or step < 1:
+            raise ValueError(f"'{field}' is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse_cron(spec):
+    """Return the allowed values for each of the five cron fields."""
+    fields = spec.split()
+    if len(fields) != 5:
+        raise ValueError("A cron spec has five fields: minute hour day month weekday")
+    parsed = [_parse_field(field, low, high) for field, (low, high) in zip(fields, CRON_RANGES)]
+    # Cron counts Sunday as 0 (and 7)
+    parsed[4] = {day % 7 for day in parsed[4]}
+    return parsed
+
+
+def _matches(fields, moment):
+    minute, hour, day, month, weekday = fields
+    if not (moment.minute in minute and moment.hour in hour and moment.month in month):
+        return False
+    day_ok = moment.day in day
+    weekday_ok = (moment.isoweekday() % 7) in weekday
+    # As in cron, when both day fields are restricted either one may match
+    if len(day) < 31 and len(weekday) < 7:
+        return day_ok or weekday_ok
+    return day_ok and weekday_ok
+
+
+def cron_matches(spec, moment):
+    return _matches(parse_cron(spec), moment)
+
+
+def is_due(schedule, now):
+    """True if the schedule matched any minute since its last run."""
+    now = timezone.localtime(now).replace(second=0, microsecond=0)
+    if schedule.last_run_at is None:
+        start = now
+    else:
+        start = timezone.localtime(schedule.last_run_at).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        start = max(start, now - MAX_CATCH_UP)
+    fields = parse_cron(schedule.cron)
+    moment = start
+    while moment <= now:
+        if _matches(fields, moment):
+            return True
+        moment += timedelta(minutes=1)
+    return False
+
+
+def run_schedule(schedule, now=None):
+    """Render the schedule's report and register it as a completed Report."""
+    now = now or timezone.now()
+    report = Report.objects.create(
+        title=f"{schedule.report_type.title()} Report {timezone.localtime(now):%Y-%m-%d}",
+        generated_by=schedule.owner,
+        report_type=schedule.report_type,
+        schedule=schedule,
+        status='processing',
+    )
+    try:
+        path = get_report_artifact(schedule.report_type)
+        with open(path, 'rb') as stream:
+            report.file.save(f"{schedule.report_type}_report_{timezone.localtime(now):%Y%m%d_%H%M}.pdf", File(stream), save=False)
+        report.status = 'completed'
+    except Exception:
+        report.status = 'failed'
+        raise
+    finally:
+        report.save()
+        ReportSchedule.objects.filter(pk=schedule.pk).update(last_run_at=now)
+    prune_schedule_reports(schedule)
+    return report
+
+
+def prune_schedule_reports(schedule, keep=None):
+    """Delete all but the newest ``keep`` runs of a schedule, files included; returns how many."""
+    if keep is None:
+        keep = getattr(settings, "REPORT_SCHEDULE_KEEP_RUNS", SCHEDULE_KEEP_RUNS)
+    old = list(schedule.reports.order_by('-created_at', '-id')[keep:])
+    for report in old:
+        if report.file:
+            report.file.delete(save=False)
+    Report.objects.filter(pk__in=[report.pk for report in old]).delete()
+    return len(old)
+
+
+def _run_logged(schedule, now):
+    """run_schedule, but a failure is logged (its Report is marked failed) instead of raised."""
+    try:
+        return run_schedule(schedule, now)
+    except Exception:
+        logger.exception("Scheduled %s report (schedule %s) failed", schedule.report_type, schedule.pk)
+        return None
+
+
+def _enabled_schedules():
+    """Enabled schedules for report types that exist."""
+    return ReportSchedule.objects.filter(enabled=True, report_type__in=list(REPORTS)).select_related('owner')
+
+
+def run_due_schedules(now=None):
+    """Run every enabled schedule that is due; returns the Reports that were generated."""
+    now = now or timezone.now()
+    reports = []
+    for schedule in _enabled_schedules():
+        if not is_due(schedule, now):
+            continue
+        # Claim the run so two overlapping schedulers don't both render it
+        with transaction.atomic():
+            claimed = ReportSchedule.objects.filter(
+                pk=schedule.pk, last_run_at=schedule.last_run_at
+            ).update(last_run_at=now)
+        if not claimed:
+            continue
+        # One failing report must not hold up the others
+        report = _run_logged(schedule, now)
+        if report is not None:
+            reports.append(report)
+    return reports
+
+
+def run_all_schedules(now=None):
+    """Run every enabled schedule now, due or not; returns the Reports that were generated."""
+    now = now or timezone.now()
+    reports = (_run_logged(schedule, now) for schedule in _enabled_schedules())
+    return [report for report in reports if report is not None]
@@ -0,0 +1,52 @@
+from inspect import iscoroutinefunction
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+from clubs.models import Club
+from users.management.commands.loadtest import summarize
+
+
+@pytest.mark.parametrize("name", [
+    "student_dashboard", "lecturer_dashboard", "my_saved_reports", "save_report_cloud",
+    "lecturer_saved_reports", "admin_saved_reports",
+])
+def test_io_bound_views_are_async(name):
+    assert iscoroutinefunction(resolve(reverse(name)).func)
+
+
+@pytest.mark.django_db
+def test_student_dashboard_under_asgi(student_user):
+    club = Club.objects.create(name="Chess", description="", meeting_time="Fridays")
+    club.members.add(student_user)
+
+    async def fetch():
+        client = AsyncClient()
+        await client.aforce_login(student_user)
+        return await client.get(reverse("student_dashboard"))
+
+    response = async_to_sync(fetch)()
+    assert response.status_code == 200
+    assert [c.name for c in response.context["user_clubs"]] == ["Chess"]
+
+
+@pytest.mark.django_db
+def test_cloud_save_and_listing_under_asgi(student_user):
+    async def save_and_list():
+        client = AsyncClient()
+        await client.aforce_login(student_user)
+        saved = await client.post(reverse("save_report_cloud"), {"report_type": "clubs"})
+        status = await client.get(saved.json()["status_url"])
+        listing = await client.get(reverse("my_saved_reports"))
+        return saved, status, listing
+
+    saved, status, listing = async_to_sync(save_and_list)()
+    assert saved.status_code == 202
+    assert status.json()["status"] == "stored"
+    assert [r["name"] for r in listing.context["reports"]] == [saved.json()["url"].rsplit("/", 1)[-1]]
+
+
+def test_loadtest_summary():
+    result = summarize([0.01, 0.02, 0.03, 0.04], errors=1, elapsed=2.0)
+    assert result["requests"] == 5 and result["rps"] == 2.0
+    assert result["p50_ms"] == 30.0 and result["p95_ms"] == 40.0
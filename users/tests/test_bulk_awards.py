@@ -0,0 +1,116 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from clubs.models import Club, Event
+from users.awards import award_points_in_bulk
+from users.models import PointsAwardBatch, Profile, StudentPoints, StudentPointsTotal
+
+
+def make_students(django_user_model, usernames):
+    # No passwords: they never log in, and hashing dominates the test time
+    users = [django_user_model.objects.create_user(username=name) for name in usernames]
+    Profile.objects.bulk_create([Profile(user=u, role="student", name=u.username) for u in users])
+    return users
+
+
+@pytest.fixture
+def chess(django_user_model):
+    club = Club.objects.create(name="Chess")
+    club.members.add(*make_students(django_user_model, [f"m{i}" for i in range(5)]))
+    return club
+
+
+def totals(club_id=None):
+    return dict(StudentPointsTotal.objects.filter(club_id=club_id).values_list("student__username", "total"))
+
+
+@pytest.mark.django_db
+def test_bulk_award_to_members(client, lecturer_user, chess, django_user_model):
+    member = chess.members.get(username="m0")
+    StudentPoints.objects.create(student=member, club=chess, points=3, reason="Earlier", awarded_by=lecturer_user)
+    # The lecturer and a student outside the club are never awarded
+    chess.members.add(lecturer_user)
+    outsider = make_students(django_user_model, ["outsider"])[0]
+    client.login(username="bob", password="testpass")
+
+    resp = client.post(reverse("bulk_award_points", args=[chess.id]),
+                       {"target": "members", "students": [outsider.id], "points": "10", "reason": "x"})
+    assert not PointsAwardBatch.objects.exists()
+    resp = client.post(reverse("bulk_award_points", args=[chess.id]),
+                       {"target": "members", "points": "10", "reason": "Tournament"})
+    assert resp.status_code == 302
+
+    batch = PointsAwardBatch.objects.get()
+    assert (batch.source, batch.points, batch.student_count, batch.awarded_by) == ("members", 10, 5, lecturer_user)
+    assert batch.awards.count() == 5
+    assert totals(chess.id) == {"m0": 13, "m1": 10, "m2": 10, "m3": 10, "m4": 10}
+    assert totals() == totals(chess.id)
+
+
+@pytest.mark.django_db
+def test_bulk_award_to_selected_members_and_event_attendees(client, lecturer_user, chess):
+    m1, m2, m3 = (chess.members.get(username=u) for u in ("m1", "m2", "m3"))
+    event = Event.objects.create(club=chess, name="Open", description="", date=timezone.now().date())
+    event.attendees.add(m2, m3)
+    other = Event.objects.create(club=Club.objects.create(name="Drama"), name="Play", description="",
+                                 date=timezone.now().date())
+    client.login(username="bob", password="testpass")
+    url = reverse("bulk_award_points", args=[chess.id])
+
+    client.post(url, {"target": "members", "students": [m1.id, m2.id], "points": 5, "reason": "Helping"})
+    client.post(url, {"target": "event", "event": event.id, "points": 7, "reason": "Attendance"})
+    assert totals(chess.id) == {"m1": 5, "m2": 12, "m3": 7}
+    assert PointsAwardBatch.objects.filter(source="event", event=event, student_count=2).exists()
+
+    # Another club's event is not a valid target
+    assert client.post(url, {"target": "event", "event": other.id, "points": 7, "reason": "x"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_bulk_award_from_csv(client, lecturer_user, chess, django_user_model):
+    client.login(username="bob", password="testpass")
+    url = reverse("bulk_award_points", args=[chess.id])
+    # An all-digit value is a username (a student number), never a user id
+    numbered = make_students(django_user_model, [str(chess.members.get(username="m4").id)])[0]
+    chess.members.add(numbered)
+
+    csv_file = SimpleUploadedFile("list.csv", f"username\nm0\nm1\n{numbered.username}\nm1\n".encode(),
+                                  content_type="text/csv")
+    client.post(url, {"target": "csv", "csv_file": csv_file, "points": 4, "reason": "Workshop"})
+    assert totals(chess.id) == {"m0": 4, "m1": 4, numbered.username: 4}
+
+    # One unknown student, or one outside the club, rejects the whole file
+    make_students(django_user_model, ["outsider"])
+    csv_file = SimpleUploadedFile("list.csv", b"m2\nnobody\noutsider\n", content_type="text/csv")
+    resp = client.post(url, {"target": "csv", "csv_file": csv_file, "points": 4, "reason": "Workshop"}, follow=True)
+    assert "Not students of Chess: nobody, outsider" in [str(m) for m in resp.context["messages"]]
+    assert PointsAwardBatch.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_award_validation_and_permissions(client, student_user, lecturer_user, chess):
+    url = reverse("bulk_award_points", args=[chess.id])
+    client.login(username="alice", password="testpass")
+    client.post(url, {"target": "members", "points": 5, "reason": "x"})
+    assert not StudentPoints.objects.exists()
+
+    client.login(username="bob", password="testpass")
+    for data in ({"points": 0, "reason": "x"}, {"points": 500, "reason": "x"}, {"points": 5, "reason": " "}):
+        client.post(url, {"target": "members", **data})
+    assert not StudentPoints.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_award_query_count_does_not_grow_with_the_group(lecturer_user, chess, django_user_model):
+    def queries_for(student_ids):
+        with CaptureQueriesContext(connection) as queries:
+            award_points_in_bulk(chess, lecturer_user, 5, "Attendance", student_ids, "members")
+        return len(queries)
+
+    small = queries_for([u.id for u in chess.members.all()[:2]])
+    more = make_students(django_user_model, [f"x{i}" for i in range(40)])
+    chess.members.add(*more)
+    assert queries_for([u.id for u in more]) == small
@@ -0,0 +1,132 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from clubs.models import Club
+from users.leaderboard import rank_of, rebuild_totals, standing, top
+from users.models import StudentPoints, StudentPointsTotal
+
+
+@pytest.fixture
+def award(lecturer_user):
+    def make(student, club, points):
+        return StudentPoints.objects.create(
+            student=student, club=club, points=points, reason="Participation", awarded_by=lecturer_user
+        )
+    return make
+
+
+@pytest.fixture
+def students(django_user_model):
+    # No passwords: they never log in, and hashing dominates the test time
+    return [django_user_model.objects.create_user(username=f"s{i}") for i in range(6)]
+
+
+def board(entries):
+    return [(e["rank"], e["username"], e["total"]) for e in entries]
+
+
+@pytest.mark.django_db
+def test_awards_maintain_club_and_overall_totals(award, students):
+    chess, drama = Club.objects.create(name="Chess"), Club.objects.create(name="Drama")
+    s0 = students[0]
+    award(s0, chess, 10)
+    award(s0, chess, 5)
+    last = award(s0, drama, 7)
+
+    totals = dict(StudentPointsTotal.objects.filter(student=s0).values_list("club__name", "total"))
+    assert totals == {"Chess": 15, "Drama": 7, None: 22}
+
+    last.delete()
+    assert rank_of(s0.id) == (1, 15)
+    assert StudentPointsTotal.objects.get(student=s0, club=drama).total == 0
+
+    # An edited award is recounted from the award history
+    first = StudentPoints.objects.filter(student=s0).first()
+    first.points = 1
+    first.save()
+    assert rank_of(s0.id) == (1, 6) and rank_of(s0.id, chess.id) == (1, 6)
+
+
+@pytest.mark.django_db
+def test_rank_queries(award, students):
+    club = Club.objects.create(name="Chess")
+    for student, points in zip(students, [50, 40, 40, 30, 20, 10]):
+        award(student, club, points)
+
+    assert board(top(club.id, 4)) == [(1, "s0", 50), (2, "s1", 40), (2, "s2", 40), (4, "s3", 30)]
+    assert board(top(limit=2)) == [(1, "s0", 50), (2, "s1", 40)]
+    assert rank_of(students[2].id, club.id) == (2, 40)
+    assert rank_of(students[0].id, Club.objects.create(name="Empty").id) is None
+
+    mine = standing(students[2].id, club.id, around=2)
+    assert (mine["rank"], mine["total"], mine["participants"]) == (2, 40, 6)
+    assert board(mine["neighbours"]) == [(1, "s0", 50), (2, "s1", 40), (2, "s2", 40), (4, "s3", 30), (5, "s4", 20)]
+    assert board(standing(students[5].id, around=1)["neighbours"]) == [(5, "s4", 20), (6, "s5", 10)]
+
+
+@pytest.mark.django_db
+def test_rank_queries_do_not_scan_awards(award, students):
+    club = Club.objects.create(name="Chess")
+    for student in students:
+        award(student, club, 5)
+    with CaptureQueriesContext(connection) as queries:
+        standing(students[3].id, club.id)
+    assert len(queries) == 6
+    assert not any("users_studentpoints\"" in q["sql"] for q in queries.captured_queries)
+
+    # Ranks are counted afresh, so they follow the next award straight away
+    assert rank_of(students[4].id, club.id) == (1, 5)
+    award(students[4], club, 1)
+    assert rank_of(students[4].id, club.id) == (1, 6)
+    assert rank_of(students[3].id, club.id) == (2, 5)
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_incremental_totals(award, students):
+    club = Club.objects.create(name="Chess")
+    for i, student in enumerate(students):
+        award(student, club, i + 1)
+        award(student, club, 2)
+    def totals():
+        return set(StudentPointsTotal.objects.values_list("student_id", "club_id", "total"))
+
+    expected = totals()
+    StudentPointsTotal.objects.all().delete()
+    assert rebuild_totals() == len(expected)
+    assert totals() == expected
+
+
+@pytest.mark.django_db
+def test_leaderboard_api(award, students, student_user):
+    club = Club.objects.create(name="Chess")
+    for student, points in zip(students, [30, 20, 10]):
+        award(student, club, points)
+    award(student_user, club, 15)
+    api = APIClient()
+    api.force_authenticate(student_user)
+
+    resp = api.get(reverse("leaderboard_api"), {"club": club.id, "limit": 2})
+    assert resp.status_code == 200
+    assert resp.json()["club"] == club.id
+    assert board(resp.json()["entries"]) == [(1, "s0", 30), (2, "s1", 20)]
+
+    resp = api.get(reverse("my_leaderboard_api"), {"around": 1})
+    data = resp.json()
+    assert (data["club"], data["rank"], data["total"], data["participants"]) == (None, 3, 15, 4)
+    assert board(data["neighbours"]) == [(2, "s1", 20), (3, "alice", 15), (4, "s2", 10)]
+
+    assert api.get(reverse("leaderboard_api"), {"club": 999}).status_code == 404
+    assert api.get(reverse("leaderboard_api"), {"limit": "ten"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_points_summary_shows_rank(client, award, students, student_user):
+    club = Club.objects.create(name="Chess")
+    award(students[0], club, 30)
+    award(student_user, club, 15)
+    client.login(username="alice", password="testpass")
+    resp = client.get(reverse("student_points"))
+    assert resp.context["total_points"] == 15 and resp.context["rank"] == 2
+    assert list(resp.context["points_by_club"]) == [{"club__name": "Chess", "total": 15}]
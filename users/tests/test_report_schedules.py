@@ -0,0 +1,119 @@
+import io
+from datetime import datetime, timedelta
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from users.models import Profile, Report, ReportSchedule
+from users import schedules
+from users.schedules import cron_matches, is_due, parse_cron, run_due_schedules
+
+
+def at(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+def test_cron_fields():
+    assert cron_matches("0 2 * * *", at(2025, 1, 6, 2, 0))
+    assert not cron_matches("0 2 * * *", at(2025, 1, 6, 2, 1))
+    assert cron_matches("*/15 8-17 * * 1-5", at(2025, 1, 6, 9, 45))  # Monday
+    assert not cron_matches("*/15 8-17 * * 1-5", at(2025, 1, 5, 9, 45))  # Sunday
+    assert cron_matches("30 6 1,15 * 0", at(2025, 6, 15, 6, 30))
+    # Sunday is both 0 and 7, and 7 may close a range
+    assert parse_cron("0 0 * * 1-7")[4] == {0, 1, 2, 3, 4, 5, 6}
+    assert parse_cron("0 0 * * 7")[4] == {0}
+    assert parse_cron("0 0 17 * *")[2] == {17}
+    # Day of month and day of week are ORed when both are restricted
+    assert cron_matches("0 9 1 * 1", at(2025, 1, 6, 9, 0))  # a Monday, not the 1st
+    assert cron_matches("0 9 1 * 1", at(2025, 2, 1, 9, 0))  # the 1st, a Saturday
+    assert not cron_matches("0 9 1 * 1", at(2025, 2, 4, 9, 0))
+    assert not cron_matches("0 9 1 * *", at(2025, 1, 6, 9, 0))
+    with pytest.raises(ValueError):
+        parse_cron("61 * * * *")
+    with pytest.raises(ValueError):
+        parse_cron("0 2 * *")
+
+
+@pytest.mark.django_db
+def test_schedule_is_due_once_per_matching_minute(admin_user):
+    schedule = ReportSchedule(report_type="clubs", cron="0 2 * * *", owner=admin_user)
+    assert not is_due(schedule, at(2025, 1, 6, 1, 59))
+    assert is_due(schedule, at(2025, 1, 6, 2, 0))
+
+    schedule.last_run_at = at(2025, 1, 6, 2, 0)
+    assert not is_due(schedule, at(2025, 1, 6, 23, 0))
+    # A run missed while the scheduler was down is made up for
+    assert is_due(schedule, at(2025, 1, 7, 8, 0))
+
+    schedule.cron = "not a cron"
+    with pytest.raises(ValidationError):
+        schedule.clean()
+
+
+@pytest.mark.django_db
+def test_due_schedule_creates_report_once(admin_user):
+    schedule = ReportSchedule.objects.create(
+        report_type="clubs", cron="0 2 * * *", owner=admin_user, last_run_at=at(2025, 1, 5, 2, 0)
+    )
+    reports = run_due_schedules(at(2025, 1, 6, 2, 0))
+    assert len(reports) == 1
+    report = Report.objects.get()
+    assert report.status == "completed" and report.schedule == schedule and report.report_type == "clubs"
+    assert report.file.read().startswith(b"%PDF")
+
+    assert run_due_schedules(at(2025, 1, 6, 2, 0) + timedelta(seconds=30)) == []
+    schedule.refresh_from_db()
+    assert schedule.last_run_at == at(2025, 1, 6, 2, 0)
+
+
+@pytest.mark.django_db
+def test_scheduled_reports_listed_instead_of_mock_data(client, admin_user, django_user_model):
+    client.login(username="admin", password="testpass")
+    assert client.get(reverse("admin_saved_reports")).context["saved_reports"] == []
+
+    ReportSchedule.objects.create(report_type="students", owner=admin_user)
+    # A schedule for a report type that no longer exists is skipped
+    ReportSchedule.objects.create(report_type="retired", owner=admin_user)
+    call_command("run_report_schedules", "--force", stdout=io.StringIO())
+
+    reports = client.get(reverse("admin_saved_reports")).context["saved_reports"]
+    assert [r["type"] for r in reports] == ["students"]
+    assert reports[0]["url"].endswith(".pdf")
+
+    # Another admin's schedules are not listed
+    other = django_user_model.objects.create_user(username="other-admin")
+    Profile.objects.create(user=other, role="admin")
+    client.force_login(other)
+    assert client.get(reverse("admin_saved_reports")).context["saved_reports"] == []
+
+
+@pytest.mark.django_db
+def test_failing_schedule_does_not_stop_the_others(admin_user, monkeypatch):
+    for report_type in ("clubs", "students"):
+        ReportSchedule.objects.create(report_type=report_type, cron="0 2 * * *", owner=admin_user)
+
+    def render(report_type):
+        if report_type == "clubs":
+            raise RuntimeError("renderer crashed")
+        return real_render(report_type)
+
+    real_render = schedules.get_report_artifact
+    monkeypatch.setattr(schedules, "get_report_artifact", render)
+
+    reports = run_due_schedules(at(2025, 1, 6, 2, 0))
+
+    assert [r.report_type for r in reports] == ["students"]
+    assert dict(Report.objects.values_list("report_type", "status")) == {"clubs": "failed", "students": "completed"}
+
+
+@pytest.mark.django_db
+def test_old_scheduled_runs_are_pruned(admin_user, settings, media_root):
+    settings.REPORT_SCHEDULE_KEEP_RUNS = 2
+    schedule = ReportSchedule.objects.create(report_type="clubs", owner=admin_user)
+    runs = [schedules.run_schedule(schedule, at(2025, 1, day, 2, 0)) for day in range(1, 5)]
+
+    assert list(schedule.reports.order_by("id")) == runs[2:]
+    assert sorted(p.name for p in (media_root / "reports").glob("*.pdf")) == sorted(
+        r.file.name.rsplit("/", 1)[-1] for r in runs[2:]
+    )
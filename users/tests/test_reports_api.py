@@ -5,6 +5,16 @@ from django.urls import reverse
 def test_admin_save_report_cloud_endpoint(client, admin_user):
     client.login(username="admin", password="testpass")
     resp = client.post(reverse("admin_save_report_cloud"), {"report_type": "clubs"})
-    assert resp.status_code == 200
+    assert resp.status_code == 202
     data = resp.json()
-    assert "success" in data
\ No newline at end of file
+    assert data["success"] is True
+    assert client.get(data["status_url"]).json()["status"] == "stored"
+
+@pytest.mark.django_db
+def test_cloud_saves_reject_unknown_report_types(client, admin_user, lecturer_user, media_root):
+    client.login(username="admin", password="testpass")
+    assert client.post(reverse("admin_save_report_cloud"), {"report_type": "../../../x"}).status_code == 400
+    client.login(username="bob", password="testpass")
+    assert client.post(reverse("lecturer_save_report_cloud"), {"report_type": "../../../x"}).status_code == 400
+    assert client.post(reverse("lecturer_save_report_cloud"), {"report_type": "polls"}).status_code == 202
+    assert not list(media_root.parent.glob("x*"))
@@ -7,5 +7,6 @@ def test_upload_to_supabase_called(client, admin_user):
     with patch("users.views.upload_to_supabase") as mock_upload:
         mock_upload.return_value = {"success": True, "url": "https://supabase/fake"}
         resp = client.post("/users/reports/admin-save/", {"report_type": "clubs"})
-        assert resp.status_code == 200
+        # Accepted: the upload runs on the background queue
+        assert resp.status_code == 202
         mock_upload.assert_called_once()
\ No newline at end of file
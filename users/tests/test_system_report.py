@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from clubs.models import Club, ClubPost, Event, Poll, PollOption
+from clubs.report_specs import clubs_report, system_report
+from users.views import generate_report_file
+
+
+def add_clubs(author, students, count, offset=0):
+    for i in range(offset, offset + count):
+        club = Club.objects.create(name=f"Club {i}", description="A club", meeting_time="Mondays")
+        club.members.add(*students)
+        Event.objects.create(club=club, name=f"Event {i}", description="", date=timezone.now().date())
+        poll = Poll.objects.create(club=club, question=f"Question {i}?", created_by=author)
+        PollOption.objects.create(poll=poll, text="Yes").votes.add(*students)
+        ClubPost.objects.create(club=club, author=author, title=f"Post {i}", content="...")
+
+
+@pytest.mark.django_db
+def test_system_report_query_count_does_not_grow_with_clubs(tmp_path, admin_user, django_user_model):
+    students = django_user_model.objects.bulk_create([django_user_model(username=f"s{i}") for i in range(3)])
+
+    def count_queries(name):
+        path = tmp_path / name
+        with CaptureQueriesContext(connection) as queries:
+            generate_report_file(str(path))
+        assert path.read_bytes().startswith(b"%PDF")
+        return len(queries)
+
+    add_clubs(admin_user, students, 2)
+    few = count_queries("few.pdf")
+    add_clubs(admin_user, students, 15, offset=2)
+    assert count_queries("many.pdf") == few
+
+
+@pytest.mark.django_db
+def test_system_report_handles_empty_system(tmp_path):
+    path = tmp_path / "empty.pdf"
+    generate_report_file(str(path))
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+@pytest.mark.django_db
+def test_system_report_downloads_under_its_own_name():
+    assert (system_report().filename, clubs_report().filename) == ("system_report", "clubs_report")
@@ -1,6 +1,6 @@
 from django.urls import path
 from . import views
-from clubs import views as clubs_views
+from clubs.lazy import lazy_view
 
 urlpatterns = [
     # Authentication
@@ -17,6 +17,7 @@ urlpatterns = [
     path("dashboard/admin/settings/", views.admin_settings, name="admin_settings"),
 
     # General actions
+    path("feed/", views.activity_feed, name="activity_feed"),
     path("my-activity/", views.my_activity, name="my_activity"),
     path("events/", views.events_list, name="events_list"),
     path("feedback/", views.send_feedback, name="send_feedback"),
@@ -28,6 +29,7 @@ urlpatterns = [
 
     # Award points
     path('award-points/<int:club_id>/', views.award_points, name='award_points'),
+    path('award-points/<int:club_id>/bulk/', views.bulk_award_points, name='bulk_award_points'),
     path('my-points/', views.student_points_summary, name='student_points'),
 
     # User management
@@ -50,23 +52,23 @@ urlpatterns = [
     path('system-reports/', views.system_reports, name='system_reports'),
 
     # Individual report downloads for admin
-    path('reports/download-users/', clubs_views.download_students_report, name='download_users_report'),
-    path('reports/download-clubs/', clubs_views.download_clubs_report, name='download_clubs_report'),
-    path('reports/download-posts/', clubs_views.download_polls_report, name='download_posts_report'),
-    path('reports/download-events/', clubs_views.download_events_report, name='download_events_report'),
+    path('reports/download-users/', lazy_view("clubs.report_views.download_students_report"), name='download_users_report'),
+    path('reports/download-clubs/', lazy_view("clubs.report_views.download_clubs_report"), name='download_clubs_report'),
+    path('reports/download-posts/', lazy_view("clubs.report_views.download_polls_report"), name='download_posts_report'),
+    path('reports/download-events/', lazy_view("clubs.report_views.download_events_report"), name='download_events_report'),
 
     # student/lecturer/admin reports
-    path('reports/clubs/download/', clubs_views.download_clubs_report, name='download_clubs_report'),
-    path('reports/students/download/', clubs_views.download_students_report, name='download_students_report'),
-    path('reports/events/download/', clubs_views.download_events_report, name='download_events_report'),
-    path('reports/polls/download/', clubs_views.download_polls_report, name='download_polls_report'),
-    path('reports/engagement/download/', clubs_views.download_engagement_report, name='download_engagement_report'),
+    path('reports/clubs/download/', lazy_view("clubs.report_views.download_clubs_report"), name='download_clubs_report'),
+    path('reports/students/download/', lazy_view("clubs.report_views.download_students_report"), name='download_students_report'),
+    path('reports/events/download/', lazy_view("clubs.report_views.download_events_report"), name='download_events_report'),
+    path('reports/polls/download/', lazy_view("clubs.report_views.download_polls_report"), name='download_polls_report'),
+    path('reports/engagement/download/', lazy_view("clubs.report_views.download_engagement_report"), name='download_engagement_report'),
 
     # saved reports / cloud endpoints (these are POST-only)
-    path('reports/lecturer-save/', clubs_views.lecturer_save_report_cloud, name='lecturer_save_report_cloud'),
+    path('reports/lecturer-save/', lazy_view("clubs.report_views.lecturer_save_report_cloud", asynchronous=True), name='lecturer_save_report_cloud'),
     path('reports/admin-save/', views.admin_save_report_cloud, name="admin_save_report_cloud"),
 
     # saved-reports listing
-    path('reports/lecturer-saved/', clubs_views.lecturer_saved_reports, name='lecturer_saved_reports'),
-    path('reports/admin-saved/', clubs_views.admin_saved_reports, name='admin_saved_reports'),
+    path('reports/lecturer-saved/', lazy_view("clubs.report_views.lecturer_saved_reports", asynchronous=True), name='lecturer_saved_reports'),
+    path('reports/admin-saved/', lazy_view("clubs.report_views.admin_saved_reports", asynchronous=True), name='admin_saved_reports'),
 ]
@@ -1,22 +1,37 @@
 import os
 import json
-import threading
+from asgiref.sync import sync_to_async
 from datetime import datetime, timedelta   # added timedelta
-from django.http import JsonResponse
+from django.http import JsonResponse, FileResponse
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.conf import settings
-from reportlab.pdfgen import canvas
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import login as auth_login
 from django.contrib.auth.views import LogoutView
 from django.contrib import messages
-from django.db.models import Count, Q, Sum
+from django.db.models import Count, Q
 from django.contrib.auth.models import User
 from clubs.models import Club, Event, Poll, ClubPost, PollOption
+from clubs.pagination import PAGE_SIZE, paginate, is_partial, load_more_response
+from clubs.context import (
+    user_state, events_with_counts, clubs_with_counts, clubs_with_engagement, polls_with_vote_totals,
+)
+from clubs.background import start_background_thread
+from clubs.feed import feed_page
+from clubs.polls import open_polls
+from clubs.replicas import read_from_replica
+from clubs.rollups import activity_by_club, activity_series
+from clubs.pdf import render_report
+from clubs.report_specs import system_report
+from clubs.reports import ADMIN_CLOUD_REPORTS, store_report
 from .models import Profile, StudentPoints, Course, StudentMark, StudentGPA
+from .leaderboard import rank_of
+from .awards import BulkAwardError, award_points_in_bulk, parse_points, students_from_csv
 from .utils import calculate_gpa, get_grade_point as get_grade_and_point
 
 
@@ -55,25 +70,27 @@ def dashboard_redirect(request):
     return redirect("login")
 
 @login_required
-def student_dashboard(request):
-    user = request.user
-    user_clubs = user.clubs.all()
-    upcoming_events = Event.objects.filter(
-        club__in=user_clubs, date__gte=timezone.now()
-    ).order_by('date')[:5]
-    recent_posts = ClubPost.objects.filter(club__in=user_clubs).order_by('-created_at')[:5]
-    active_polls = Poll.objects.filter(club__in=user_clubs).order_by('-created_at')[:3]
-    total_clubs = user_clubs.count()
-    upcoming_events_count = upcoming_events.count()
-    rsvp_events = Event.objects.filter(attendees=user, date__gte=timezone.now()).count()
-    voted_polls = sum(
-        1 for poll in Poll.objects.filter(club__in=user_clubs)
-        if poll.options.filter(votes=user).exists()
-    )
+@read_from_replica
+async def student_dashboard(request):
+    # Async so that, under ASGI, the worker serves other requests while the
+    # queries below wait on the database
+    user = await request.auser()
+    my_clubs = user.clubs.all()
+    user_clubs = [c async for c in clubs_with_counts(user.clubs.order_by('name'))]
+    upcoming_events = [e async for e in events_with_counts(Event.objects.filter(
+        club__in=my_clubs, date__gte=timezone.now()
+    )).order_by('date')[:5]]
+    recent_posts = [p async for p in ClubPost.objects.filter(club__in=my_clubs).select_related('club').order_by('-created_at')[:5]]
+    active_polls = [p async for p in open_polls(Poll.objects.filter(club__in=my_clubs)).select_related('club').order_by('-created_at')[:3]]
+    total_clubs = len(user_clubs)
+    upcoming_events_count = len(upcoming_events)
+    rsvp_events = await Event.objects.filter(attendees=user, date__gte=timezone.now()).acount()
+    voted_polls = await Poll.objects.filter(club__in=my_clubs, options__votes=user).distinct().acount()
+    state = await sync_to_async(user_state)(user, events=upcoming_events)
     
     # Fetch student's marks and GPA record
-    student_courses = StudentMark.objects.filter(student=user).select_related('course')
-    gpa_record = StudentGPA.objects.filter(student=user).last()
+    student_courses = [m async for m in StudentMark.objects.filter(student=user).select_related('course')]
+    gpa_record = await StudentGPA.objects.filter(student=user).alast()
     gpa = gpa_record.gpa if gpa_record else 0.0
     cgpa = gpa_record.cgpa if gpa_record else 0.0
 
@@ -89,20 +106,24 @@ def student_dashboard(request):
         'student_courses': student_courses,
         'gpa': gpa,
         'cgpa': cgpa,
+        **state,
     }
-    return render(request, "users/student_dashboard.html", context)
+    # Templates may still touch the lazy request.user, so render off the event loop
+    return await sync_to_async(render)(request, "users/student_dashboard.html", context)
 
 
 @login_required
-def lecturer_dashboard(request):
-    clubs = Club.objects.all()
-    total_clubs = clubs.count()
-    total_students = Profile.objects.filter(role='student').count()
-    active_polls = Poll.objects.all()
-    active_polls_count = active_polls.count()
-    upcoming_events = Event.objects.filter(date__gte=timezone.now()).order_by('date')
-    upcoming_events_count = upcoming_events.count()
-    recent_posts = ClubPost.objects.all().order_by('-created_at')
+@read_from_replica
+async def lecturer_dashboard(request):
+    clubs = [c async for c in Club.objects.all()]
+    total_clubs = len(clubs)
+    total_students = await Profile.objects.filter(role='student').acount()
+    active_polls_count = await open_polls().acount()
+    active_polls = [p async for p in open_polls().order_by('-created_at', '-id')[:PAGE_SIZE]]
+    upcoming_events = Event.objects.filter(date__gte=timezone.now()).order_by('date', 'id')
+    upcoming_events_count = await upcoming_events.acount()
+    upcoming_events = [e async for e in upcoming_events[:PAGE_SIZE]]
+    recent_posts = [p async for p in ClubPost.objects.select_related('club', 'author').order_by('-created_at', '-id')[:PAGE_SIZE]]
 
     context = {
         'clubs': clubs,
@@ -114,7 +135,7 @@ def lecturer_dashboard(request):
         'upcoming_events_count': upcoming_events_count,
         'recent_posts': recent_posts,
     }
-    return render(request, "users/lecturer_dashboard.html", context)
+    return await sync_to_async(render)(request, "users/lecturer_dashboard.html", context)
 
 
 @login_required
@@ -127,7 +148,7 @@ def admin_dashboard(request):
     total_events = Event.objects.count()
     total_posts = ClubPost.objects.count()
     clubs = Club.objects.all()
-    recent_posts = ClubPost.objects.all().order_by('-created_at')
+    recent_posts = ClubPost.objects.select_related('club', 'author').order_by('-created_at', '-id')[:PAGE_SIZE]
     active_sessions = User.objects.filter(is_active=True).count()
 
     context = {
@@ -158,7 +179,7 @@ def manage_posts(request):
     club_filter = request.GET.get('club', '')
     author_filter = request.GET.get('author', '')
 
-    posts = ClubPost.objects.all().order_by('-created_at')
+    posts = ClubPost.objects.select_related('club', 'author')
 
     if search_query:
         posts = posts.filter(Q(title__icontains=search_query) | Q(content__icontains=search_query))
@@ -167,6 +188,10 @@ def manage_posts(request):
     if author_filter:
         posts = posts.filter(author__id=author_filter)
 
+    page = paginate(request, posts, ('-created_at', '-id'))
+    if is_partial(request):
+        return load_more_response(request, 'users/partials/post_rows.html', page)
+
     total_posts = ClubPost.objects.count()
     today_posts = ClubPost.objects.filter(created_at__date=timezone.now().date()).count()
     week_posts = ClubPost.objects.filter(
@@ -181,7 +206,8 @@ def manage_posts(request):
     authors = User.objects.all()
 
     context = {
-        'posts': posts,
+        'posts': page,
+        'filtered_count': posts.count(),
         'total_posts': total_posts,
         'today_posts': today_posts,
         'week_posts': week_posts,
@@ -215,35 +241,81 @@ def delete_post(request, post_id):
 @login_required
 def my_activity(request):
     user = request.user
-    user_clubs = user.clubs.all().annotate(
-        post_count=Count('posts', filter=Q(posts__author=user))
+    user_clubs = clubs_with_counts(user.clubs.all()).annotate(
+        post_count=Count('posts', filter=Q(posts__author=user), distinct=True)
+    )
+    rsvp_events = Event.objects.filter(attendees=user)
+    user_posts = ClubPost.objects.filter(author=user)
+
+    # Each list pages independently with its own cursor parameter
+    events_page = paginate(
+        request,
+        rsvp_events.select_related('club'),
+        ('date', 'id'),
+        cursor_param='events_cursor',
+    )
+    posts_page = paginate(request, user_posts.select_related('club'), ('-created_at', '-id'), cursor_param='posts_cursor')
+    if is_partial(request):
+        if 'events_cursor' in request.GET:
+            return load_more_response(request, 'users/partials/my_event_rows.html', events_page)
+        return load_more_response(request, 'users/partials/my_post_rows.html', posts_page)
+
+    voted_polls = list(
+        Poll.objects.filter(club__in=user.clubs.all(), options__votes=user).select_related('club').distinct()
     )
-    rsvp_events = Event.objects.filter(attendees=user).order_by('date')
-    voted_polls = [poll for poll in Poll.objects.filter(club__in=user_clubs)
-                   if poll.options.filter(votes=user).exists()]
-    user_posts = ClubPost.objects.filter(author=user).order_by('-created_at')
 
     context = {
         'user_clubs': user_clubs,
-        'rsvp_events': rsvp_events,
+        'rsvp_events': events_page,
+        'rsvp_events_count': rsvp_events.count(),
         'voted_polls': voted_polls,
-        'user_posts': user_posts,
+        'user_posts': posts_page,
+        'user_posts_count': user_posts.count(),
     }
     return render(request, 'users/my_activity.html', context)
 
 
+@login_required
+def activity_feed(request):
+    """Posts, events and polls from the user's clubs, newest first."""
+    page = feed_page(request.user, request.GET.get('cursor'), params=request.GET)
+    if is_partial(request):
+        return load_more_response(request, 'users/partials/feed_rows.html', page)
+    return render(request, 'users/feed.html', {'feed': page})
+
+
 @login_required
 def events_list(request):
     user = request.user
     user_clubs = user.clubs.all()
-    all_events = Event.objects.filter(date__gte=timezone.now()).order_by('date')
+    all_events = Event.objects.filter(date__gte=timezone.now())
     my_clubs_events = all_events.filter(club__in=user_clubs)
     rsvp_events = all_events.filter(attendees=user)
 
+    page = paginate(
+        request,
+        all_events.select_related('club'),
+        ('date', 'id'),
+    )
+    # Per-row membership/RSVP flags, looked up for this page only
+    row_context = {
+        'my_club_ids': set(user_clubs.values_list('id', flat=True)),
+        'rsvp_event_ids': set(
+            rsvp_events.filter(id__in=[event.id for event in page]).values_list('id', flat=True)
+        ),
+        'waitlisted_event_ids': set(
+            user.event_waitlist.filter(event_id__in=[event.id for event in page]).values_list('event_id', flat=True)
+        ),
+    }
+    if is_partial(request):
+        return load_more_response(request, 'users/partials/event_rows.html', page, row_context)
+
     context = {
-        'all_events': all_events,
-        'my_clubs_events': my_clubs_events,
-        'rsvp_events': rsvp_events,
+        'all_events': page,
+        'all_events_count': all_events.count(),
+        'my_clubs_events_count': my_clubs_events.count(),
+        'rsvp_events_count': rsvp_events.count(),
+        **row_context,
     }
     return render(request, 'users/events_list.html', context)
 
@@ -269,10 +341,19 @@ def create_poll(request):
         club_id = request.POST.get('club')
         question = request.POST.get('question')
         options = [v.strip() for k, v in request.POST.items() if k.startswith('option_') and v.strip()]
-
-        if club_id and question and len(options) >= 2:
+        # "End Date" (datetime-local, site time zone): the poll closes then
+        try:
+            closes_at = parse_datetime(request.POST.get('end_date', ''))
+        except ValueError:
+            closes_at = None
+        if closes_at is not None and timezone.is_naive(closes_at):
+            closes_at = timezone.make_aware(closes_at)
+
+        if closes_at is not None and closes_at <= timezone.now():
+            messages.error(request, 'The end date must be in the future.')
+        elif club_id and question and len(options) >= 2:
             club = get_object_or_404(Club, id=club_id)
-            poll = Poll.objects.create(club=club, question=question, created_by=request.user)
+            poll = Poll.objects.create(club=club, question=question, created_by=request.user, closes_at=closes_at)
             for option_text in options:
                 PollOption.objects.create(poll=poll, text=option_text)
             messages.success(request, f'Poll "{question}" created successfully with {len(options)} options!')
@@ -296,43 +377,35 @@ def announcements(request):
 
 
 
+ACTIVITY_WINDOW_DAYS = 30
+
+
 @login_required
+@read_from_replica
 def reports(request):
     # Only lecturers can view
     if not hasattr(request.user, 'profile') or request.user.profile.role.lower() != 'lecturer':
         messages.error(request, 'Only lecturers can view reports.')
         return redirect('dashboard')
 
-    # Fetch clubs and annotate counts
-    clubs = Club.objects.all().annotate(
-        member_count=Count('members'),
-        event_count=Count('events'),
-        post_count=Count('posts'),
-        poll_count=Count('polls')
-    )
-
-    # Calculate raw engagement score for each club
-    for club in clubs:
-        club.raw_score = (
-            club.member_count * 0.2 +
-            club.event_count * 0.3 +
-            club.post_count * 0.3 +
-            club.poll_count * 0.2
-        )
-
-    # Normalize scores to 100%
-    max_score = max([club.raw_score for club in clubs], default=1)  # prevent division by zero
-    for club in clubs:
-        club.engagement_percentage = (club.raw_score / max_score) * 100
+    # Counts, weighted score and its percentage of the best club's, in one query
+    clubs = clubs_with_engagement(Club.objects.all())
 
     # Total RSVPs
     total_rsvps = Event.objects.aggregate(total=Count('attendees'))['total'] or 0
 
+    # Activity over the last 30 days, from the pre-aggregated daily rollups
+    since = timezone.now() - timedelta(days=ACTIVITY_WINDOW_DAYS)
+    activity = activity_by_club(since)
+    club_activity = sorted(
+        ({'club': club, **activity[club.id]} for club in clubs if club.id in activity),
+        key=lambda row: (-(row['posts'] + row['votes'] + row['rsvps'] + row['joins']), row['club'].name),
+    )
+    daily_activity = activity_series(timezone.now() - timedelta(days=13))
+
     # Recent events & polls
     recent_events = Event.objects.order_by('-date')[:5]
-    recent_polls = Poll.objects.order_by('-created_at')[:5]
-    for poll in recent_polls:
-        poll.total_votes = sum(option.votes.count() for option in poll.options.all())
+    recent_polls = polls_with_vote_totals(Poll.objects.order_by('-created_at'))[:5]
 
     context = {
         'clubs': clubs,
@@ -343,6 +416,9 @@ def reports(request):
         'total_rsvps': total_rsvps,
         'recent_events': recent_events,
         'recent_polls': recent_polls,
+        'club_activity': club_activity,
+        'daily_activity': daily_activity,
+        'activity_window_days': ACTIVITY_WINDOW_DAYS,
     }
 
     return render(request, 'users/reports.html', context)
@@ -372,20 +448,68 @@ def award_points(request, club_id):
 
     members = club.members.all()
     recent_awards = StudentPoints.objects.filter(club=club).order_by('-awarded_at')[:10]
-    return render(request, 'users/award_points.html', {'club': club, 'members': members, 'recent_awards': recent_awards})
+    return render(request, 'users/award_points.html', {
+        'club': club,
+        'members': members,
+        'events': club.events.order_by('-date'),
+        'recent_awards': recent_awards,
+        'recent_batches': club.points_batches.select_related('awarded_by', 'event')[:5],
+    })
+
+
+@login_required
+@require_http_methods(["POST"])
+def bulk_award_points(request, club_id):
+    """Award the same points to club members, an event's attendees or a CSV of students."""
+    if not hasattr(request.user, 'profile') or request.user.profile.role.lower() != 'lecturer':
+        messages.error(request, 'Only lecturers can award points.')
+        return redirect('dashboard')
+
+    club = get_object_or_404(Club, id=club_id)
+    target = request.POST.get('target', 'members')
+    event = None
+    try:
+        points = parse_points(request.POST.get('points'))
+        reason = request.POST.get('reason', '').strip()
+        if not reason:
+            raise BulkAwardError('Please give a reason for the award.')
+
+        if target == 'members':
+            student_ids = club.members.values_list('id', flat=True)
+            selected = request.POST.getlist('students')
+            if selected:
+                student_ids = student_ids.filter(id__in=[s for s in selected if s.isdigit()])
+        elif target == 'event':
+            event = get_object_or_404(Event, id=request.POST.get('event') or 0, club=club)
+            student_ids = event.attendees.values_list('id', flat=True)
+        elif target == 'csv':
+            if 'csv_file' not in request.FILES:
+                raise BulkAwardError('Please choose a CSV file.')
+            student_ids = students_from_csv(request.FILES['csv_file'], club)
+        else:
+            raise BulkAwardError('Unknown award target.')
+
+        batch = award_points_in_bulk(club, request.user, points, reason, student_ids, target, event=event)
+    except BulkAwardError as e:
+        messages.error(request, str(e))
+    else:
+        messages.success(request, f'Awarded {batch.points} points to {batch.student_count} students.')
+    return redirect('award_points', club_id=club.id)
 
 
 @login_required
 def student_points_summary(request):
     user = request.user
-    points_history = StudentPoints.objects.filter(student=user).order_by('-awarded_at')
-    total_points = sum(p.points for p in points_history)
-    points_by_club = StudentPoints.objects.filter(student=user).values('club__name').annotate(total=Sum('points')).order_by('-total')
+    points_history = StudentPoints.objects.filter(student=user).select_related('club', 'awarded_by').order_by('-awarded_at')
+    # Totals come from the maintained StudentPointsTotal rows
+    points_by_club = user.points_totals.filter(club__isnull=False).values('club__name', 'total').order_by('-total')
+    rank, total_points = rank_of(user.id) or (None, 0)
 
     return render(request, 'users/student_points.html', {
         'points_history': points_history,
         'total_points': total_points,
         'points_by_club': points_by_club,
+        'rank': rank,
     })
 
 
@@ -402,7 +526,7 @@ def manage_users(request):
     role_filter = request.GET.get('role', '')
     status_filter = request.GET.get('status', '')
 
-    users = User.objects.all().order_by('-date_joined')
+    users = User.objects.select_related('profile')
     if search_query:
         users = users.filter(Q(username__icontains=search_query) | Q(profile__name__icontains=search_query))
     if role_filter:
@@ -412,12 +536,17 @@ def manage_users(request):
     elif status_filter == 'inactive':
         users = users.filter(is_active=False)
 
+    page = paginate(request, users, ('-date_joined', '-id'))
+    if is_partial(request):
+        return load_more_response(request, 'users/partials/user_rows.html', page)
+
     recent_users = User.objects.all().order_by('-date_joined')[:5]
     week_ago = timezone.now() - timedelta(days=7)
     active_this_week = User.objects.filter(last_login__gte=week_ago).count()
 
     return render(request, 'users/manage_users.html', {
-        'users': users,
+        'users': page,
+        'filtered_count': users.count(),
         'total_users': User.objects.count(),
         'total_students': Profile.objects.filter(role='student').count(),
         'total_lecturers': Profile.objects.filter(role='lecturer').count(),
@@ -632,124 +761,8 @@ def grade_panel(request):
 # -------------------------
 def generate_report_file(file_path):
     """Generate a detailed School Clubs Management report asynchronously."""
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import inch
-    from datetime import datetime
-
-    c = canvas.Canvas(file_path, pagesize=A4)
-    width, height = A4
-
-    # Title
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(150, height - 50, "School Clubs Management System Report")
-
-    c.setFont("Helvetica", 12)
-    c.drawString(50, height - 80, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-    y = height - 120
-
-    # Section 1: Clubs Summary
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "1. Clubs Overview")
-    y -= 25
-
-    clubs = Club.objects.all()
-    if not clubs.exists():
-        c.setFont("Helvetica", 12)
-        c.drawString(70, y, "No clubs found in the system.")
-        y -= 20
-    else:
-        for club in clubs:
-            members = club.members.count()
-            events = Event.objects.filter(club=club).count()
-            posts = ClubPost.objects.filter(club=club).count()
-            polls = Poll.objects.filter(club=club).count()
-
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(70, y, f"- {club.name}")
-            y -= 15
-
-            c.setFont("Helvetica", 11)
-            c.drawString(90, y, f"Description: {club.description[:80]}...")
-            y -= 12
-            c.drawString(90, y, f"Meeting Time: {club.meeting_time}")
-            y -= 12
-            c.drawString(90, y, f"Members: {members}, Events: {events}, Posts: {posts}, Polls: {polls}")
-            y -= 25
-
-            if y < 100:
-                c.showPage()
-                y = height - 100
-
-    # Section 2: Upcoming Events
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "2. Upcoming Events")
-    y -= 25
-    events = Event.objects.filter(date__gte=timezone.now()).order_by("date")[:10]
-    if not events:
-        c.setFont("Helvetica", 12)
-        c.drawString(70, y, "No upcoming events found.")
-        y -= 20
-    else:
-        for event in events:
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(70, y, f"- {event.name}")
-            y -= 12
-            c.setFont("Helvetica", 11)
-            c.drawString(90, y, f"Club: {event.club.name} | Date: {event.date.strftime('%Y-%m-%d')} | Attendees: {event.attendees.count()}")
-            y -= 20
-            if y < 100:
-                c.showPage()
-                y = height - 100
-
-    # Section 3: Active Polls
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "3. Active Polls")
-    y -= 25
-    polls = Poll.objects.all().order_by('-created_at')[:10]
-    if not polls.exists():
-        c.setFont("Helvetica", 12)
-        c.drawString(70, y, "No active polls found.")
-        y -= 20
-    else:
-        for poll in polls:
-            total_votes = sum(option.votes.count() for option in poll.options.all())
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(70, y, f"- {poll.question}")
-            y -= 12
-            c.setFont("Helvetica", 11)
-            c.drawString(90, y, f"Club: {poll.club.name} | Total Votes: {total_votes}")
-            y -= 20
-            if y < 100:
-                c.showPage()
-                y = height - 100
-
-    # Section 4: Recent Club Posts
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "4. Recent Club Posts")
-    y -= 25
-    posts = ClubPost.objects.all().order_by('-created_at')[:10]
-    if not posts.exists():
-        c.setFont("Helvetica", 12)
-        c.drawString(70, y, "No recent posts found.")
-        y -= 20
-    else:
-        for post in posts:
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(70, y, f"- {post.title}")
-            y -= 12
-            c.setFont("Helvetica", 11)
-            c.drawString(90, y, f"Club: {post.club.name} | Author: {post.author.username} | {post.created_at.strftime('%Y-%m-%d')}")
-            y -= 20
-            if y < 100:
-                c.showPage()
-                y = height - 100
-
-    # Footer
-    c.setFont("Helvetica-Oblique", 10)
-    c.drawString(50, 50, "End of Report - Generated by School Clubs MS")
-
-    c.save()
+    with open(file_path, 'wb') as stream:
+        render_report(system_report(), stream)
 
 
 @login_required
@@ -767,8 +780,7 @@ def generate_report(request):
     file_path = os.path.join(reports_dir, filename)
 
     # Run in background thread
-    thread = threading.Thread(target=generate_report_file, args=(file_path,))
-    thread.start()
+    start_background_thread(generate_report_file, file_path)
 
     messages.success(request, "Report generation started. Please refresh in a few seconds to download.")
     request.session['latest_report'] = filename
@@ -827,11 +839,8 @@ def admin_settings(request):
     return render(request, 'users/admin_settings.html', context)
 
 def upload_to_supabase(content: str, filename: str, user_id: int):
-    """Minimal helper so tests can patch users.views.upload_to_supabase."""
-    supabase_url = getattr(settings, "SUPABASE_URL", None)
-    if supabase_url:
-        return {"success": True, "url": f"{supabase_url}/fake/{filename}"}
-    return {"success": False, "error": "supabase not configured"}
+    """Save through the report storage backend; tests patch users.views.upload_to_supabase."""
+    return store_report(content, filename, user_id)
 
 def is_admin(user):
     return hasattr(user, "profile") and getattr(user.profile, "role", "") == "admin"
@@ -840,13 +849,16 @@ def is_admin(user):
 @require_http_methods(["POST"])
 def admin_save_report_cloud(request):
     """
-    Admin endpoint: builds a small stub report and uploads via upload_to_supabase.
-    Returns JSON 200 on success or failure (no 500).
+    Admin endpoint: builds a small stub report and queues its upload via
+    upload_to_supabase. Returns JSON 202 with the job id once queued, or 200
+    with the error if it could not be (no 500).
     """
     if not is_admin(request.user):
         return JsonResponse({"success": False, "error": "permission denied"}, status=403)
 
     report_type = request.POST.get("report_type", "clubs")
+    if report_type not in ADMIN_CLOUD_REPORTS:
+        return JsonResponse({"success": False, "error": "Invalid report type"}, status=400)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"admin_{report_type}_report_{timestamp}.txt"
     content = f"Admin {report_type} report\nGenerated by user {request.user.id} on {timestamp}\n"
@@ -862,4 +874,9 @@ def admin_save_report_cloud(request):
         "url": result.get("url") if result.get("success") else None,
         "error": result.get("error") if not result.get("success") else None,
     }
-    return JsonResponse(payload, status=200)
+    if not payload["success"]:
+        return JsonResponse(payload, status=200)
+    if result.get("job_id"):
+        payload["job_id"] = result["job_id"]
+        payload["status_url"] = reverse("report_upload_status", args=[result["job_id"]])
+    return JsonResponse(payload, status=202)